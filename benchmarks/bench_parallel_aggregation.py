@@ -0,0 +1,103 @@
+# bench_parallel_aggregation.py
+"""
+Benchmark: parallel per-database aggregation (db/parallel_aggregation.py).
+
+Builds N synthetic run databases (benchmarks/synthetic_db.py) and times
+all_aggregated.sql over all of them:
+  - single DuckDB session (ATTACH + UNION ALL, dbHandler.execute_multi_db_query)
+  - process pool with 1, 2, 4, ... workers (parallel_aggregation.aggregate_runs)
+and prints speedup and parallel efficiency relative to one worker with one DuckDB
+thread (serial baseline). The pool rows split the CPU count between the workers as
+in the GUI, so efficiency is per thread used (workers x threads).
+
+Usage (from the project root):
+    python -m benchmarks.bench_parallel_aggregation --runs 8 --rows 2000000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db.dbHandler import build_query_filters, execute_multi_db_query
+from db.parallel_aggregation import aggregate_runs
+from benchmarks.synthetic_db import build_synthetic_db
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def _timed(func, repeat):
+    """Best wall time of repeat calls (seconds)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parallel per-database aggregation.")
+    parser.add_argument("--runs", type=int, default=8, help="Number of run databases")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per database")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts (default: 1, 2, 4, ... up to runs)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    parser.add_argument("--dir", help="Directory for the databases (default: temporary, deleted afterwards)")
+    args = parser.parse_args(argv)
+
+    work_dir = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="pgb_bench_"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        print(f"Building {args.runs} databases with {args.rows:,} rows in {work_dir} ...")
+        db_paths = []
+        for i in range(args.runs):
+            db_path = work_dir / f"pgb_job_{i}.db"
+            build_synthetic_db(db_path, rows=args.rows, seed=i)
+            db_paths.append(db_path)
+
+        filters = build_query_filters([], [], [], {}, [], analysis_type="Q-Error")
+
+        worker_counts = args.workers
+        if not worker_counts:
+            worker_counts, n = [], 1
+            while n < args.runs:
+                worker_counts.append(n)
+                n *= 2
+            worker_counts.append(args.runs)
+
+        cpu_count = os.cpu_count() or 1
+        print(f"\n{'Mode':<36}{'Threads':>8}{'Time':>10}{'Speedup':>10}{'Efficiency':>12}")
+
+        # Serial baseline: one worker, one DuckDB thread
+        base_time = _timed(lambda: aggregate_runs(db_paths, 2, filters, workers=1, threads=1), args.repeat)
+        print(f"{'serial (1 worker, 1 thread)':<36}{1:>8}{base_time:>9.2f}s{1:>9.2f}x{1:>11.0%}")
+
+        session_time = _timed(lambda: execute_multi_db_query(2, filters, db_paths), args.repeat)
+        speedup = base_time / session_time
+        print(f"{'single session (UNION ALL)':<36}{cpu_count:>8}{session_time:>9.2f}s"
+              f"{speedup:>9.2f}x{speedup / cpu_count:>11.0%}")
+
+        for workers in worker_counts:
+            used = workers * max(1, cpu_count // workers)
+            elapsed = _timed(lambda: aggregate_runs(db_paths, 2, filters, workers=workers), args.repeat)
+            speedup = base_time / elapsed
+            print(f"{f'process pool, {workers} worker(s)':<36}{used:>8}{elapsed:>9.2f}s"
+                  f"{speedup:>9.2f}x{speedup / used:>11.0%}")
+
+        print(f"\nCPU count: {cpu_count}")
+    finally:
+        if not args.dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
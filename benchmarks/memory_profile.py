@@ -0,0 +1,335 @@
+# memory_profile.py
+"""
+Memory profiling harness: peak memory per user action (headless).
+
+Every action runs in a fresh process (spawn), so the peak RSS (ru_maxrss) belongs
+to that action alone. Inside the process the inputs of the action are prepared
+first (e.g. the query result for a plot), then the action runs under tracemalloc:
+
+  python_peak   tracemalloc peak during the action (Python objects, numpy arrays)
+  retained      tracemalloc memory still held after the action (what a view keeps)
+  rss_peak      ru_maxrss minus the RSS before the action (includes DuckDB, Tk, ...;
+                an upper bound if the preparation peaked higher than the action)
+
+All values are also given as "copies" of the query result (python memory held by
+the fetched rows), which keeps the budgets independent of the database size.
+An action that is over its budget makes the run fail, so new duplicate copies show
+up right away:
+
+    python -m benchmarks.memory_profile --rows 1000000
+    python -m benchmarks.memory_profile --db pgb_job_0.db --actions query dataframe plot_model:Box_Plot --out mem.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import sys
+import tempfile
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_db import build_synthetic_db
+
+try:
+    import resource
+except ImportError:
+    # Windows: no ru_maxrss, only tracemalloc values are reported
+    resource = None
+
+
+# Plot types profiled for plot_model:* and render:* (spaces -> "_" in action names)
+PLOT_TYPES = ["Bar Chart", "Box Plot", "Scatter Plot", "Graph"]
+
+ACTIONS = (
+    ["query", "dataframe"]
+    + [f"plot_model:{t.replace(' ', '_')}" for t in PLOT_TYPES]
+    + [f"render:{t.replace(' ', '_')}" for t in PLOT_TYPES]
+    + ["treeview", "export_csv", "export_excel"]
+)
+
+# Budgets per action in copies of the query result: (python_peak, rss_peak).
+# None = not checked. Actions without an entry are reported only. Render RSS is
+# dominated by matplotlib itself and does not scale with the result, so it is not checked.
+MEMORY_BUDGETS = {
+    "query": (1.25, 5.0),
+    "dataframe": (0.75, 1.5),
+    "plot_model:Bar_Chart": (0.75, 1.5),
+    "plot_model:Box_Plot": (1.0, 3.5),
+    "plot_model:Scatter_Plot": (0.75, 1.5),
+    "plot_model:Graph": (0.75, 1.5),
+    "render:Bar_Chart": (0.15, None),
+    "render:Box_Plot": (0.15, None),
+    "render:Scatter_Plot": (0.15, None),
+    "render:Graph": (0.15, None),
+    "export_csv": (1.25, 3.5),
+    "export_excel": (0.25, 1.0),
+}
+
+# Below this result size fixed costs (imports, caches) dominate and budgets are not checked
+BUDGET_MIN_RESULT_BYTES = 16 * 1024 * 1024
+
+MB = 1024 * 1024
+
+
+# =============================================================================
+# MEASUREMENT (runs in the worker process)
+# =============================================================================
+
+def _current_rss():
+    """Current resident set size in bytes (None if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, AttributeError):
+        return None
+
+
+def _max_rss():
+    """Peak resident set size of this process in bytes (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _plot_options(plot_type, query_id):
+    """Plot options as the GUI builds them for a single query result."""
+    from plotting.plot_model import make_plot_options
+    return make_plot_options(
+        plot_type,
+        x_axis="Query Graph: ps_qg" if query_id == 3 else "Configuration Parameters",
+        agg_metric="qerr" if query_id == 3 else "avg_qerr",
+        metric="Highest",
+        plot_number=10,
+        box_plot_split="pg_name" if plot_type == "Box Plot" else None
+    )
+
+
+def _prepare(action, db_path, query_id, out_dir):
+    """
+    Build the inputs of an action outside of the measurement.
+
+    Returns:
+        callable: The action (its return value is kept alive until after the measurement)
+    """
+    import pandas as pd
+    from db.dbHandler import (
+        set_db_path, build_query_filters, execute_query, get_values_for_dropdown,
+        export_rows, iter_row_batches, iter_excel_export
+    )
+    from db.db_config import TABLES, COLUMNS
+
+    set_db_path(db_path)
+    selected_qg = [str(v) for v in get_values_for_dropdown(TABLES["query_graph"], COLUMNS["qg_name"])] if query_id == 3 else []
+    filters = build_query_filters([], [], [], {}, selected_qg, analysis_type="Q-Error")
+
+    def run_query():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return execute_query(query_id, filters=filters)
+
+    if action == "query":
+        return run_query
+
+    columns, data = run_query()
+
+    if action == "dataframe":
+        return lambda: pd.DataFrame(data, columns=columns)
+
+    kind, _, plot_name = action.partition(":")
+    plot_type = plot_name.replace("_", " ")
+    if kind == "plot_model":
+        from plotting.plot_model import get_plot_model
+        options = _plot_options(plot_type, query_id)
+        return lambda: get_plot_model(None, columns, data, options)
+
+    if kind == "render":
+        from plotting.headless import init_headless_worker, make_figure
+        init_headless_worker()
+        from plotting.plot_model import get_plot_model
+        from plotting.plot_renderer import render_plot_model
+        from plotting.style_plot import get_color_palette
+        model = get_plot_model(None, columns, data, _plot_options(plot_type, query_id))
+
+        def render():
+            fig, ax = make_figure()
+            render_plot_model(ax, model, get_color_palette())
+            fig.canvas.draw()
+            return fig
+        return render
+
+    if action == "treeview":
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.withdraw()
+
+        def fill_treeview():
+            tree = ttk.Treeview(root, columns=columns, show="headings")
+            for row in data:
+                tree.insert("", "end", values=row)
+            root.update_idletasks()
+            return tree
+        return fill_treeview
+
+    if action == "export_csv":
+        return lambda: export_rows(columns, data, Path(out_dir) / "export.csv", "csv")
+
+    if action == "export_excel":
+        def export_excel():
+            for _ in iter_excel_export(columns, iter_row_batches(data), Path(out_dir) / "export.xlsx"):
+                pass
+        return export_excel
+
+    raise ValueError(f"Unknown action: {action}")
+
+
+def profile_action(task):
+    """
+    Worker entry point: prepare and measure one action.
+
+    Args:
+        task (tuple): (action, db_path, query_id, out_dir)
+
+    Returns:
+        dict: 'python_peak', 'retained' and 'rss_peak' in bytes (rss_peak None if unknown),
+              or 'error' if the action could not run
+    """
+    action, db_path, query_id, out_dir = task
+    try:
+        func = _prepare(action, db_path, query_id, out_dir)
+    except Exception as ex:
+        return {"error": f"{type(ex).__name__}: {ex}"}
+
+    gc.collect()
+    rss_before = _current_rss()
+    tracemalloc.start()
+    result = func()
+    retained, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = _max_rss()
+    del result
+
+    rss_peak = None
+    if rss_before is not None and rss_after is not None:
+        rss_peak = max(0, rss_after - rss_before)
+    return {"python_peak": python_peak, "retained": retained, "rss_peak": rss_peak}
+
+
+# =============================================================================
+# DRIVER
+# =============================================================================
+
+def profile_actions(actions, db_path, query_id=3, out_dir=None):
+    """
+    Measure every action in its own spawned process ("query" first, it defines one result copy).
+
+    Returns:
+        dict: action -> measurement dict (plus 'copies' when the result size is known)
+    """
+    context = multiprocessing.get_context("spawn")
+    actions = ["query"] + [a for a in actions if a != "query"]
+    results = {}
+    result_bytes = None
+
+    for action in actions:
+        # One process per action: ru_maxrss cannot be reset
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            measurement = pool.submit(profile_action, (action, str(db_path), query_id, out_dir)).result()
+
+        if action == "query" and "error" not in measurement:
+            result_bytes = measurement["retained"] or None
+        if result_bytes and "error" not in measurement:
+            measurement["copies"] = {
+                key: (measurement[key] / result_bytes if measurement[key] is not None else None)
+                for key in ("python_peak", "retained", "rss_peak")
+            }
+        results[action] = measurement
+    return results
+
+
+def check_budgets(results, budgets=MEMORY_BUDGETS):
+    """
+    Compare the measured copies with the budgets.
+
+    Returns:
+        list: (action, measure, copies, budget) for every exceeded budget
+    """
+    violations = []
+    query = results.get("query", {})
+    if query.get("retained", 0) < BUDGET_MIN_RESULT_BYTES:
+        print(f"Result smaller than {BUDGET_MIN_RESULT_BYTES // MB} MB - budgets not checked")
+        return violations
+    for action, measurement in results.items():
+        copies = measurement.get("copies")
+        if not copies or action not in budgets:
+            continue
+        for measure, budget in zip(("python_peak", "rss_peak"), budgets[action]):
+            if budget is not None and copies[measure] is not None and copies[measure] > budget:
+                violations.append((action, measure, copies[measure], budget))
+    return violations
+
+
+def format_results(results, budgets=MEMORY_BUDGETS):
+    """Format the measurements as text table (MB and result copies)."""
+    def mb(value):
+        return f"{value / MB:>9.1f}" if value is not None else f"{'-':>9}"
+
+    def copies(value):
+        return f"{value:>8.2f}x" if value is not None else f"{'-':>9}"
+
+    lines = [f"{'Action':<26}{'Py peak':>9}{'Retained':>9}{'RSS peak':>9}  {'Py peak':>9}{'Retained':>9}{'RSS':>9}  Budget"]
+    for action, m in results.items():
+        if "error" in m:
+            lines.append(f"{action:<26}skipped ({m['error']})")
+            continue
+        c = m.get("copies") or {}
+        budget = budgets.get(action)
+        budget_text = "/".join("-" if b is None else f"{b:g}x" for b in budget) if budget else ""
+        lines.append(f"{action:<26}{mb(m['python_peak'])}{mb(m['retained'])}{mb(m['rss_peak'])}  "
+                     f"{copies(c.get('python_peak'))}{copies(c.get('retained'))}{copies(c.get('rss_peak'))}  {budget_text}")
+    lines.append("(MB, then copies of the query result; budget = Python peak / RSS peak)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak memory per user action, checked against budgets.")
+    parser.add_argument("--db", help="Existing database (default: generate a synthetic one)")
+    parser.add_argument("--rows", type=int, default=100_000, help="plan_summary rows of the synthetic database")
+    parser.add_argument("--aggregated", action="store_true", help="Profile the aggregated query instead of single query mode")
+    parser.add_argument("--actions", nargs="+", choices=ACTIONS, default=ACTIONS, help="Actions to profile")
+    parser.add_argument("--budgets", help="JSON file with budget overrides {action: [python_peak, rss_peak]}")
+    parser.add_argument("--out", help="JSON result file")
+    args = parser.parse_args(argv)
+
+    budgets = dict(MEMORY_BUDGETS)
+    if args.budgets:
+        budgets.update({k: tuple(v) for k, v in json.loads(Path(args.budgets).read_text(encoding="utf-8")).items()})
+
+    with tempfile.TemporaryDirectory(prefix="pgb_mem_") as work_dir:
+        if args.db:
+            db_path = Path(args.db)
+        else:
+            db_path = Path(work_dir) / "pgb_job_synthetic.db"
+            build_synthetic_db(db_path, rows=args.rows)
+            print(f"Synthetic database: {args.rows:,} plan_summary rows")
+
+        results = profile_actions(args.actions, db_path, query_id=2 if args.aggregated else 3, out_dir=work_dir)
+
+    print(format_results(results, budgets))
+    if args.out:
+        Path(args.out).write_text(json.dumps({"budgets": budgets, "results": results}, indent=2), encoding="utf-8")
+
+    violations = check_budgets(results, budgets)
+    for action, measure, copies, budget in violations:
+        print(f"OVER BUDGET: {action} {measure} {copies:.2f}x > {budget:g}x")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+# run_benchmarks.py
+"""
+End-to-end benchmark suite (headless).
+
+Times every stage of QueryHandlersMixin.on_execute() separately against a
+synthetic database (benchmarks/synthetic_db.py) or an existing one:
+
+  filter_build    build_detail_metric_filter + build_query_filters
+  sql_render      render_query_sql
+  execute_query   DuckDB query + fetch
+  dataframe       pd.DataFrame(data, columns)
+  top_n           nlargest (bar/scatter/line input)
+  create_*        every plot function on an Agg figure, including the canvas draw
+  treeview_insert Treeview insertion with an off-screen (withdrawn) Tk root
+                  (skipped without a display)
+
+Results are written as JSON, so runs of different commits can be compared:
+
+    python -m benchmarks.run_benchmarks --rows 1000000 --out bench_new.json
+    python -m benchmarks.run_benchmarks --db pgb_job_0.db --baseline bench_old.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")  # before plotting.plotting imports pyplot
+
+import duckdb
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db.dbHandler import (
+    build_query_filters, build_detail_metric_filter, render_query_sql, execute_query,
+    get_values_for_dropdown, set_db_path
+)
+from db.db_config import TABLES, COLUMNS
+from plotting.headless import make_figure
+from plotting.plotting import (
+    create_bar_chart, create_box_plot, create_box_plot_single, create_box_plot_split,
+    create_scatter_plot, create_line_graph
+)
+from plotting.style_plot import get_color_palette
+from benchmarks.synthetic_db import build_synthetic_db
+
+
+# Scenarios: (name, analysis type, query id, metric column, detail filters)
+# Aggregated mode plots avg_*, single query mode the raw metric over all queries (like the GUI).
+# LF and Q-error are >= 1, so "> 1" exercises the HAVING filter without emptying the result.
+SCENARIOS = [
+    ("aggregated_lf", "Loss Factor", 2, "avg_lf", [{"metric": "avg_lf", "comparison": "greater than", "value": 1}]),
+    ("aggregated_qerr", "Q-Error", 2, "avg_qerr", [{"metric": "avg_qerr", "comparison": "greater than", "value": 1}]),
+    ("aggregated_perr", "P-Error", 2, "avg_perr", []),
+    ("single_query_qerr", "Q-Error", 3, "qerr", []),
+]
+
+# x-axis per query id (see QueryHandlersMixin.display_results)
+X_AXES = {2: "Configuration Parameters", 3: "Query Graph: ps_qg"}
+
+# Stage ratio (new / baseline) above which a stage is reported as regression
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def _measure(func, repeat):
+    """
+    Call func repeat times.
+
+    Returns:
+        tuple: (timing dict with 'best', 'median' and 'runs' in seconds, result of the last call)
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times), "runs": times}, result
+
+
+def _quiet(func, *args, **kwargs):
+    """Call func with stdout suppressed (execute_query prints the SQL)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _git_commit():
+    """Short commit hash of the working tree (None outside of git)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _open_offscreen_root():
+    """Withdrawn Tk root for the Treeview stage, or None if there is no display."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as ex:
+        print(f"Treeview stage skipped: {ex}")
+        return None
+    root.withdraw()
+    return root
+
+
+# =============================================================================
+# STAGES
+# =============================================================================
+
+def _plot_stages(df, df_top, x_axis, metric_col, split_col, plot_number):
+    """create_* calls of one scenario: name -> callable(ax, colors)."""
+    title = f"Benchmark: {metric_col}"
+    return {
+        "create_bar_chart": lambda ax, colors: create_bar_chart(ax, df_top, x_axis, metric_col, title, metric_col, colors),
+        "create_box_plot": lambda ax, colors: create_box_plot(ax, df_top, x_axis, metric_col, title, metric_col, colors),
+        "create_box_plot_single": lambda ax, colors: create_box_plot_single(ax, df, metric_col, title, metric_col, "All", colors),
+        "create_box_plot_split": lambda ax, colors: create_box_plot_split(ax, df, metric_col, split_col, title, metric_col,
+                                                                          colors, max_boxes=plot_number),
+        "create_scatter_plot": lambda ax, colors: create_scatter_plot(ax, df_top, x_axis, metric_col, title, metric_col, colors),
+        "create_line_graph": lambda ax, colors: create_line_graph(ax, df_top, x_axis, metric_col, title, metric_col, colors),
+    }
+
+
+def _time_plot(plot_func, repeat):
+    """Time one create_* function on a fresh Agg figure, including the draw."""
+    colors = get_color_palette()
+
+    def run():
+        fig, ax = make_figure()
+        plot_func(ax, colors)
+        fig.canvas.draw()
+
+    timing, _ = _measure(run, repeat)
+    return timing
+
+
+def _time_treeview(root, columns, data, repeat):
+    """Time inserting all rows into a Treeview (as display_treeview_in_frame does)."""
+    from tkinter import ttk
+
+    def run():
+        tree = ttk.Treeview(root, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=100, anchor="center")
+        for row in data:
+            tree.insert("", "end", values=row)
+        root.update_idletasks()
+        tree.destroy()
+
+    timing, _ = _measure(run, repeat)
+    return timing
+
+
+def run_scenario(name, analysis_type, query_id, metric_col, detail_filter_values, query_names, repeat,
+                 plot_number, split_col="pg_name", tk_root=None):
+    """
+    Run all stages of one scenario.
+
+    Returns:
+        dict: Scenario result with 'rows' and per-stage timings
+    """
+    selected_qg = query_names if query_id == 3 else []
+
+    stages = {}
+    stages["filter_build"], filters = _measure(lambda: build_query_filters(
+        [], [], [], {}, selected_qg,
+        analysis_type=analysis_type,
+        detail_metric_filter=_quiet(build_detail_metric_filter, detail_filter_values)
+    ), repeat)
+    stages["sql_render"], _ = _measure(lambda: render_query_sql(query_id, filters), repeat)
+    stages["execute_query"], (columns, data) = _measure(lambda: _quiet(execute_query, query_id, filters=filters), repeat)
+    stages["dataframe"], df = _measure(lambda: pd.DataFrame(data, columns=columns), repeat)
+    stages["top_n"], df_top = _measure(lambda: df.nlargest(plot_number, metric_col), repeat)
+
+    for stage, plot_func in _plot_stages(df, df_top, X_AXES[query_id], metric_col, split_col, plot_number).items():
+        stages[stage] = _time_plot(plot_func, repeat)
+
+    if tk_root is not None:
+        stages["treeview_insert"] = _time_treeview(tk_root, columns, data, repeat)
+
+    print(f"[{name}] {len(data):,} rows")
+    for stage, timing in stages.items():
+        print(f"  {stage:<24}{timing['best'] * 1000:>10.2f} ms")
+    return {"analysis_type": analysis_type, "query_id": query_id, "metric": metric_col,
+            "rows": len(data), "stages": stages}
+
+
+# =============================================================================
+# COMPARISON
+# =============================================================================
+
+def compare_results(result, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Compare the best stage times with a baseline result file.
+
+    Returns:
+        list: (scenario, stage, baseline seconds, new seconds, ratio) of the regressions
+    """
+    regressions = []
+    print(f"\nComparison with {baseline.get('commit') or 'baseline'} (best times, ratio new / baseline):")
+    for name, scenario in result["scenarios"].items():
+        old_scenario = baseline.get("scenarios", {}).get(name)
+        if not old_scenario:
+            continue
+        for stage, timing in scenario["stages"].items():
+            old = old_scenario["stages"].get(stage)
+            if not old or old["best"] <= 0:
+                continue
+            ratio = timing["best"] / old["best"]
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"  {name:<20}{stage:<24}{old['best'] * 1000:>10.2f} ms{timing['best'] * 1000:>10.2f} ms{ratio:>8.2f}x{flag}")
+            if ratio > threshold:
+                regressions.append((name, stage, old["best"], timing["best"], ratio))
+    return regressions
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every stage of a query execution (headless).")
+    parser.add_argument("--db", help="Existing database (default: generate a synthetic one)")
+    parser.add_argument("--rows", type=int, default=100_000, help="plan_summary rows of the synthetic database")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic database")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per stage (best and median are reported)")
+    parser.add_argument("--plot-number", type=int, default=10, help="Top N for bar/scatter/line plots")
+    parser.add_argument("--no-treeview", action="store_true", help="Skip the Treeview stage")
+    parser.add_argument("--out", default="benchmark_results.json", help="JSON result file")
+    parser.add_argument("--baseline", help="JSON result file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Ratio above which a stage counts as regression")
+    args = parser.parse_args(argv)
+
+    temp_dir = None
+    if args.db:
+        db_path = Path(args.db)
+    else:
+        temp_dir = tempfile.TemporaryDirectory(prefix="pgb_bench_")
+        db_path = Path(temp_dir.name) / "pgb_job_synthetic.db"
+        elapsed = build_synthetic_db(db_path, rows=args.rows, seed=args.seed)
+        print(f"Synthetic database: {args.rows:,} plan_summary rows in {elapsed:.1f}s")
+
+    tk_root = None if args.no_treeview else _open_offscreen_root()
+    try:
+        set_db_path(db_path)
+        query_names = [str(v) for v in get_values_for_dropdown(TABLES["query_graph"], COLUMNS["qg_name"])]
+
+        result = {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "database": str(args.db) if args.db else f"synthetic ({args.rows} rows, seed {args.seed})",
+            "repeat": args.repeat,
+            "plot_number": args.plot_number,
+            "environment": {
+                "python": platform.python_version(),
+                "duckdb": duckdb.__version__,
+                "pandas": pd.__version__,
+                "matplotlib": matplotlib.__version__,
+                "platform": platform.platform(),
+            },
+            "scenarios": {},
+        }
+        for name, analysis_type, query_id, metric_col, detail_filter_values in SCENARIOS:
+            result["scenarios"][name] = run_scenario(
+                name, analysis_type, query_id, metric_col, detail_filter_values, query_names,
+                repeat=args.repeat, plot_number=args.plot_number, tk_root=tk_root
+            )
+    finally:
+        if tk_root is not None:
+            tk_root.destroy()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    Path(args.out).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_results(result, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than {args.threshold:.2f}x baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+# synthetic_db.py
+"""
+Synthetic benchmark database generator (pgb_job schema).
+
+Creates plan_generator, card_provider, build_plan_class, build_plan_instance,
+work_package, query_graph and plan_summary with configurable cardinalities and
+applies sql/View_ps_with_perr.sql, so the app, report.py and the benchmarks run
+without the private pgb_job_*.db files.
+
+Data is generated inside DuckDB (range() + hash-based random numbers), so it is
+reproducible for a seed and scales to 100M plan_summary rows:
+  - work packages and queries are Zipf-like skewed (a few get most plans)
+  - loss factors are log-normal (>= 1)
+  - Q-errors are heavy-tailed with a small share of 1e+38-scale overflow values
+  - cost function values (bpi_cf_*) are partly NULL
+  - ps_cost_pg is occasionally 0 (P-error NULLIF path)
+
+Usage (from the project root):
+    python -m benchmarks.synthetic_db pgb_job_0.db --size 1m
+    python -m benchmarks.synthetic_db bench.db --rows 250000 --work-packages 500 --seed 7
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import SQL_DIR
+
+
+# Size presets: plan_summary rows
+SIZE_PRESETS = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "100m": 100_000_000,
+}
+
+# Dimension values
+PLAN_GENERATORS = ["DPccp", "DPhyp", "GOO", "IKKBZ", "QuickPick", "MinSel", "GreedyOp", "TDMinCut"]
+CARD_PROVIDERS = ["trueCE", "postgresCE", "sampleCE", "learnedCE", "histogramCE", "independenceCE"]
+BUILD_PLAN_CLASSES = ["full", "left_deep", "right_deep", "zig_zag", "bushy"]
+# Cost function variants are integer codes (bpi_cf_* IN (0, 1, ...))
+COST_FUNCTION_VARIANTS = {"bpi_cf_join_bundle": 2, "bpi_cf_mat": 3, "bpi_cf_concat": 2}
+
+# Share of NULL cost function values and of 1e+38-scale Q-errors
+NULL_COST_FUNCTION_SHARE = 0.1
+QERR_OVERFLOW_SHARE = 0.001
+
+
+def _sql_list(values):
+    """Format Python strings as DuckDB list literal."""
+    return "[" + ", ".join("'" + v.replace("'", "''") + "'" for v in values) + "]"
+
+
+def _job_query_names(count):
+    """JOB-style query names: 1a, 1b, ..., 2a, ..."""
+    names = []
+    number = 1
+    while len(names) < count:
+        for letter in "abcdef":
+            names.append(f"{number}{letter}")
+            if len(names) == count:
+                break
+        number += 1
+    return names
+
+
+def build_synthetic_db(db_path, rows=1_000_000, plan_generators=4, card_providers=3,
+                       build_plan_classes=3, build_plan_instances=24, work_packages=200,
+                       queries=113, skew=1.5, seed=0, threads=None):
+    """
+    Create a synthetic pgb_job database.
+
+    Args:
+        db_path: Target database file (overwritten)
+        rows (int): Number of plan_summary rows
+        plan_generators, card_providers, build_plan_classes (int): Dimension sizes
+        build_plan_instances (int): Build plan instances (cost function combinations)
+        work_packages (int): Work packages (configurations: pg x cp x bpi x host)
+        queries (int): Query graphs
+        skew (float): Zipf-like skew of work packages and queries (1 = uniform)
+        seed (int): Random seed
+        threads (int): DuckDB threads (None = DuckDB default)
+
+    Returns:
+        float: Generation time in seconds
+    """
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+
+    pg_names = PLAN_GENERATORS[:plan_generators] + [f"PG{i}" for i in range(len(PLAN_GENERATORS), plan_generators)]
+    cp_names = CARD_PROVIDERS[:card_providers] + [f"CP{i}" for i in range(len(CARD_PROVIDERS), card_providers)]
+    bpc_names = BUILD_PLAN_CLASSES[:build_plan_classes] + [f"BPC{i}" for i in range(len(BUILD_PLAN_CLASSES), build_plan_classes)]
+
+    start = time.perf_counter()
+    conn = duckdb.connect(database=str(db_path))
+    try:
+        if threads:
+            conn.execute(f"SET threads TO {threads}")
+
+        # Reproducible, parallel-safe uniform random number in [0, 1) per (row, stream)
+        conn.execute(f"CREATE TEMP MACRO rnd(i, k) AS (hash(i, k, {seed}) >> 11) / 9007199254740992.0")
+        # Skewed index in [0, n): small indexes are much more frequent for skew > 1
+        conn.execute("CREATE TEMP MACRO skewed(i, k, n, s) AS least(n - 1, floor(n * pow(rnd(i, k), s))::BIGINT)")
+        # Standard normal (Box-Muller)
+        conn.execute("CREATE TEMP MACRO randn(i, k) AS sqrt(-2 * ln(1 - rnd(i, k))) * cos(2 * pi() * rnd(i, k + 1))")
+
+        # ---- Dimension tables ----
+        conn.execute(f"""
+            CREATE TABLE plan_generator AS
+            SELECT i::INTEGER AS pg_id, {_sql_list(pg_names)}[i + 1] AS pg_name
+            FROM range({len(pg_names)}) t(i)
+        """)
+        conn.execute(f"""
+            CREATE TABLE card_provider AS
+            SELECT i::INTEGER AS cp_id, {_sql_list(cp_names)}[i + 1] AS cp_name
+            FROM range({len(cp_names)}) t(i)
+        """)
+        conn.execute(f"""
+            CREATE TABLE build_plan_class AS
+            SELECT i::INTEGER AS bpc_id, {_sql_list(bpc_names)}[i + 1] AS bpc_name
+            FROM range({len(bpc_names)}) t(i)
+        """)
+
+        join_bundle, mat, concat = (COST_FUNCTION_VARIANTS[c] for c in ("bpi_cf_join_bundle", "bpi_cf_mat", "bpi_cf_concat"))
+        conn.execute(f"""
+            CREATE TABLE build_plan_instance AS
+            SELECT
+              i::INTEGER AS bpi_id,
+              (i % {len(bpc_names)})::INTEGER AS bpi_bpc,
+              CASE WHEN rnd(i, 101) < {NULL_COST_FUNCTION_SHARE} THEN NULL
+                   ELSE ((i // {len(bpc_names)}) % {join_bundle})::INTEGER END AS bpi_cf_join_bundle,
+              CASE WHEN rnd(i, 102) < {NULL_COST_FUNCTION_SHARE} THEN NULL
+                   ELSE ((i // {len(bpc_names) * join_bundle}) % {mat})::INTEGER END AS bpi_cf_mat,
+              CASE WHEN rnd(i, 104) < {NULL_COST_FUNCTION_SHARE} THEN NULL
+                   ELSE ((i // {len(bpc_names) * join_bundle * mat}) % {concat})::INTEGER END AS bpi_cf_concat
+            FROM range({build_plan_instances}) t(i)
+        """)
+
+        conn.execute(f"""
+            CREATE TABLE work_package AS
+            SELECT
+              i::INTEGER AS wp_id,
+              (i % {len(pg_names)})::INTEGER AS wp_pg,
+              ((i // {len(pg_names)}) % {len(cp_names)})::INTEGER AS wp_cp,
+              ((i // {len(pg_names) * len(cp_names)}) % {build_plan_instances})::INTEGER AS wp_bp,
+              (i % 4)::INTEGER AS wp_cf_host_id
+            FROM range({work_packages}) t(i)
+        """)
+
+        query_names = _job_query_names(queries)
+        conn.execute(f"""
+            CREATE TABLE query_graph AS
+            SELECT i::INTEGER AS qg_id, {_sql_list(query_names)}[i + 1] AS qg_name
+            FROM range({len(query_names)}) t(i)
+        """)
+
+        # ---- Fact table ----
+        conn.execute(f"""
+            CREATE TABLE plan_summary AS
+            WITH base AS (
+              SELECT
+                i AS ps_id,
+                skewed(i, 1, {work_packages}, {skew})::INTEGER AS ps_wp,
+                {_sql_list(query_names)}[1 + skewed(i, 2, {len(query_names)}, {skew})] AS ps_qg,
+                -- true cardinalities (log-uniform 1 .. 1e9)
+                pow(10, rnd(i, 3) * 9) AS card_true,
+                -- true cost, and the plan generator's estimate of it
+                pow(10, 2 + rnd(i, 4) * 8) AS cost_tru,
+                exp(randn(i, 5) * 1.2) AS cost_factor
+              FROM range({rows}) t(i)
+            )
+            SELECT
+              ps_id::BIGINT AS ps_id,
+              ps_wp,
+              ps_qg,
+              -- Loss factor: log-normal, >= 1
+              exp(abs(randn(ps_id, 10)) * 0.8) AS ps_loss_factor,
+              -- Q-error: heavy-tailed (Pareto), rare 1e+38-scale overflow values
+              CASE WHEN rnd(ps_id, 20) < {QERR_OVERFLOW_SHARE}
+                   THEN 1e38 * (1 + rnd(ps_id, 21) * 9)
+                   ELSE pow(1 - rnd(ps_id, 22), -1.5) END AS ps_qerr_cost_pg,
+              card_true * (1 + rnd(ps_id, 30)) AS ps_sum_card_build,
+              card_true * (1 + rnd(ps_id, 31) * 4) AS ps_sum_card_probe,
+              card_true * (1 + rnd(ps_id, 32) * 2) AS ps_sum_card_pc,
+              card_true AS ps_max_card_build,
+              card_true * (1 + rnd(ps_id, 33)) AS ps_max_card_probe,
+              card_true * (1 + rnd(ps_id, 34)) AS ps_max_card_pc,
+              -- Estimated cost, occasionally 0 (P-error uses NULLIF)
+              CASE WHEN rnd(ps_id, 40) < 0.0005 THEN 0 ELSE cost_tru * cost_factor END AS ps_cost_pg,
+              cost_tru AS ps_cost_tru,
+              'HJ(' || ps_qg || ')' AS ps_plan,
+              'join(' || ps_qg || ')' AS ps_plan_log,
+              'hash_join(' || ps_qg || ')' AS ps_plan_phys
+            FROM base
+        """)
+
+        # ---- View used by the app ----
+        conn.execute((Path(SQL_DIR) / "View_ps_with_perr.sql").read_text(encoding="utf-8"))
+    finally:
+        conn.close()
+
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic pgb_job benchmark database.")
+    parser.add_argument("db_path", help="Target database file (overwritten)")
+    parser.add_argument("--size", choices=SIZE_PRESETS, help="plan_summary size preset (10k, 1m, 100m)")
+    parser.add_argument("--rows", type=int, help="plan_summary rows (overrides --size)")
+    parser.add_argument("--plan-generators", type=int, default=4)
+    parser.add_argument("--card-providers", type=int, default=3)
+    parser.add_argument("--build-plan-classes", type=int, default=3)
+    parser.add_argument("--build-plan-instances", type=int, default=24)
+    parser.add_argument("--work-packages", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=113)
+    parser.add_argument("--skew", type=float, default=1.5, help="Zipf-like skew (1 = uniform)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, help="DuckDB threads")
+    args = parser.parse_args(argv)
+
+    rows = args.rows or SIZE_PRESETS.get(args.size, SIZE_PRESETS["1m"])
+    elapsed = build_synthetic_db(
+        args.db_path, rows=rows,
+        plan_generators=args.plan_generators, card_providers=args.card_providers,
+        build_plan_classes=args.build_plan_classes, build_plan_instances=args.build_plan_instances,
+        work_packages=args.work_packages, queries=args.queries,
+        skew=args.skew, seed=args.seed, threads=args.threads
+    )
+    print(f"{args.db_path}: {rows:,} plan_summary rows in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
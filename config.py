@@ -1,4 +1,5 @@
 # config.py
+import os
 from pathlib import Path
 
 # Project Root 
@@ -7,10 +8,79 @@ BASE_DIR = Path(__file__).resolve().parent
 # DB
 DB_PATH = BASE_DIR / "pgb_job_0.db"
 
+# Benchmark run databases (pgb_job_0..N) for the multi-database comparison mode
+RUN_DB_DIR = BASE_DIR
+RUN_DB_GLOB = "pgb_job_*.db"
+# From this many selected runs on, each database is queried in its own process
+PARALLEL_AGGREGATION_MIN_RUNS = 4
+# Worker processes for the parallel aggregation (None = one per run, max. CPU count)
+PARALLEL_AGGREGATION_WORKERS = None
+
+# Exploratory mode: medians are computed on a reservoir sample of this many values per group
+APPROX_MEDIAN_SAMPLE_SIZE = 1024
+
+# Preview mode: databases with at least PREVIEW_MIN_ROWS plan_summary rows show the
+# result of a PREVIEW_SAMPLE_PERCENT % sample first, the exact result replaces it
+PREVIEW_MIN_ROWS = 2_000_000
+PREVIEW_SAMPLE_PERCENT = 5
+PREVIEW_SEED = 42
+
+# Live mode: filter changes re-run the query after this pause (ms)
+LIVE_EXECUTE_DEBOUNCE_MS = 400
+
+# Results tabs: results and rendered views of all tabs, the cached plot models and the
+# history results are kept within this budget - inactive tabs drop their rendered
+# tables/plots first (least recently used), then history results are evicted, then tabs close
+RESULTS_MEMORY_BUDGET_MB = 512
+RESULTS_MAX_TABS = 10
+
+# Query history: every execution is recorded in HISTORY_PATH (newest HISTORY_MAX_ENTRIES),
+# results of up to HISTORY_CACHE_MB are kept in memory for replay without a query
+HISTORY_PATH = BASE_DIR / "query_history.json"
+HISTORY_MAX_ENTRIES = 200
+HISTORY_CACHE_MB = 256
+
+# Export jobs: exports run in the background and are listed in the jobs panel (polled every
+# JOBS_POLL_MS while a job runs); finished jobs show a notice for JOB_NOTICE_MS
+JOBS_POLL_MS = 200
+JOB_NOTICE_MS = 5000
+JOBS_MAX_FINISHED = 5
+
+# Stall watchdog: a Tk main thread blocked longer than STALL_THRESHOLD_MS is logged
+# with its Python stack and the active user action to STALL_LOG_PATH.
+# Opt-in (heartbeat + monitor thread wake up while idle): set IV_STALL_WATCHDOG=1
+STALL_WATCHDOG_ENABLED = os.environ.get("IV_STALL_WATCHDOG", "0") == "1"
+STALL_THRESHOLD_MS = 200
+STALL_HEARTBEAT_MS = 100
+STALL_LOG_PATH = BASE_DIR / "ui_stalls.log"
+
 # SQL-Files
 SQL_DIR = BASE_DIR / "sql"
 
 # Paths für SQL-Files
 SQL_PATH_PLAENE = SQL_DIR / "Pläne_treeview.sql"  
 SQL_PATH_ALL_AGGREGATED = SQL_DIR / "all_aggregated.sql"
-SQL_PATH_ALL_SINGLE_QUERY = SQL_DIR / "all_single_query.sql"
\ No newline at end of file
+SQL_PATH_ALL_SINGLE_QUERY = SQL_DIR / "all_single_query.sql"
+
+# Plotting
+# Embedded plots: "image" = rendered in a worker process and shown as image (interactive
+# canvas on click), "interactive" = matplotlib canvas drawn on the Tk thread
+PLOT_RENDER_MODE = "image"
+PLOT_FIGSIZE = (8, 5)
+PLOT_DPI = 100
+# Plot window exports (PDF/PNG), rendered in the render process
+PLOT_EXPORT_FIGSIZE = (11, 7)
+PLOT_EXPORT_DPI = 300
+# Render processes of the in-app PDF report (box plot matrix)
+REPORT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Scatter plots with more points than this are drawn as a density image
+DENSITY_SCATTER_THRESHOLD = 20000
+# Number of (x, y) bins of the density image
+DENSITY_SCATTER_BINS = (400, 250)
+# Maximum number of configuration tick labels on a scatter plot
+SCATTER_MAX_TICK_LABELS = 20
+
+# Line graphs with more points than this are downsampled (LTTB, extrema kept)
+LINE_MAX_POINTS = 1000
+# Maximum number of value labels drawn on a line graph
+LINE_MAX_VALUE_LABELS = 20
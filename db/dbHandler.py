@@ -5,12 +5,26 @@ Handles database connections, SQL query execution, and filter building.
 All database column names and SQL placeholders are imported from db_config.py
 """
 from config import (
-    DB_PATH, SQL_PATH_PLAENE, SQL_PATH_ALL_AGGREGATED, SQL_PATH_ALL_SINGLE_QUERY
+    DB_PATH, SQL_PATH_PLAENE, SQL_PATH_ALL_AGGREGATED, SQL_PATH_ALL_SINGLE_QUERY,
+    RUN_DB_DIR, RUN_DB_GLOB, APPROX_MEDIAN_SAMPLE_SIZE, PREVIEW_SEED
 )
-from db.db_config import FILTER_KEY_MAP, ANALYSIS_TYPES
+from db.db_config import (
+    TABLES, COLUMNS, FILTER_KEY_MAP, ANALYSIS_TYPES, METRIC_TO_SQL, COMPARISON_OPERATORS, ANALYSIS_TO_FILTER_KEY
+)
+
+import contextlib
+import importlib.util
+import shutil
+import threading
+from pathlib import Path
 
 import duckdb
 
+from db.result_store import ResultSet
+
+# Arrow-backed results (ResultSet) need pyarrow, without it rows are fetched as list
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
 
 # =============================================================================
 # DATABASE CONNECTION
@@ -21,6 +35,66 @@ def connect_to_db():
     return duckdb.connect(database=DB_PATH)
 
 
+# Connections with a running GUI query: query generation -> connections.
+# Only queries started with a query_generation are registered - export jobs and
+# reports use their own connections and are never cancelled by a new GUI query.
+_running_connections = {}
+_running_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _interruptible(conn, query_generation=None):
+    """Register a connection of a GUI query while it runs (see interrupt_running_queries)."""
+    if query_generation is None:
+        yield conn
+        return
+    with _running_lock:
+        _running_connections.setdefault(query_generation, set()).add(conn)
+    try:
+        yield conn
+    finally:
+        with _running_lock:
+            connections = _running_connections.get(query_generation, set())
+            connections.discard(conn)
+            if not connections:
+                _running_connections.pop(query_generation, None)
+
+
+def interrupt_running_queries(before_generation):
+    """
+    Interrupt the GUI queries of all generations older than before_generation
+    (started with query_generation, e.g. in a background thread). They raise
+    duckdb.InterruptException; unregistered connections keep running.
+    
+    Args:
+        before_generation (int): Current query generation (its queries are kept)
+    
+    Returns:
+        int: Number of interrupted queries
+    """
+    with _running_lock:
+        connections = [conn for generation, conns in _running_connections.items()
+                       if generation < before_generation for conn in conns]
+    for conn in connections:
+        try:
+            conn.interrupt()
+        except duckdb.Error:
+            pass
+    return len(connections)
+
+
+def set_db_path(db_path):
+    """
+    Point all following queries at another database file (e.g. for headless reports).
+
+    Args:
+        db_path: Path to a DuckDB database file
+    """
+    global DB_PATH
+    DB_PATH = db_path
+    _plan_rows_estimates.clear()
+
+
 # =============================================================================
 # SQL FILTER REPLACEMENT HELPERS
 # =============================================================================
@@ -81,7 +155,86 @@ def _apply_metric_columns(sql, analysis_type, is_aggregated=True):
     return sql.replace("{METRIC_COLUMNS}", metric_cols)
 
 
-def _execute_sql(sql, debug_label=None):
+# Median placeholder of the SELECT lists in the SQL templates: {MEDIAN}(expression).
+# Exploratory mode turns it into the median of a per-group reservoir sample.
+# (APPROX_QUANTILE's t-digest is slower than the exact median in DuckDB, the
+# reservoir keeps only APPROX_MEDIAN_SAMPLE_SIZE values per group.)
+# MEDIAN() calls of the user's detail filter (HAVING) are never rewritten.
+MEDIAN_PLACEHOLDER = "{MEDIAN}("
+
+
+def _apply_median_placeholder(sql, approx_median=False):
+    """
+    Replace every {MEDIAN}(expression) with MEDIAN(expression), or with
+    RESERVOIR_QUANTILE(expression, 0.5, sample size) in exploratory mode.
+    The expression may contain parentheses (matched up to the closing one).
+    
+    Args:
+        sql (str): SQL template
+        approx_median (bool): Approximate the medians
+    
+    Returns:
+        str: SQL with median calls
+    """
+    parts = []
+    pos = 0
+    while True:
+        start = sql.find(MEDIAN_PLACEHOLDER, pos)
+        if start < 0:
+            parts.append(sql[pos:])
+            return "".join(parts)
+        # Find the parenthesis closing the placeholder call
+        depth = 1
+        end = start + len(MEDIAN_PLACEHOLDER)
+        while depth and end < len(sql):
+            depth += {"(": 1, ")": -1}.get(sql[end], 0)
+            end += 1
+        if depth:
+            raise ValueError(f"Unbalanced {MEDIAN_PLACEHOLDER}...) in SQL template")
+        expression = sql[start + len(MEDIAN_PLACEHOLDER):end - 1]
+        if approx_median:
+            call = f"RESERVOIR_QUANTILE({expression}, 0.5, {APPROX_MEDIAN_SAMPLE_SIZE})"
+        else:
+            call = f"MEDIAN({expression})"
+        parts.append(sql[pos:start] + call)
+        pos = end
+
+
+def _sampled_base_table(base_table, percent):
+    """
+    Wrap the base view in a SAMPLE subquery that keeps its name.
+    
+    System (block) sampling skips whole row groups, so the preview reads only
+    about percent % of plan_summary. The fixed seed keeps previews repeatable.
+    
+    Args:
+        base_table (str): Base view, optionally qualified (alias.v_ps_base)
+        percent (float): Sample size in percent
+    
+    Returns:
+        str: Subquery usable in place of the base view
+    """
+    return (f"(SELECT * FROM {base_table} USING SAMPLE {percent:g}% (system, {PREVIEW_SEED})) "
+            f"AS {TABLES['ps_base']}")
+
+
+def _fetch_result(cursor, arrow=False):
+    """
+    Fetch all rows of an executed cursor.
+    
+    Args:
+        cursor: DuckDB connection/cursor after execute()
+        arrow (bool): Return a ResultSet (Arrow table) instead of a list of tuples
+    
+    Returns:
+        ResultSet or list: Result rows
+    """
+    if arrow and HAS_PYARROW:
+        return ResultSet.from_arrow(cursor.arrow())
+    return cursor.fetchall()
+
+
+def _execute_sql(sql, debug_label=None, arrow=False, query_generation=None):
     """
     Execute SQL and return columns and results.
     Optionally print debug information.
@@ -89,6 +242,8 @@ def _execute_sql(sql, debug_label=None):
     Args:
         sql (str): SQL query to execute
         debug_label (str): If provided, print debug info with this label
+        arrow (bool): Return the rows as ResultSet (see _fetch_result)
+        query_generation (int): GUI query generation (interruptible by newer ones)
     
     Returns:
         tuple: (columns, results)
@@ -100,9 +255,15 @@ def _execute_sql(sql, debug_label=None):
         print(sql)
         print("=" * 80 + "\n")
     
+    # Execute once, take the columns from the same cursor
     conn = connect_to_db()
-    columns = [desc[0] for desc in conn.execute(sql).description]
-    result = conn.execute(sql).fetchall()
+    try:
+        with _interruptible(conn, query_generation):
+            cursor = conn.execute(sql)
+            columns = [desc[0] for desc in cursor.description]
+            result = _fetch_result(cursor, arrow)
+    finally:
+        conn.close()
     
     return columns, result
 
@@ -126,16 +287,16 @@ QUERY_FILE_MAP = {
 # MAIN QUERY EXECUTION
 # =============================================================================
 
-def execute_query(file_nr, filters=None):
+def render_query_sql(file_nr, filters=None):
     """
-    Execute a SQL query based on the query ID.
+    Load the SQL template of a query ID and replace all placeholders.
     
     Args:
-        file_nr (int): Query identifier (1-8)
+        file_nr (int): Query identifier (1-3)
         filters (dict): Filter values for SQL placeholders
     
     Returns:
-        tuple: (columns, results) or None if invalid query ID
+        str: Executable SQL, or None if invalid query ID
     """
     if filters is None:
         filters = {}
@@ -145,37 +306,502 @@ def execute_query(file_nr, filters=None):
     if sql_path is None:
         return None
     
-    try:
-        # Read SQL template
-        sql = open(sql_path).read()
+    # Read SQL template
+    sql = open(sql_path).read()
+    
+    # Median columns: exact, or approximate in exploratory mode (before the user's filter is inserted)
+    sql = _apply_median_placeholder(sql, filters.get("APPROX_MEDIAN"))
+    
+    # Apply standard filters
+    sql = _apply_standard_filters(sql, filters)
+    
+    # Base view - qualified with the database alias in multi-database mode
+    base_table = filters.get("PS_BASE_TABLE", TABLES["ps_base"])
+    
+    # Preview mode: same query on a block sample of the base view
+    if filters.get("SAMPLE_PERCENT"):
+        base_table = _sampled_base_table(base_table, filters["SAMPLE_PERCENT"])
+    sql = sql.replace("{PS_BASE_TABLE}", base_table)
+    
+    # Handle special cases for metric columns (query 2 and 3)
+    if file_nr in (2, 3):
+        analysis_type = filters.get("ANALYSIS_TYPE", "LF")
+        is_aggregated = (file_nr == 2)
+        sql = _apply_metric_columns(sql, analysis_type, is_aggregated)
         
-        # Apply standard filters
-        sql = _apply_standard_filters(sql, filters)
+        # Set default for DETAIL_METRIC_FILTER if not present
+        if "{DETAIL_METRIC_FILTER}" in sql:
+            sql = sql.replace("{DETAIL_METRIC_FILTER}", filters.get("DETAIL_METRIC_FILTER", "1=1"))
+    
+    return sql
+
+
+def execute_query(file_nr, filters=None, arrow=False, query_generation=None):
+    """
+    Execute a SQL query based on the query ID.
+    
+    Args:
+        file_nr (int): Query identifier (1-8)
+        filters (dict): Filter values for SQL placeholders
+        arrow (bool): Return the rows as ResultSet (Arrow table, held once and
+                      shared by table, plots and exports) instead of a list
+        query_generation (int): GUI query generation - the query is cancelled by
+                                interrupt_running_queries() of a newer one (None = never)
+    
+    Returns:
+        tuple: (columns, results) or None if invalid query ID
+    """
+    if filters is None:
+        filters = {}
+    
+    try:
+        sql = render_query_sql(file_nr, filters)
+        if sql is None:
+            return None
         
-        # Handle special cases for metric columns (query 2 and 3)
+        # Query 2 and 3: print the rendered SQL for debugging
         if file_nr in (2, 3):
             analysis_type = filters.get("ANALYSIS_TYPE", "LF")
             is_aggregated = (file_nr == 2)
-            sql = _apply_metric_columns(sql, analysis_type, is_aggregated)
-            
-            # Set default for DETAIL_METRIC_FILTER if not present
-            if "{DETAIL_METRIC_FILTER}" in sql:
-                sql = sql.replace("{DETAIL_METRIC_FILTER}", filters.get("DETAIL_METRIC_FILTER", "1=1"))
-            
             debug_label = f"{'All Aggregated' if is_aggregated else 'All Single'} Query (query_id={file_nr}, analysis_type={analysis_type})"
-            return _execute_sql(sql, debug_label)
+            return _execute_sql(sql, debug_label, arrow, query_generation)
         
         # Standard queries (query 1: Pläne treeview)
-        return _execute_sql(sql)
+        return _execute_sql(sql, arrow=arrow, query_generation=query_generation)
         
     except Exception as ex:
         raise ex
 
 
+# =============================================================================
+# MULTI-DATABASE COMPARISON (benchmark runs pgb_job_0..N)
+# =============================================================================
+
+# Configuration columns identifying the same configuration across runs
+COMPARISON_KEY_COLUMNS = [
+    COLUMNS["pg_name"], COLUMNS["cp_name"], COLUMNS["bpc_name"],
+    COLUMNS["cf_join_bundle"], COLUMNS["cf_mat"], COLUMNS["cf_concat"], COLUMNS["cf_host_id"],
+]
+
+
+def list_run_databases():
+    """
+    Find the benchmark run databases (RUN_DB_GLOB in RUN_DB_DIR).
+    
+    Returns:
+        list: Database paths sorted by run number / name
+    """
+    def run_key(path):
+        digits = "".join(ch for ch in path.stem if ch.isdigit())
+        return (int(digits) if digits else -1, path.name)
+    
+    return sorted(Path(RUN_DB_DIR).glob(RUN_DB_GLOB), key=run_key)
+
+
+def run_name(db_path):
+    """Display name of a run database (file name without extension)."""
+    return Path(db_path).stem
+
+
+def _attach_runs(conn, db_paths):
+    """
+    ATTACH all run databases read-only to one DuckDB session.
+    
+    Returns:
+        list: (alias, run name) per database
+    """
+    runs = []
+    for i, db_path in enumerate(db_paths):
+        alias = f"run_{i}"
+        conn.execute(f"ATTACH {_sql_string(db_path)} AS {alias} (READ_ONLY)")
+        runs.append((alias, run_name(db_path)))
+    return runs
+
+
+def render_multi_db_sql(file_nr, filters, runs):
+    """
+    Render a query once per attached run and combine them with UNION ALL.
+    Each branch reads <alias>.v_ps_base and adds a source_db column.
+    DuckDB executes the UNION ALL branches in parallel.
+    
+    Args:
+        file_nr (int): Query identifier (2 or 3)
+        filters (dict): Filter values for SQL placeholders
+        runs (list): (alias, run name) from _attach_runs()
+    
+    Returns:
+        str: Combined SQL
+    """
+    branches = []
+    for alias, name in runs:
+        run_filters = dict(filters, PS_BASE_TABLE=f"{alias}.{TABLES['ps_base']}")
+        sql = render_query_sql(file_nr, run_filters).strip().rstrip(";")
+        branches.append(f"SELECT {_sql_string(name)} AS source_db, *\nFROM (\n{sql}\n)")
+    return "SELECT * FROM (\n" + "\nUNION ALL\n".join(branches) + "\n)\nORDER BY ALL"
+
+
+def execute_multi_db_query(file_nr, filters, db_paths, arrow=False, query_generation=None):
+    """
+    Run a query across several run databases in one DuckDB session.
+    
+    Args:
+        file_nr (int): Query identifier (2=Aggregated, 3=Single Query)
+        filters (dict): Filter values for SQL placeholders
+        db_paths (list): Run database paths
+        arrow (bool): Return the rows as ResultSet instead of a list
+        query_generation (int): GUI query generation (see execute_query)
+    
+    Returns:
+        tuple: (columns, results) with source_db as first column
+    """
+    conn = duckdb.connect(database=":memory:")
+    try:
+        runs = _attach_runs(conn, db_paths)
+        sql = render_multi_db_sql(file_nr, filters, runs)
+        print(f"DEBUG: multi-database query over {len(runs)} runs (query_id={file_nr})")
+        with _interruptible(conn, query_generation):
+            cursor = conn.execute(sql)
+            columns = [desc[0] for desc in cursor.description]
+            return columns, _fetch_result(cursor, arrow)
+    finally:
+        conn.close()
+
+
+def execute_run_comparison(file_nr, filters, db_paths, metric, query_generation=None):
+    """
+    Side-by-side comparison: one row per configuration, one metric column per run.
+    (AVG per configuration - aggregated results have exactly one row per run.)
+    
+    Args:
+        file_nr (int): Query identifier (2=Aggregated, 3=Single Query)
+        filters (dict): Filter values for SQL placeholders
+        db_paths (list): Run database paths
+        metric (str): Metric column to compare (e.g. 'avg_lf')
+        query_generation (int): GUI query generation (see execute_query)
+    
+    Returns:
+        tuple: (columns, results)
+    """
+    key_columns = ([COLUMNS["query_name"]] if file_nr == 3 else []) + COMPARISON_KEY_COLUMNS
+    
+    conn = duckdb.connect(database=":memory:")
+    try:
+        runs = _attach_runs(conn, db_paths)
+        union_sql = render_multi_db_sql(file_nr, filters, runs)
+        run_list = ", ".join(_sql_string(name) for _, name in runs)
+        sql = (
+            f"PIVOT (\n{union_sql}\n) ON source_db IN ({run_list})\n"
+            f"USING AVG({metric})\n"
+            f"GROUP BY {', '.join(key_columns)}\n"
+            f"ORDER BY ALL"
+        )
+        with _interruptible(conn, query_generation):
+            cursor = conn.execute(sql)
+            columns = [desc[0] for desc in cursor.description]
+            return columns, cursor.fetchall()
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# STREAMING EXPORT (DuckDB COPY)
+# =============================================================================
+
+# Export format -> DuckDB COPY format name
+EXPORT_FORMATS = {
+    "csv": "CSV",
+    "parquet": "PARQUET",
+}
+
+# Chunk size for prepending the CSV comment header (bytes)
+EXPORT_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Rows per fetchmany() batch for streaming exports (Excel)
+EXPORT_BATCH_SIZE = 10000
+
+# Excel sheet row limit (including header rows)
+EXCEL_MAX_ROWS = 1048576
+
+
+def _sql_string(value):
+    """Quote a Python value as an SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _copy_to_file(conn, sql, filepath, file_format, params_summary=None, metadata=None):
+    """
+    Write the result of an SQL statement to a file with DuckDB COPY.
+    
+    CSV: params_summary is written as "# Query Parameters: ..." comment header.
+    Parquet: params_summary and metadata are stored as key/value file metadata.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    
+    # COPY needs a single statement without trailing semicolon
+    sql = sql.strip().rstrip(";")
+    filepath = Path(filepath)
+    
+    options = [f"FORMAT {EXPORT_FORMATS[file_format]}"]
+    if file_format == "csv":
+        options.append("HEADER")
+    else:
+        kv = dict(metadata or {})
+        if params_summary:
+            kv["params_summary"] = params_summary
+        if kv:
+            pairs = ", ".join(f"{key}: {_sql_string(value)}" for key, value in kv.items())
+            options.append(f"KV_METADATA {{{pairs}}}")
+    
+    # CSV with comment header: DuckDB writes to a temp file, which is then appended
+    # behind the comment lines in chunks (constant memory)
+    with_header = file_format == "csv" and params_summary
+    target = filepath.with_name(filepath.name + ".part") if with_header else filepath
+    
+    conn.execute(f"COPY (\n{sql}\n) TO {_sql_string(target)} ({', '.join(options)})")
+    
+    if with_header:
+        try:
+            with open(filepath, 'w', encoding='utf-8', newline='') as out, open(target, 'r', encoding='utf-8', newline='') as src:
+                out.write(f"# Query Parameters: {params_summary}\n")
+                out.write("#\n")
+                shutil.copyfileobj(src, out, EXPORT_COPY_CHUNK_SIZE)
+        finally:
+            target.unlink(missing_ok=True)
+
+
+def export_query(file_nr, filters, filepath, file_format="csv", params_summary=None, on_connection=None):
+    """
+    Re-run a query and let DuckDB write the result directly to a file.
+    Rows never pass through Python, so memory stays constant and DuckDB's
+    parallel writer is used.
+    
+    CSV: params_summary is written as "# Query Parameters: ..." comment header.
+    Parquet: params_summary, query ID and analysis type are stored as file metadata
+    (read back by read_parquet_source()).
+    
+    Args:
+        file_nr (int): Query identifier (1-3)
+        filters (dict): Filter values for SQL placeholders
+        filepath: Target file path
+        file_format (str): "csv" or "parquet"
+        params_summary (str): Parameter summary (optional)
+        on_connection (callable): Called with the connection before COPY runs, e.g. to
+                                  interrupt() it from another thread (optional)
+    """
+    sql = render_query_sql(file_nr, filters)
+    if sql is None:
+        raise ValueError(f"Invalid query ID: {file_nr}")
+    
+    metadata = {"file_nr": file_nr, "analysis_type": filters.get("ANALYSIS_TYPE", "LF")}
+    
+    conn = connect_to_db()
+    try:
+        if on_connection:
+            on_connection(conn)
+        _copy_to_file(conn, sql, filepath, file_format, params_summary, metadata)
+    finally:
+        conn.close()
+
+
+def export_rows(columns, data, filepath, file_format="csv", params_summary=None, metadata=None,
+                on_connection=None):
+    """
+    Write already fetched rows to CSV/Parquet through an in-memory DuckDB.
+    Used when no query spec is available (e.g. results opened from a Parquet file).
+    
+    Args:
+        columns (list): Column names
+        data: Result rows (ResultSet or list)
+        filepath: Target file path
+        file_format (str): "csv" or "parquet"
+        params_summary (str): Parameter summary (optional)
+        metadata (dict): Additional Parquet key/value metadata (optional)
+        on_connection (callable): Called with the connection before COPY runs (optional)
+    """
+    import pandas as pd
+    
+    conn = duckdb.connect(database=":memory:")
+    try:
+        if on_connection:
+            on_connection(conn)
+        # A ResultSet's Arrow table is scanned in place, a row list needs a DataFrame first
+        source = data.table if isinstance(data, ResultSet) else pd.DataFrame(data, columns=columns)
+        conn.register("export_rows", source)
+        _copy_to_file(conn, "SELECT * FROM export_rows", filepath, file_format, params_summary, metadata)
+    finally:
+        conn.close()
+
+
+def iter_query_batches(file_nr, filters, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Re-run a query and yield its rows in batches (DuckDB cursor fetchmany).
+    The connection is closed when the generator is exhausted or closed.
+    
+    Args:
+        file_nr (int): Query identifier (1-3)
+        filters (dict): Filter values for SQL placeholders
+        batch_size (int): Rows per batch
+    
+    Yields:
+        list: Up to batch_size result rows
+    """
+    sql = render_query_sql(file_nr, filters)
+    if sql is None:
+        raise ValueError(f"Invalid query ID: {file_nr}")
+    
+    conn = connect_to_db()
+    try:
+        cursor = conn.execute(sql)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+
+def iter_row_batches(data, batch_size=EXPORT_BATCH_SIZE):
+    """Yield already fetched rows in batches (same interface as iter_query_batches)."""
+    for start in range(0, len(data), batch_size):
+        yield data[start:start + batch_size]
+
+
+def iter_excel_export(columns, batches, filepath, params_summary=None, sheet_name="Data"):
+    """
+    Write row batches into an Excel file with an openpyxl write-only workbook.
+    Rows are streamed to the workbook, the file is written at the end.
+    Starts a new sheet ("Data (2)", ...) whenever the Excel row limit is reached;
+    every sheet repeats the parameter header and the column names.
+    
+    Implemented as generator so the caller can show progress and cancel between
+    batches (closing the generator before the end writes no file).
+    
+    Args:
+        columns (list): Column names
+        batches: Iterable of row lists (iter_query_batches / iter_row_batches)
+        filepath: Target .xlsx path
+        params_summary (str): Parameter summary written above the data (optional)
+        sheet_name (str): Base name of the sheets
+    
+    Yields:
+        int: Rows written so far after each batch, then None while the file is saved
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError("openpyxl is required for Excel export (pip install openpyxl)")
+    
+    header_rows = []
+    if params_summary:
+        header_rows = [['Query Parameters:', params_summary], ['', '']]
+    header_rows.append(list(columns))
+    sheet_capacity = EXCEL_MAX_ROWS - len(header_rows)
+    
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = 0
+    written = 0
+    
+    try:
+        for batch in batches:
+            for row in batch:
+                if sheet is None or sheet_rows >= sheet_capacity:
+                    sheet_number = len(workbook.worksheets) + 1
+                    sheet = workbook.create_sheet(sheet_name if sheet_number == 1 else f"{sheet_name} ({sheet_number})")
+                    for header_row in header_rows:
+                        sheet.append(header_row)
+                    sheet_rows = 0
+                sheet.append(row)
+                sheet_rows += 1
+            written += len(batch)
+            yield written
+    except GeneratorExit:
+        # Cancelled: finish the temporary sheet streams (openpyxl removes them at exit), write no file
+        for open_sheet in workbook.worksheets:
+            open_sheet.close()
+        if hasattr(batches, "close"):
+            batches.close()
+        raise
+    
+    # Empty result: still write the header
+    if sheet is None:
+        sheet = workbook.create_sheet(sheet_name)
+        for header_row in header_rows:
+            sheet.append(header_row)
+    
+    yield None
+    workbook.save(filepath)
+
+
+# =============================================================================
+# PARQUET DATA SOURCE (read-only)
+# =============================================================================
+
+def read_parquet_source(filepath):
+    """
+    Load an exported Parquet file as a read-only result set.
+    Uses an in-memory DuckDB connection - the configured database is not touched.
+    
+    Args:
+        filepath: Path of the Parquet file
+    
+    Returns:
+        tuple: (columns, results, metadata) - results is a ResultSet (list without pyarrow),
+               metadata is a dict of the file's key/value metadata
+               (e.g. 'params_summary', 'file_nr', 'analysis_type')
+    """
+    path = _sql_string(filepath)
+    conn = duckdb.connect(database=":memory:")
+    try:
+        cursor = conn.execute(f"SELECT * FROM read_parquet({path})")
+        columns = [desc[0] for desc in cursor.description]
+        results = _fetch_result(cursor, arrow=True)
+        
+        metadata = {}
+        for key, value in conn.execute(f"SELECT key, value FROM parquet_kv_metadata({path})").fetchall():
+            metadata[key.decode('utf-8', 'replace')] = value.decode('utf-8', 'replace')
+    finally:
+        conn.close()
+    
+    return columns, results, metadata
+
+
 # =============================================================================
 # DROPDOWN DATA RETRIEVAL
 # =============================================================================
 
+# DB_PATH -> estimated plan_summary rows (the catalog is only read once per database)
+_plan_rows_estimates = {}
+
+
+def estimate_plan_rows():
+    """
+    Estimated row count of plan_summary from the DuckDB catalog (no table scan).
+    Cached per database file - Execute does not open a connection for it again.
+    
+    Returns:
+        int: Estimated rows, 0 if the table does not exist
+    """
+    key = str(DB_PATH)
+    if key not in _plan_rows_estimates:
+        _plan_rows_estimates[key] = _read_plan_rows_estimate()
+    return _plan_rows_estimates[key]
+
+
+def _read_plan_rows_estimate():
+    conn = connect_to_db()
+    try:
+        row = conn.execute(
+            "SELECT estimated_size FROM duckdb_tables() WHERE table_name = ?",
+            [TABLES["plan_summary"]]
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row and row[0] else 0
+
+
 def get_values_for_dropdown(table_name, column_name):
     """
     Get distinct values from a table column for populating dropdowns.
@@ -276,3 +902,82 @@ def build_cost_filters(cost_function_dict):
         filters[filter_key] = build_filter(key, values)
 
     return filters
+
+
+def build_detail_metric_filter(filter_values):
+    """
+    Convert detail filter values to an SQL HAVING clause condition for DuckDB.
+    Uses centralized METRIC_TO_SQL and COMPARISON_OPERATORS from db_config.
+    
+    Args:
+        filter_values (list): List of filter dictionaries, each containing
+            - 'metric': Selected metric (e.g., 'avg_lf')
+            - 'comparison': Comparison type (e.g., 'greater than', 'between')
+            - 'value': Numeric value (tuple of two values for 'between')
+    
+    Returns:
+        str: SQL condition with multiple filters combined with AND, or "1=1"
+             (e.g., "AVG(ps_loss_factor) > 10.0 AND MEDIAN(ps_loss_factor) < 50.0")
+    """
+    if not filter_values:
+        return "1=1"  # No filtering
+    
+    conditions = []
+    for filter_dict in filter_values:
+        metric = filter_dict.get('metric')
+        comparison = filter_dict.get('comparison')
+        value = filter_dict.get('value')
+        
+        # Skip incomplete filters
+        if not metric or not comparison or value is None:
+            continue
+        
+        # Get SQL expression from centralized config
+        sql_metric = METRIC_TO_SQL.get(metric, metric)
+        
+        if comparison == "between":
+            if isinstance(value, (tuple, list)) and len(value) == 2:
+                conditions.append(f"{sql_metric} BETWEEN {value[0]} AND {value[1]}")
+        else:
+            operator = COMPARISON_OPERATORS.get(comparison, ">")
+            conditions.append(f"{sql_metric} {operator} {value}")
+    
+    return " AND ".join(conditions) if conditions else "1=1"
+
+
+def build_query_filters(selected_pg, selected_cp, selected_bpc, selected_cf, selected_qg,
+                        analysis_type="Loss Factor", detail_metric_filter="1=1", approx_median=False):
+    """
+    Build the complete filter dictionary for execute_query() from user selections.
+    Shared by the GUI and the headless report generator.
+    
+    Args:
+        selected_pg (list): Selected plan generators
+        selected_cp (list): Selected cardinality providers
+        selected_bpc (list): Selected build plan classes
+        selected_cf (dict): Selected cost function values per cost function column
+        selected_qg (list): Selected query graphs
+        analysis_type (str): "Loss Factor", "Q-Error" or "P-Error"
+        detail_metric_filter (str): Condition from build_detail_metric_filter()
+        approx_median (bool): Exploratory mode - approximate the median columns
+    
+    Returns:
+        dict: Filter values for the SQL placeholders
+    """
+    filters = {
+        "PG_NAME_FILTER": build_filter("pg_name", selected_pg),
+        "CP_NAME_FILTER": build_filter("cp_name", selected_cp),
+        "BPC_NAME_FILTER": build_filter("bpc_name", selected_bpc),
+        "QUERY_NAME_FILTER": build_filter("ps_qg", selected_qg),
+        "DETAIL_METRIC_FILTER": detail_metric_filter,
+        # Analysis type for column selection
+        "ANALYSIS_TYPE": ANALYSIS_TO_FILTER_KEY.get(analysis_type, "LF"),
+        # Exploratory mode (see render_query_sql)
+        "APPROX_MEDIAN": approx_median,
+    }
+    
+    # Add cost function filters - cost functions without a selection are not filtered
+    cost_functions = {COLUMNS[key]: [] for key in ("cf_join_bundle", "cf_mat", "cf_concat", "cf_host_id")}
+    cost_functions.update(selected_cf or {})
+    filters.update(build_cost_filters(cost_functions))
+    return filters
@@ -16,6 +16,7 @@ TABLES = {
     "build_plan_instance": "build_plan_instance",
     "work_package": "work_package",
     "query_graph": "query_graph",
+    "plan_summary": "plan_summary",
     "ps_base": "v_ps_base",  # View name
 }
 
@@ -65,6 +66,7 @@ SQL_PLACEHOLDERS = {
     "DETAIL_METRIC_FILTER": "{DETAIL_METRIC_FILTER}",
     "METRIC_COLUMNS": "{METRIC_COLUMNS}",
     "ANALYSIS_TYPE": "{ANALYSIS_TYPE}",
+    "PS_BASE_TABLE": "{PS_BASE_TABLE}",
 }
 
 # =============================================================================
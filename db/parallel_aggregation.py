@@ -0,0 +1,118 @@
+# parallel_aggregation.py
+"""
+Parallel Aggregation Module
+Runs a query over many benchmark run databases with a process pool, one task per
+database file. Each worker opens its database read-only, runs the rendered query
+and sends the result back as compact Arrow IPC stream (with a source_db column);
+the parent merges the Arrow tables.
+
+Used instead of the single-session ATTACH/UNION ALL (dbHandler.execute_multi_db_query)
+when many runs are selected. Requires pyarrow.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import duckdb
+
+from db.dbHandler import render_query_sql, run_name
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def _import_pyarrow():
+    """Import pyarrow with a readable error if it is missing."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("pyarrow is required for parallel aggregation (pip install pyarrow)")
+    return pa
+
+
+def _aggregate_run(task):
+    """
+    Worker entry point: run the query on one database file.
+
+    Args:
+        task (tuple): (db_path, file_nr, filters, threads)
+
+    Returns:
+        pyarrow.Buffer: Arrow IPC stream with source_db as first column
+    """
+    pa = _import_pyarrow()
+    db_path, file_nr, filters, threads = task
+    name = run_name(db_path)
+
+    sql = render_query_sql(file_nr, filters)
+    conn = duckdb.connect(database=str(db_path), read_only=True)
+    try:
+        # Split the cores between the workers instead of every worker using all of them
+        conn.execute(f"SET threads TO {threads}")
+        result = conn.execute(sql).arrow()
+        # Newer DuckDB versions return a RecordBatchReader, older ones a Table
+        reader = result if isinstance(result, pa.RecordBatchReader) else result.to_reader()
+
+        schema = reader.schema.insert(0, pa.field("source_db", pa.string()))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for batch in reader:
+                source = pa.array([name] * batch.num_rows, type=pa.string())
+                writer.write_batch(pa.RecordBatch.from_arrays([source, *batch.columns], schema=schema))
+    finally:
+        conn.close()
+
+    return sink.getvalue()
+
+
+# =============================================================================
+# DRIVER
+# =============================================================================
+
+def aggregate_runs(db_paths, file_nr=2, filters=None, workers=None, threads=None):
+    """
+    Run a query on every database in a process pool and merge the results.
+
+    Args:
+        db_paths (list): Run database paths
+        file_nr (int): Query identifier (2=Aggregated, 3=Single Query)
+        filters (dict): Filter values for SQL placeholders
+        workers (int): Number of worker processes (default: one per database, max. CPU count)
+        threads (int): DuckDB threads per worker (default: the CPU count split between the workers)
+
+    Returns:
+        pyarrow.Table: Merged result sorted like ORDER BY ALL, source_db as first column
+    """
+    pa = _import_pyarrow()
+    if filters is None:
+        filters = {}
+    if not db_paths:
+        raise ValueError("No databases given")
+
+    cpu_count = os.cpu_count() or 1
+    if workers is None:
+        workers = min(len(db_paths), cpu_count)
+    workers = max(1, min(workers, len(db_paths)))
+    if threads is None:
+        threads = max(1, cpu_count // workers)
+
+    tasks = [(str(path), file_nr, filters, threads) for path in db_paths]
+
+    if workers == 1:
+        buffers = [_aggregate_run(task) for task in tasks]
+    else:
+        # "spawn" keeps workers independent of the parent's DuckDB connection and Tk state
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            buffers = list(pool.map(_aggregate_run, tasks))
+
+    tables = [pa.ipc.open_stream(buffer).read_all() for buffer in buffers]
+    try:
+        # Types can differ between runs (e.g. INTEGER vs BIGINT) - promote them
+        table = pa.concat_tables(tables, promote_options="permissive")
+    except TypeError:
+        # pyarrow < 14
+        table = pa.concat_tables(tables)
+    # Same row order as the ATTACH/UNION ALL query (ORDER BY ALL: source_db, then the group keys)
+    return table.sort_by([(column, "ascending") for column in table.column_names])
@@ -0,0 +1,178 @@
+# result_store.py
+"""
+Result Store Module
+Holds a query result once, as columnar Arrow table, and hands out views of it.
+
+A ResultSet behaves like the row list execute_query() returns (len(), iteration,
+slicing), so table, plot, export and fullscreen code accept both. Rows are only
+turned into Python tuples batch by batch while they are consumed; the DataFrame
+view (ArrowDtype columns) and DuckDB scans of the table reuse the Arrow buffers
+without copying. A result is held once, no matter how many views are open.
+
+ResultCache keeps recent results by key (result_cache_key of the query and its
+filters), so the query history can show them again without a DuckDB round trip.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# Rows converted to Python tuples at a time while iterating
+ROW_BATCH_SIZE = 10000
+
+
+class ResultSet:
+    """Read-only query result backed by a pyarrow.Table."""
+
+    def __init__(self, table):
+        self.table = table
+        self._dataframe = None
+
+    @classmethod
+    def from_arrow(cls, result):
+        """Create from a pyarrow.Table or RecordBatchReader (DuckDB .arrow())."""
+        if hasattr(result, "read_all"):
+            result = result.read_all()
+        return cls(result)
+
+    @property
+    def columns(self):
+        """Column names."""
+        return self.table.column_names
+
+    @property
+    def nbytes(self):
+        """Size of the Arrow buffers in bytes."""
+        return self.table.nbytes
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def __bool__(self):
+        return self.table.num_rows > 0
+
+    def __iter__(self):
+        for batch in self.table.to_batches(max_chunksize=ROW_BATCH_SIZE):
+            yield from zip(*(column.to_pylist() for column in batch.columns))
+
+    def __getitem__(self, index):
+        """Row tuple for an int, list of row tuples for a slice (like a row list)."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.table.num_rows)
+            if step != 1:
+                return list(self)[index]
+            part = self.table.slice(start, max(0, stop - start))
+            return list(zip(*(column.to_pylist() for column in part.columns)))
+        if index < 0:
+            index += self.table.num_rows
+        if not 0 <= index < self.table.num_rows:
+            raise IndexError("ResultSet index out of range")
+        return tuple(column[index].as_py() for column in self.table.columns)
+
+    def to_dataframe(self):
+        """
+        DataFrame view with ArrowDtype columns (shares the Arrow buffers).
+        Created once and reused by every plot of this result.
+        """
+        if self._dataframe is None:
+            self._dataframe = self.table.to_pandas(types_mapper=pd.ArrowDtype)
+        return self._dataframe
+
+
+def result_dataframe(columns, data):
+    """
+    DataFrame for a result - the shared view of a ResultSet, a new frame for a row list.
+
+    Args:
+        columns (list): Column names
+        data: ResultSet or list of row tuples
+
+    Returns:
+        pandas.DataFrame
+    """
+    if isinstance(data, ResultSet):
+        return data.to_dataframe()
+    return pd.DataFrame(data, columns=columns)
+
+
+def result_cache_key(*parts):
+    """
+    Stable key of a query result (same query + filters = same key, across sessions).
+
+    Args:
+        *parts: JSON-serializable description of the query (query id, filters, runs, ...)
+
+    Returns:
+        str: Hex digest
+    """
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """LRU cache of query results, bounded by their size in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes), least recently used first
+        self._bytes = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """Size of all cached results in bytes."""
+        return self._bytes
+
+    def get(self, key):
+        """Cached value for key (None if not cached)."""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def put(self, key, value, nbytes):
+        """
+        Cache a value; least recently used values are evicted to stay within max_bytes.
+
+        Args:
+            key (str): Key from result_cache_key()
+            value: Cached object (e.g. columns, ResultSet and plot result id)
+            nbytes (int): Size of the value (a value above max_bytes is not cached)
+        """
+        self.discard(key)
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def values(self):
+        """Cached values, least recently used first."""
+        return [value for value, _ in self._entries.values()]
+
+    def pop_oldest(self):
+        """Evict the least recently used value (False if the cache is empty)."""
+        if not self._entries:
+            return False
+        _, (_, evicted) = self._entries.popitem(last=False)
+        self._bytes -= evicted
+        return True
+
+    def discard(self, key):
+        """Remove key from the cache (no error if missing)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
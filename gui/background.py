@@ -0,0 +1,55 @@
+"""
+GUI Background Module
+Runs slow work (e.g. exact queries) in a worker thread without blocking the Tk loop.
+
+Tk widgets may only be touched from the main thread, so the worker puts its
+result into a queue and the main thread polls it with after() and calls the
+callbacks there.
+"""
+
+import queue
+import threading
+
+
+def run_in_background(widget, func, on_done, on_error=None, poll_ms=50):
+    """
+    Call func() in a daemon thread, then on_done(result) in the Tk thread.
+
+    Args:
+        widget: Any Tk widget (used for after() polling)
+        func (callable): Work without Tk access
+        on_done (callable): Called with the return value of func
+        on_error (callable): Called with the exception if func raised (None = print it)
+        poll_ms (int): Polling interval in milliseconds
+
+    Returns:
+        threading.Thread: The started worker thread
+    """
+    results = queue.Queue(maxsize=1)
+
+    def worker():
+        try:
+            results.put((True, func()))
+        except Exception as ex:
+            results.put((False, ex))
+
+    def poll():
+        # Window closed while the worker was running: drop the result
+        if getattr(widget, "_is_closing", False):
+            return
+        try:
+            ok, value = results.get_nowait()
+        except queue.Empty:
+            widget.after(poll_ms, poll)
+            return
+        if ok:
+            on_done(value)
+        elif on_error is not None:
+            on_error(value)
+        else:
+            print(f"Background task failed: {value}")
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    widget.after(poll_ms, poll)
+    return thread
@@ -1,24 +1,37 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
-from db.dbHandler import get_values_for_dropdown, build_filter, build_cost_filters, execute_query
-from gui.multiSelect import PopoverMultiSelect, MultiSelectPlus
+from db.dbHandler import get_values_for_dropdown, build_filter, build_cost_filters, execute_query, list_run_databases, run_name
+from gui.multiSelect import PopoverMultiSelect, MultiSelectPlus, SELECTION_CHANGED_EVENT
 from gui.style import setup_application_styles
 from gui.responsiveness import ResponsivenessMixin
 from gui.query_handlers import QueryHandlersMixin
+from gui.watchdog import StallWatchdog, user_action
+from gui.results_tabs import ResultTabs
+from gui.history import HistoryMixin
+from gui.jobs import JobsPanel, set_jobs_panel
+from config import STALL_WATCHDOG_ENABLED, PLOT_RENDER_MODE
+from plotting import render_worker
 from plotting.treeview import plot_treeview
 
 
 
-class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
+class GUI(ResponsivenessMixin, QueryHandlersMixin, HistoryMixin, tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Ingredients Visualizer - Advanced Database Query Interface")
         
-        # Track scheduled after callbacks for cleanup
-        self._after_ids = []
+        # Pending after callbacks (see schedule()) - ids are removed when they run
+        self._after_ids = set()
         self._is_closing = False
         
+        # Incremented per shown query result (background results of older queries are dropped)
+        self._query_generation = 0
+        # Pending debounced live-mode execution (see on_filter_changed)
+        self._live_after_id = None
+        # Set while a history entry restores the widgets (suppresses live-mode executions)
+        self._restoring_history = False
+        
         # Configure window
         self.attributes("-fullscreen", True)
         
@@ -35,30 +48,28 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
             self.geometry(self._default_geometry)
         self.bind("<Escape>", _exit_fullscreen)
 
-        # Handle window state changes to ensure consistent sizing
-        def _handle_window_state_change():
-            """Monitor window state and ensure consistent sizing"""
-            if self._is_closing:
-                return  # Stop if window is closing
+        # Handle window state changes to ensure consistent sizing (Map/Unmap events, no polling)
+        def _handle_window_state_change(event):
+            """Restore the default size when the window comes back from minimized state"""
+            if event.widget is not self or self._is_closing:
+                return  # Map/Unmap of a child widget
             
             try:
                 current_state = self.state()
-                if hasattr(self, '_last_state'):
-                    # If we're coming back from minimized state and not in fullscreen
-                    if (self._last_state == "iconic" and 
-                        current_state == "normal" and 
-                        not self.attributes("-fullscreen")):
-                        self.geometry(self._default_geometry)
+                # If we're coming back from minimized state and not in fullscreen
+                if (self._last_state == "iconic" and 
+                    current_state == "normal" and 
+                    not self.attributes("-fullscreen")):
+                    self.geometry(self._default_geometry)
                 self._last_state = current_state
-                # Schedule next check
-                after_id = self.after(100, _handle_window_state_change)
-                self._after_ids.append(after_id)
             except tk.TclError:
                 # Window is being destroyed
                 pass
         
         # Initialize state tracking
         self._last_state = self.state()
+        self.bind("<Map>", _handle_window_state_change, add="+")
+        self.bind("<Unmap>", _handle_window_state_change, add="+")
         
         # Override iconify to exit fullscreen first
         original_iconify = self.iconify
@@ -73,10 +84,6 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         # Bind window close event
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         
-        # Start monitoring window state
-        after_id = self.after(100, _handle_window_state_change)
-        self._after_ids.append(after_id)
-
         # Configure modern styling
         self.setup_styles()
         
@@ -90,13 +97,29 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         
         # Initialize focus management
         self.setup_focus_management()
+        
+        # Popover selections (and detail filter entries) drive live mode
+        self.bind(SELECTION_CHANGED_EVENT, self.on_filter_changed)
+        
+        # Opt-in: log main thread stalls (stack + active user action), see config.py
+        self.watchdog = StallWatchdog(self) if STALL_WATCHDOG_ENABLED else None
+        if self.watchdog:
+            self.watchdog.start()
+        
+        # Start the plot render process early (first plot does not wait for the imports)
+        if PLOT_RENDER_MODE == "image":
+            render_worker.warm_up()
     
     def on_closing(self):
         """Handle window close event properly"""
         self._is_closing = True
         
+        if self.watchdog:
+            self.watchdog.stop()
+        render_worker.shutdown()
+        
         # Cancel all scheduled after callbacks
-        for after_id in self._after_ids:
+        for after_id in list(self._after_ids):
             try:
                 self.after_cancel(after_id)
             except:
@@ -138,6 +161,7 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         # Configure main grid (left column, right column, execute button)
         self.content_frame.grid_columnconfigure(0, weight=1, uniform="cols")
         self.content_frame.grid_columnconfigure(1, weight=1, uniform="cols")
+        self.content_frame.grid_columnconfigure(2, weight=0)  # History sidebar
         self.content_frame.grid_rowconfigure(0, weight=1)  # Main frames row
         self.content_frame.grid_rowconfigure(1, weight=0)  # Execute button row
         
@@ -172,13 +196,15 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         
 
     def build_main_content(self):
-        """Build the main content area with three organized sections"""
+        """Build the main content area with three organized sections and the history sidebar"""
         # Create the three main sections with cards
         self.create_query_configuration_section()
         self.create_analysis_tools_section()
         self.create_detail_filters_section()
         self.create_results_section()
         self.create_execute_button_section()
+        self.create_history_sidebar()
+        self.create_jobs_panel()
 
     def create_query_configuration_section(self):
         """Create the query configuration section (top-left)"""
@@ -246,6 +272,32 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
             style="Action.TButton"
         )
         self.execute_button.pack(expand=True, ipadx=40, ipady=12)
+        
+        # Exploratory mode: approximate medians for fast browsing of large databases
+        self.exploratory_var = tk.BooleanVar(value=False)
+        self.exploratory_check = ttk.Checkbutton(
+            self.execute_frame,
+            text="Exploratory (approximate medians)",
+            variable=self.exploratory_var
+        )
+        self.exploratory_check.pack(pady=(8, 0))
+        
+        # Live mode: filter changes re-run the query (debounced, only the latest state is shown)
+        self.live_var = tk.BooleanVar(value=False)
+        self.live_check = ttk.Checkbutton(
+            self.execute_frame,
+            text="Live (execute on every filter change)",
+            variable=self.live_var,
+            command=self.on_filter_changed
+        )
+        self.live_check.pack(pady=(4, 0))
+
+    def create_jobs_panel(self):
+        """Create the export jobs panel (bottom of the history sidebar)"""
+        # Exports of all result windows run as background jobs listed here
+        self.jobs_panel = JobsPanel(self.history_frame)
+        self.jobs_panel.pack(fill="x", side="bottom", pady=(10, 0))
+        set_jobs_panel(self.jobs_panel)
 
     def build_footer(self):
         """Build the application footer"""
@@ -392,6 +444,29 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         )
         self.msplus_cost_function.pack(fill="x", pady=(0, 15))
 
+        # Benchmark Runs section (multi-database comparison, pgb_job_*.db)
+        runs_label = ttk.Label(self.first_scrollable_frame, text="🗂️ Benchmark Runs (compare):", font=("Arial", 10, "bold"))
+        runs_label.pack(anchor="w", pady=(5, 2))
+        
+        # Run name -> database path
+        self.run_databases = {run_name(path): path for path in list_run_databases()}
+        self.ms_runs = PopoverMultiSelect(
+            self.first_scrollable_frame,
+            header="Select Runs (default: current DB)",
+            items=list(self.run_databases),
+            width=35
+        )
+        self.ms_runs.pack(fill="x", pady=(0, 5))
+        
+        # One row per configuration with one metric column per run
+        self.compare_runs_var = tk.BooleanVar(value=False)
+        self.compare_runs_check = ttk.Checkbutton(
+            self.first_scrollable_frame,
+            text="Side-by-side comparison",
+            variable=self.compare_runs_var
+        )
+        self.compare_runs_check.pack(anchor="w", pady=(0, 15))
+
     # ----------------- Plotting Section -----------------------------------------------------------------------------
     
     def build_second_frame(self):
@@ -468,11 +543,12 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         self.plot_number_var.trace_add("write", lambda *args: self.validate_plot_number_input())
         self.plot_number_entry = ttk.Entry(number_input_frame, textvariable=self.plot_number_var, width=10)
         self.plot_number_entry.pack(fill="both", expand=True)
+        self.plot_number_hint = ttk.Label(number_input_frame, text="0 = all points (Scatter/Graph)",
+                                          font=("Arial", 8, "italic"), foreground="#7f8c8d")
+        self.plot_number_hint.pack(anchor="w")
         
-        # Bind events to ensure Entry remains responsive
-        self.plot_number_entry.bind("<Button-1>", self.on_entry_click)
-        self.plot_number_entry.bind("<FocusIn>", self.on_entry_focus)
-        self.plot_number_entry.bind("<KeyPress>", lambda e: self.ensure_entry_focus(e))
+        # Responsive click/focus/key handling (bind tag, see ResponsivenessMixin)
+        self.register_entry(self.plot_number_entry)
         
         # Split Box Plot data section (initially hidden)
         self.box_plot_config_label = ttk.Label(self.second_scrollable_frame, text="📦 * Split Box Plot data:", font=("Arial", 10, "bold"))
@@ -480,7 +556,7 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         self.ms_box_plot_config = PopoverMultiSelect(
             self.second_scrollable_frame,
             header="* Select Split Option",
-            items=["Plan Generator", "Cardinality Provider", "Build Plan", "Mat", "Concat", "Join Bundle", "Host Id"],
+            items=["Plan Generator", "Cardinality Provider", "Build Plan", "Mat", "Concat", "Join Bundle", "Host Id", "Run"],
             width=35
         )
         
@@ -675,15 +751,14 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         value_var = tk.StringVar()
         # Add validation callback to restrict to numerical values and convert commas to dots
         value_var.trace_add("write", lambda *args: self.validate_numerical_input(value_var, value_entry))
+        value_var.trace_add("write", lambda *args: self.on_filter_changed())
         value_entry = ttk.Entry(value_frame, textvariable=value_var)
         value_entry.pack(fill="x")
         row_widgets['value_var'] = value_var
         row_widgets['value_entry'] = value_entry
         
-        # Bind events to ensure Entry remains responsive
-        value_entry.bind("<Button-1>", self.on_entry_click)
-        value_entry.bind("<FocusIn>", self.on_entry_focus)
-        value_entry.bind("<KeyPress>", lambda e: self.ensure_entry_focus(e))
+        # Responsive click/focus/key handling (bind tag, see ResponsivenessMixin)
+        self.register_entry(value_entry)
         
         # Store the row frame and widgets
         row_widgets['frame'] = row_frame
@@ -708,6 +783,7 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         
         print(f"Removed filter row. Remaining rows: {len(self.filter_rows)}")
         self.update_status(f"Filter row removed - {len(self.filter_rows)} row(s) remaining")
+        self.on_filter_changed()
         
     def validate_numerical_input(self, string_var, entry_widget):
         """Validate and normalize numerical input: only allow numbers, dots, minus, semicolons, and convert commas to dots"""
@@ -800,15 +876,52 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         )
         description_label.pack(anchor="w", pady=(0, 15))
         
-        # Open in fullscreen button - pack FIRST with side=bottom to reserve space
+        # Button row - pack FIRST with side=bottom to reserve space
+        results_buttons = ttk.Frame(self.results_frame)
+        results_buttons.pack(fill="x", side="bottom")
+        
+        # Open an exported Parquet file as read-only data source
+        self.open_parquet_button = ttk.Button(
+            results_buttons,
+            text="📂 Open Parquet",
+            command=self.open_parquet_source
+        )
+        self.open_parquet_button.pack(side="left", padx=(0, 5))
+        
+        # Re-run the last exploratory query with exact medians
+        self.exact_rerun_button = ttk.Button(
+            results_buttons,
+            text="🎯 Exact Re-run",
+            command=self.rerun_exact,
+            state="disabled"
+        )
+        self.exact_rerun_button.pack(side="left", padx=(0, 5))
+        
+        # Box plot matrix of the current filters as multi-page PDF (export job)
+        self.pdf_report_button = ttk.Button(
+            results_buttons,
+            text="📑 PDF Report",
+            command=self.export_pdf_report
+        )
+        self.pdf_report_button.pack(side="left", padx=(0, 5))
+        
+        # Open in fullscreen button
         self.fullscreen_button = ttk.Button(
-            self.results_frame,
+            results_buttons,
             text="⛶ Open in Fullscreen",
             command=self.open_results_fullscreen
         )
-        self.fullscreen_button.pack(fill="x", side="bottom")
+        self.fullscreen_button.pack(fill="x", side="left", expand=True)
         
-        # Container frame for results (will hold either treeview or plot)
+        # Close the selected results tab (middle click on a tab does the same)
+        self.close_tab_button = ttk.Button(
+            results_buttons,
+            text="✖ Close Tab",
+            command=lambda: self.results_tabs.close_tab()
+        )
+        self.close_tab_button.pack(side="left", padx=(5, 0))
+        
+        # Container frame for results (notebook with one tab per result)
         self.results_container = ttk.Frame(self.results_frame, style="Card.TFrame")
         self.results_container.pack(fill="both", expand=True, pady=(0, 10))
         
@@ -821,6 +934,12 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
         )
         self.empty_results_label.pack(expand=True)
         
+        # Tabs are rebuilt from their cached result after being released (memory budget)
+        self.results_tabs = ResultTabs(self.results_container, self._render_result_view,
+                                       empty_widget=self.empty_results_label,
+                                       result_cache=self.result_cache,
+                                       on_cache_evicted=self.refresh_history_list)
+        
     def on_detail_input_change(self, *args):
         """Normalize and validate number input - replace commas with dots and allow only valid number characters"""
         # Prevent recursive calls
@@ -923,34 +1042,38 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
                     # Update the available items in the metric selector
                     metric_select.set_items(metrics)
 
+    @user_action("Fullscreen results")
     def open_results_fullscreen(self):
-        """Open current results in fullscreen window"""
-        if hasattr(self, 'current_results_data') and self.current_results_data:
-            result_type = self.current_results_data.get('type')
+        """Open the results of the selected tab in a fullscreen window"""
+        results = self.results_tabs.active_view()
+        if results:
+            result_type = results.get('type')
             
             if result_type == 'treeview':
                 # Open treeview in fullscreen
                 from plotting.treeview import plot_treeview
                 plot_treeview(
-                    self.current_results_data['columns'],
-                    self.current_results_data['data'],
-                    self.current_results_data['params_summary']
+                    results['columns'],
+                    results['data'],
+                    results['params_summary'],
+                    query_spec=results.get('query_spec')
                 )
             elif result_type == 'plot':
                 # Open plot in fullscreen
                 from plotting.plotting import create_plot_window
                 create_plot_window(
-                    self.current_results_data['columns'],
-                    self.current_results_data['data'],
-                    self.current_results_data['params_summary'],
-                    self.current_results_data['plot_type'],
-                    self.current_results_data.get('x_axis'),
-                    self.current_results_data.get('y_axis'),
-                    self.current_results_data.get('agg_metric'),
-                    self.current_results_data.get('metric'),
-                    self.current_results_data.get('plot_number', 5),
-                    self.current_results_data.get('config_params'),
-                    self.current_results_data.get('box_plot_split')
+                    results['columns'],
+                    results['data'],
+                    results['params_summary'],
+                    results['plot_type'],
+                    results.get('x_axis'),
+                    results.get('y_axis'),
+                    results.get('agg_metric'),
+                    results.get('metric'),
+                    results.get('plot_number', 5),
+                    results.get('config_params'),
+                    results.get('box_plot_split'),
+                    result_id=results.get('result_id')
                 )
         else:
             self.update_status("No results available. Execute a query first.")
@@ -1055,7 +1178,8 @@ class GUI(ResponsivenessMixin, QueryHandlersMixin, tk.Tk):
             "Mat": "bpi_cf_mat",
             "Concat": "bpi_cf_concat",
             "Join Bundle": "bpi_cf_join_bundle",
-            "Host Id": "wp_cf_host_id"
+            "Host Id": "wp_cf_host_id",
+            "Run": "source_db"
         }
         
         # Return the first selected split option's column name
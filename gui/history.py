@@ -0,0 +1,301 @@
+"""
+GUI History Module
+Query history sidebar: records every execution and replays it from the result cache.
+
+An entry is stored compactly - filter dict, widget selections, timing, row count
+and the result cache key - and persisted to HISTORY_PATH between sessions.
+Clicking an entry restores the widget selections and shows the cached result
+without a DuckDB round trip; results not cached (e.g. after a restart or when
+evicted) are queried again with the restored selections.
+"""
+
+import json
+import os
+import time
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+from config import HISTORY_PATH, HISTORY_MAX_ENTRIES, HISTORY_CACHE_MB
+from db.result_store import ResultCache, result_cache_key
+from gui.results_tabs import estimate_result_bytes, MB
+from gui.watchdog import user_action
+
+
+class QueryHistory:
+    """History entries (newest first), persisted as JSON."""
+
+    def __init__(self, path=HISTORY_PATH, max_entries=HISTORY_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = self._load()
+
+    def add(self, entry):
+        """Add an entry as newest, drop the oldest above max_entries and save."""
+        self.entries.insert(0, entry)
+        del self.entries[self.max_entries:]
+        self.save()
+
+    def clear(self):
+        self.entries = []
+        self.save()
+
+    def save(self):
+        # Write a temporary file first, an interrupted save keeps the old history
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as ex:
+            print(f"Query history not writable: {ex}")
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as ex:
+            print(f"Query history not readable, starting empty: {ex}")
+            return []
+        return entries if isinstance(entries, list) else []
+
+
+class HistoryMixin:
+    """Mixin class providing the query history sidebar and replay"""
+
+    def create_history_sidebar(self):
+        """Create the history sidebar (right of the main sections)"""
+        self.query_history = QueryHistory()
+        self.result_cache = ResultCache(HISTORY_CACHE_MB * MB)
+
+        self.history_frame = ttk.LabelFrame(
+            self.content_frame,
+            text="🕘 History",
+            style="Card.TFrame",
+            padding=10
+        )
+        self.history_frame.grid(row=0, column=2, rowspan=2, sticky="nsew", padx=(10, 0))
+
+        hint_label = ttk.Label(
+            self.history_frame,
+            text="Click to restore (⚡ = cached, no query)",
+            font=("Arial", 9, "italic"),
+            foreground="#7f8c8d"
+        )
+        hint_label.pack(anchor="w", pady=(0, 5))
+
+        clear_button = ttk.Button(self.history_frame, text="🗑 Clear History", command=self.clear_history)
+        clear_button.pack(fill="x", side="bottom", pady=(5, 0))
+
+        list_frame = ttk.Frame(self.history_frame)
+        list_frame.pack(fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
+        self.history_listbox = tk.Listbox(
+            list_frame,
+            width=34,
+            activestyle="none",
+            exportselection=False,
+            yscrollcommand=scrollbar.set
+        )
+        scrollbar.config(command=self.history_listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.history_listbox.pack(side="left", fill="both", expand=True)
+        self.history_listbox.bind("<<ListboxSelect>>", self.on_history_select)
+
+        self.refresh_history_list()
+
+    # ----------------- Recording -----------------
+
+    def new_history_entry(self, query_id, analysis_type, approx_median, filters, params_summary,
+                          run_paths=None, mode="query", compare_metric=None, selections=None):
+        """
+        Start a history entry for an execution (selections are captured now).
+
+        Args:
+            query_id (int): 2=Aggregated, 3=Single Query
+            analysis_type (str): "Loss Factor", "Q-Error" or "P-Error"
+            approx_median (bool): Exploratory mode
+            filters (dict): Filter values for the SQL placeholders
+            params_summary (str): Parameter summary for display and export
+            run_paths (list): Queried run databases (None = current database)
+            mode (str): "query" or "comparison" (side-by-side runs)
+            compare_metric (str): Compared metric of a run comparison
+            selections (dict): Widget selections of the execution (None = capture them now)
+
+        Returns:
+            dict: Entry, completed and stored by record_history()
+        """
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "mode": mode,
+            "query_id": query_id,
+            "analysis_type": analysis_type,
+            "approx_median": bool(approx_median),
+            "filters": filters,
+            "runs": [str(path) for path in run_paths or []],
+            "params_summary": params_summary,
+            "selections": selections or self._capture_selections(),
+            "cache_key": result_cache_key(mode, query_id, filters,
+                                          [str(path) for path in run_paths or []], compare_metric),
+            "started": time.perf_counter(),
+        }
+
+    def record_history(self, entry, columns, result, result_id=None):
+        """
+        Store an executed entry (rows, duration) and cache its result.
+
+        Args:
+            entry (dict): Entry from new_history_entry()
+            columns (list): Result column names
+            result: ResultSet or row list
+            result_id: Plot model cache id of the result (reused on replay)
+        """
+        entry = dict(entry)
+        entry["seconds"] = round(time.perf_counter() - entry.pop("started"), 3)
+        entry["rows"] = len(result)
+        self.result_cache.put(entry["cache_key"], (columns, result, result_id),
+                              estimate_result_bytes(columns, result))
+        self.query_history.add(entry)
+        self.refresh_history_list()
+
+    def refresh_history_list(self):
+        """Show the history entries (newest first)"""
+        self.history_listbox.delete(0, "end")
+        for entry in self.query_history.entries:
+            self.history_listbox.insert("end", self._history_label(entry))
+
+    def _history_label(self, entry):
+        cached = "⚡" if entry.get("cache_key") in self.result_cache else "  "
+        mode = "Query" if entry.get("query_id") == 3 else "Agg"
+        if entry.get("mode") == "comparison":
+            mode = "Compare"
+        clock = entry.get("time", "")[11:16]
+        return (f"{cached} {clock} {entry.get('analysis_type', '?')} {mode} · "
+                f"{entry.get('rows', 0):,} rows · {entry.get('seconds', 0):.2f}s")
+
+    def clear_history(self):
+        self.query_history.clear()
+        self.result_cache.clear()
+        self.refresh_history_list()
+        self.update_status("Query history cleared")
+
+    # ----------------- Replay -----------------
+
+    def on_history_select(self, event=None):
+        selection = self.history_listbox.curselection()
+        if selection:
+            self.replay_history_entry(self.query_history.entries[selection[0]])
+
+    @user_action("Replay history")
+    def replay_history_entry(self, entry):
+        """
+        Restore the selections of an entry and show its result (from cache if possible).
+
+        Args:
+            entry (dict): History entry
+        """
+        self._restore_selections(entry["selections"])
+
+        cached = self.result_cache.get(entry["cache_key"])
+        if cached is None:
+            # Evicted or from an earlier session: query again with the restored selections
+            self.update_status("History entry not cached - re-running the query…")
+            self.choose_correct_query()
+            return
+
+        columns, result, result_id = cached
+        query_id, analysis_type = entry["query_id"], entry["analysis_type"]
+        # Results of still running queries must not replace the replayed one
+        self._query_generation += 1
+        self.last_exploratory_query = None
+        if entry["approx_median"]:
+            # Exact re-run of the replayed query (its summary without the mode suffixes)
+            self.last_exploratory_query = {
+                "query_id": query_id,
+                "analysis_type": analysis_type,
+                "filters": entry["filters"],
+                "params_summary": entry["params_summary"].split(" | ≈ ")[0].split(" | Side-by-side: ")[0],
+                "run_paths": entry["runs"],
+                "compare": entry["mode"] == "comparison",
+                "selections": entry["selections"],
+            }
+        self.exact_rerun_button.config(state="normal" if entry["approx_median"] else "disabled")
+
+        if entry["mode"] == "comparison":
+            self.display_treeview_in_frame(columns, result, entry["params_summary"])
+        else:
+            query_spec = None if entry["runs"] else {"file_nr": query_id, "filters": entry["filters"]}
+            if not self.display_results(columns, result, entry["params_summary"], query_id, analysis_type,
+                                        self._config_params(), result_id=result_id, query_spec=query_spec):
+                return
+        self.update_status(f"⚡ {analysis_type} result from history ({entry['time']}) - "
+                           f"{len(result)} results, no database query")
+        self.after(100, self.restore_entry_focus)
+
+    # ----------------- Widget selections -----------------
+
+    def _capture_selections(self):
+        """Widget state needed to repeat an execution (JSON-serializable)"""
+        return {
+            "pg": self.ms_plan_generator.get_selected(),
+            "cp": self.ms_cardinality_provider.get_selected(),
+            "bpc": self.ms_build_plan_class.get_selected(),
+            "cf": self.msplus_cost_function.get_selected(),
+            "runs": self.ms_runs.get_selected(),
+            "compare_runs": self.compare_runs_var.get(),
+            "analysis": self.ms_analysis_parameter.get_selected(),
+            "qg": self.ms_query_selection.get_selected(),
+            "detail_filters": [
+                {
+                    "metric": row["metric_select"].get_selected(),
+                    "comparison": row["comparison_select"].get_selected(),
+                    "value": row["value_var"].get(),
+                }
+                for row in self.filter_rows
+            ],
+            "plot_type": self.ms_plot_type.get_selected(),
+            "agg_metric": self.ms_agg_metric.get_selected(),
+            "metric": self.ms_metric.get_selected(),
+            "plot_number": self.plot_number_var.get(),
+            "box_plot_split": self.ms_box_plot_config.get_selected(),
+            "exploratory": self.exploratory_var.get(),
+        }
+
+    def _restore_selections(self, selections):
+        """Set the widgets to captured selections (no live-mode execution while restoring)"""
+        self._restoring_history = True
+        try:
+            self.ms_plan_generator.set_selected(selections.get("pg", []))
+            self.ms_cardinality_provider.set_selected(selections.get("cp", []))
+            self.ms_build_plan_class.set_selected(selections.get("bpc", []))
+            self.msplus_cost_function.set_selected(selections.get("cf", {}))
+            self.ms_runs.set_selected(selections.get("runs", []))
+            self.compare_runs_var.set(selections.get("compare_runs", False))
+            self.exploratory_var.set(selections.get("exploratory", False))
+
+            # Dependent controls first - they reset the aggregation and filter row items
+            self.ms_analysis_parameter.set_selected(selections.get("analysis", []))
+            self.update_aggregation_items()
+            self.ms_query_selection.set_selected(selections.get("qg", []))
+            self.ms_plot_type.set_selected(selections.get("plot_type", []))
+            self.update_aggregation_availability()
+            self.ms_agg_metric.set_selected(selections.get("agg_metric", []))
+            self.ms_metric.set_selected(selections.get("metric", []))
+            self.ms_box_plot_config.set_selected(selections.get("box_plot_split", []))
+            self.plot_number_var.set(selections.get("plot_number", "5"))
+            self.update_plot_type_dependent_controls()
+
+            detail_filters = selections.get("detail_filters") or [{}]
+            # New rows get the metrics of the restored query mode
+            while len(self.filter_rows) < len(detail_filters):
+                self.add_filter_row()
+            while len(self.filter_rows) > len(detail_filters):
+                self.filter_rows.pop()["frame"].destroy()
+            for row, values in zip(self.filter_rows, detail_filters):
+                row["metric_select"].set_selected(values.get("metric", []))
+                row["comparison_select"].set_selected(values.get("comparison", []))
+                row["value_var"].set(values.get("value", ""))
+        finally:
+            self._restoring_history = False
@@ -0,0 +1,283 @@
+"""
+GUI Jobs Module
+Background export jobs with a small jobs panel instead of blocking dialogs.
+
+An export runs as ExportJob in a worker thread (DuckDB COPY, Excel streaming) or
+waits there for the render process (plot PDF/PNG). The JobsPanel lists the jobs
+with progress, size written and a cancel button; it polls the running jobs with
+after() only while there are any. A finished job shows a short notice in the
+corner of the window instead of a modal messagebox.
+"""
+
+import os
+import threading
+import time
+import tkinter as tk
+from concurrent.futures import CancelledError, wait
+from tkinter import ttk
+
+from config import JOBS_POLL_MS, JOB_NOTICE_MS, JOBS_MAX_FINISHED
+
+
+# Panel the jobs are shown in (registered by the main window, see set_jobs_panel)
+_panel = None
+
+
+def format_size(nbytes):
+    """Human readable file size."""
+    if nbytes is None:
+        return "–"
+    for unit in ("B", "KB", "MB"):
+        if nbytes < 1024:
+            return f"{nbytes:.0f} {unit}" if unit == "B" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} GB"
+
+
+class ExportJob:
+    """One background export: progress, state and cancellation (thread-safe attributes)."""
+
+    def __init__(self, title, filepath, total=None):
+        """
+        Args:
+            title (str): Job name in the panel (e.g. "CSV export")
+            filepath (str): Target file
+            total (int): Number of rows for a determinate progress (None = unknown)
+        """
+        self.title = title
+        self.filepath = str(filepath)
+        self.total = total
+        self.progress = 0
+        self.detail = ""
+        # "running", "done", "failed" or "cancelled" - set by the worker thread
+        self.state = "running"
+        self.error = None
+        self.started = time.time()
+        self.finished = None
+
+        self._cancel = threading.Event()
+        self._connection = None
+        self._future = None
+        # Cancelled while its render was already running: ends when the render does
+        self.render_running = False
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def attach_connection(self, conn):
+        """DuckDB connection of the job (interrupted by cancel)."""
+        self._connection = conn
+        if self.cancelled:
+            conn.interrupt()
+
+    def attach_future(self, future):
+        """Future of a render process job (cancelled if it has not started yet)."""
+        self._future = future
+        return future
+
+    def cancel(self):
+        self._cancel.set()
+        if self._connection is not None:
+            try:
+                self._connection.interrupt()
+            except Exception:
+                pass
+        if self._future is not None and not self._future.cancel():
+            # A started render cannot be stopped - its file is removed once it finishes
+            self.render_running = not self._future.done()
+
+    def bytes_written(self):
+        """Size of the target file (or its .part file) written by this job so far."""
+        for path in (self.filepath, self.filepath + ".part"):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_mtime >= self.started - 1:
+                return stat.st_size
+        return None
+
+    def run(self, work):
+        """Worker thread: run work(job), then record the final state."""
+        try:
+            work(self)
+            self.state = "cancelled" if self.cancelled else "done"
+        except (Exception, CancelledError) as ex:
+            # CancelledError: render process job cancelled before it started
+            self.error = ex
+            self.state = "cancelled" if self.cancelled else "failed"
+        if self._future is not None:
+            # The final state is only reported when the render process is done with the file
+            wait([self._future])
+        if self.state != "done":
+            self._remove_partial_files()
+        self.finished = time.time()
+
+    def _remove_partial_files(self):
+        for path in (self.filepath, self.filepath + ".part"):
+            try:
+                if os.stat(path).st_mtime >= self.started - 1:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def set_jobs_panel(panel):
+    """Register the panel new jobs are shown in."""
+    global _panel
+    _panel = panel
+
+
+def start_export_job(title, filepath, work, total=None):
+    """
+    Run an export in a background thread and show it in the jobs panel.
+
+    Args:
+        title (str): Job name (e.g. "Excel export")
+        filepath (str): Target file
+        work (callable): work(job) writes the file; may update job.progress / job.detail,
+                         should stop when job.cancelled is set (no Tk access)
+        total (int): Number of rows for a determinate progress (optional)
+
+    Returns:
+        ExportJob
+    """
+    global _panel
+    if _panel is None or not _panel.winfo_exists():
+        # No main window (e.g. a standalone result window): floating panel
+        top = tk.Toplevel()
+        top.title("Export Jobs")
+        _panel = JobsPanel(top)
+        _panel.pack(fill="both", expand=True, padx=10, pady=10)
+
+    job = ExportJob(title, filepath, total)
+    threading.Thread(target=job.run, args=(work,), name=f"Export {title}", daemon=True).start()
+    _panel.add_job(job)
+    return job
+
+
+class JobsPanel(ttk.LabelFrame):
+    """List of export jobs with progress, size and cancel button."""
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, text="📤 Export Jobs", padding=5, **kwargs)
+        self._rows = []  # (job, widgets dict), oldest first
+        self._after_id = None
+        self._empty_label = ttk.Label(self, text="No exports", font=("Arial", 9, "italic"),
+                                      foreground="#7f8c8d")
+        self._empty_label.pack(anchor="w")
+
+    def add_job(self, job):
+        self._empty_label.pack_forget()
+        row = ttk.Frame(self)
+        row.pack(fill="x", pady=2)
+
+        header = ttk.Frame(row)
+        header.pack(fill="x")
+        name = ttk.Label(header, text=f"{job.title}: {os.path.basename(job.filepath)}", font=("Arial", 9))
+        name.pack(side="left", fill="x", expand=True)
+        cancel = ttk.Button(header, text="✖", width=3, command=job.cancel)
+        cancel.pack(side="right")
+
+        progress = ttk.Progressbar(row, mode="determinate" if job.total else "indeterminate",
+                                   maximum=job.total or 100)
+        progress.pack(fill="x")
+        if not job.total:
+            progress.start(10)
+        info = ttk.Label(row, text="Starting…", font=("Arial", 8), foreground="#7f8c8d")
+        info.pack(anchor="w")
+
+        self._rows.append((job, {"frame": row, "progress": progress, "info": info, "cancel": cancel}))
+        self._drop_finished_rows()
+        if self._after_id is None:
+            self._after_id = self.after(JOBS_POLL_MS, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        running = False
+        for job, widgets in self._rows:
+            if widgets.get("shown_state"):
+                continue
+            if job.state == "running":
+                running = True
+                self._show_progress(job, widgets)
+            else:
+                self._show_finished(job, widgets)
+        if running:
+            self._after_id = self.after(JOBS_POLL_MS, self._poll)
+
+    def _show_progress(self, job, widgets):
+        size = format_size(job.bytes_written())
+        if job.render_running:
+            text = f"Cancelling - waiting for the running render… {size}"
+        elif job.cancelled:
+            text = "Cancelling…"
+        elif job.total:
+            widgets["progress"]["value"] = job.progress
+            text = f"{job.progress:,} / {job.total:,} rows · {size}"
+            if job.detail:
+                text += f" · {job.detail}"
+        else:
+            text = f"{job.detail or 'Writing'}… {size}"
+        widgets["info"].config(text=text)
+
+    def _show_finished(self, job, widgets):
+        widgets["shown_state"] = job.state
+        progress = widgets["progress"]
+        progress.stop()
+        progress.configure(mode="determinate", maximum=1)
+        progress["value"] = 1 if job.state == "done" else 0
+        widgets["cancel"].config(state="disabled")
+
+        seconds = (job.finished or time.time()) - job.started
+        name = os.path.basename(job.filepath)
+        if job.state == "done":
+            text = f"✔ {format_size(job.bytes_written())} in {seconds:.1f}s"
+            notice = f"✔ {job.title} finished: {name}"
+        elif job.state == "cancelled":
+            text = "Cancelled - render finished, file removed" if job.render_running else "Cancelled - no file written"
+            notice = f"{job.title} cancelled: {name}"
+        else:
+            text = f"⚠ Failed: {job.error}"
+            notice = f"⚠ {job.title} failed: {job.error}"
+        widgets["info"].config(text=text)
+        show_notice(self, notice, error=job.state == "failed")
+
+    def _drop_finished_rows(self):
+        """Keep the newest JOBS_MAX_FINISHED finished jobs."""
+        finished = [entry for entry in self._rows if entry[1].get("shown_state")]
+        for entry in finished[:max(0, len(finished) - JOBS_MAX_FINISHED)]:
+            entry[1]["frame"].destroy()
+            self._rows.remove(entry)
+
+
+def show_notice(widget, message, error=False, duration_ms=JOB_NOTICE_MS):
+    """
+    Non-modal notice in the bottom right corner of widget's window (click to close).
+
+    Args:
+        widget: Any widget of the window
+        message (str): Notice text
+        error (bool): Show as error (red)
+        duration_ms (int): Time until the notice disappears
+    """
+    window = widget.winfo_toplevel()
+    notice = tk.Toplevel(window)
+    notice.overrideredirect(True)
+    notice.attributes("-topmost", True)
+    label = tk.Label(notice, text=message, padx=12, pady=8, wraplength=360, justify="left",
+                     bg="#c0392b" if error else "#2c3e50", fg="white", font=("Arial", 10))
+    label.pack()
+
+    notice.update_idletasks()
+    x = window.winfo_rootx() + window.winfo_width() - notice.winfo_reqwidth() - 20
+    y = window.winfo_rooty() + window.winfo_height() - notice.winfo_reqheight() - 20
+    notice.geometry(f"+{max(x, 0)}+{max(y, 0)}")
+
+    def close(event=None):
+        if notice.winfo_exists():
+            notice.destroy()
+
+    label.bind("<Button-1>", close)
+    window.after(duration_ms, close)
@@ -1,6 +1,71 @@
 import tkinter as tk
 from tkinter import ttk
 
+from gui.responsiveness import POPOVER_CLOSED_EVENT
+from gui.watchdog import user_action
+
+
+# Delay between the last keystroke and the search (ms)
+SEARCH_DEBOUNCE_MS = 120
+
+# Virtual event generated when OK / "No selection" changed the applied selection
+SELECTION_CHANGED_EVENT = "<<SelectionChanged>>"
+
+
+def normalize_search(text):
+    """Search key: case-insensitive and space-insensitive."""
+    return text.replace(" ", "").lower()
+
+
+class SearchIndex:
+    """
+    Substring search over an item list (keys normalized with normalize_search).
+
+    Keys and a trigram -> item index map are built once per item list. A query of
+    three or more characters only checks the items that contain all its trigrams;
+    shorter queries, and trigrams shared by most items, fall back to scanning the keys.
+    """
+    def __init__(self, items):
+        self._items = items
+        self._keys = [normalize_search(x) for x in items]
+        self._trigrams = {}
+        for idx, key in enumerate(self._keys):
+            for pos in range(len(key) - 2):
+                postings = self._trigrams.get(key[pos:pos + 3])
+                if postings is None:
+                    self._trigrams[key[pos:pos + 3]] = {idx}
+                else:
+                    postings.add(idx)
+
+    def search(self, text):
+        """
+        Items containing text (normalized), in item order.
+
+        Returns:
+            list: Matching items (the item list itself for an empty query)
+        """
+        query = normalize_search(text)
+        if not query:
+            return self._items
+
+        candidates = None
+        if len(query) >= 3:
+            postings = []
+            for pos in range(len(query) - 2):
+                trigram_items = self._trigrams.get(query[pos:pos + 3])
+                if trigram_items is None:
+                    return []
+                postings.append(trigram_items)
+            postings.sort(key=len)
+            # Rare trigram: intersect; common ones cost more than a scan of all keys
+            if len(postings[0]) * 4 < len(self._keys):
+                candidates = sorted(postings[0].intersection(*postings[1:]))
+
+        keys = self._keys
+        if candidates is None:
+            return [item for item, key in zip(self._items, keys) if query in key]
+        return [self._items[i] for i in candidates if query in keys[i]]
+
 
 class PopoverMultiSelect(ttk.Frame):
     """
@@ -10,6 +75,9 @@ class PopoverMultiSelect(ttk.Frame):
     - Robust "click outside" handling (works even with overrideredirect + grab_set)
     - Safe unbinding of the global click handler (unbind by funcid)
     - FocusOut is kept as an extra fallback, but no longer the only close mechanism
+    - Popover widgets are built once and shown/hidden (withdraw/deiconify)
+    - Virtual Listbox: only the visible rows are inserted, so opening and scrolling
+      cost the same for 10 and 10,000 items; the selection is a Python set
     """
     def __init__(self, master, items, header="Select…", all_label="All",
                  no_label="No selection", width=28, height=8, **kwargs):
@@ -17,6 +85,9 @@ class PopoverMultiSelect(ttk.Frame):
         self._all_label = all_label
         self._no_label  = no_label
         self._items = [str(x) for x in items]
+        # Search index, built once per item list
+        self._search_index = SearchIndex(self._items)
+        self._search_after_id = None
         self._selection = set()
         self._height = height
         self._header = header
@@ -28,9 +99,15 @@ class PopoverMultiSelect(ttk.Frame):
 
         self._update_button_text()
 
-        # Popover objects (lazy)
+        # Popover objects (created on first open, then reused)
         self._top = None
         self._listbox = None
+        self._popover_open = False
+
+        # Virtual list state: filtered items, first visible row, selection while open
+        self._filtered_items = self._items
+        self._offset = 0
+        self._pending = set()
 
         # For click-outside binding
         self._root_click_bind_id = None
@@ -54,8 +131,14 @@ class PopoverMultiSelect(ttk.Frame):
 
     def set_items(self, items):
         self._items = [str(x) for x in items]
+        self._search_index = SearchIndex(self._items)
         self._selection.clear()
+        self._pending.clear()
+        self._filtered_items = self._items
+        self._offset = 0
         self._update_button_text()
+        if self._is_open():
+            self._apply_search()
 
     # ----------------- Intern -----------------
 
@@ -69,9 +152,12 @@ class PopoverMultiSelect(ttk.Frame):
             self._var.set(f"{n} selected")
 
     def _no_selection_and_close(self):
+        changed = bool(self._selection)
         self._selection.clear()
         self._update_button_text()
         self._close()
+        if changed:
+            self.event_generate(SELECTION_CHANGED_EVENT)
 
     def _bind_click_outside(self):
         """Bind a click handler on the root to detect clicks outside the popover."""
@@ -91,7 +177,7 @@ class PopoverMultiSelect(ttk.Frame):
 
     def _on_root_click(self, event):
         """If click is outside the popover window, apply + close."""
-        if not (self._top and tk.Toplevel.winfo_exists(self._top)):
+        if not self._is_open():
             return
 
         # Coordinates of click
@@ -106,20 +192,17 @@ class PopoverMultiSelect(ttk.Frame):
         if not (x0 <= x <= x1 and y0 <= y <= y1):
             self._apply_and_close()
 
-    def open_popover(self):
-        if self._top and tk.Toplevel.winfo_exists(self._top):
-            return  # already open
+    def _is_open(self):
+        """True while the popover is shown."""
+        return self._popover_open and self._top is not None and tk.Toplevel.winfo_exists(self._top)
 
+    def _build_popover(self):
+        """Create the popover widgets once; open/close only show and hide them."""
         self._top = tk.Toplevel(self)
         self._top.withdraw()
         self._top.overrideredirect(True)
         self._top.transient(self.winfo_toplevel())
 
-        # Position
-        bx = self.button.winfo_rootx()
-        by = self.button.winfo_rooty() + self.button.winfo_height()
-        self._top.geometry(f"+{bx}+{by}")
-
         frame = ttk.Frame(self._top, padding=6, borderwidth=1, relief="solid")
         frame.grid(row=0, column=0, sticky="nsew")
         self._top.grid_columnconfigure(0, weight=1)
@@ -141,19 +224,18 @@ class PopoverMultiSelect(ttk.Frame):
         self._search_entry.bind("<Button-1>", self._on_search_entry_click)
         self._search_entry.bind("<FocusIn>", self._on_search_entry_focus)
         self._search_entry.bind("<KeyPress>", self._ensure_search_focus)
-        
-        # Store filtered items list
-        self._filtered_items = self._items.copy()
 
+        # Virtual list: the Listbox only holds the visible rows of _filtered_items,
+        # the scrollbar is driven by _offset instead of the Listbox content.
+        # "multiple": a click toggles one item, the same as adding/removing it in _pending
         self._listbox = tk.Listbox(
-            frame, selectmode="extended",
+            frame, selectmode="multiple",
             height=self._height, exportselection=False
         )
-        scroll = ttk.Scrollbar(frame, orient="vertical", command=self._listbox.yview)
-        self._listbox.config(yscrollcommand=scroll.set)
+        self._scroll = ttk.Scrollbar(frame, orient="vertical", command=self._on_scrollbar)
 
         self._listbox.grid(row=1, column=0, sticky="nsew")
-        scroll.grid(row=1, column=1, sticky="ns")
+        self._scroll.grid(row=1, column=1, sticky="ns")
         frame.grid_columnconfigure(0, weight=1)
         frame.grid_rowconfigure(1, weight=1)
 
@@ -165,22 +247,43 @@ class PopoverMultiSelect(ttk.Frame):
         ttk.Button(btns, text=self._no_label,
                    command=self._no_selection_and_close).pack(side="right", padx=(0, 6))
 
-        # Populate listbox with all items initially
-        for it in self._filtered_items:
-            self._listbox.insert("end", it)
-
-        # mark current selection
-        if self._selection:
-            for idx, it in enumerate(self._filtered_items):
-                if it in self._selection:
-                    self._listbox.selection_set(idx)
-
         self._listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self._listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self._listbox.bind("<Button-4>", self._on_mousewheel)
+        self._listbox.bind("<Button-5>", self._on_mousewheel)
+        self._listbox.bind("<Up>", lambda e: self._on_key_scroll(-1))
+        self._listbox.bind("<Down>", lambda e: self._on_key_scroll(1))
+        self._listbox.bind("<Prior>", lambda e: self._scroll_by(-self._height))
+        self._listbox.bind("<Next>", lambda e: self._scroll_by(self._height))
         self._top.bind("<Escape>", lambda e: self._close())
 
         # Modified FocusOut handler - don't close if focus is on search entry or listbox
         self._top.bind("<FocusOut>", self._on_focus_out)
 
+    @user_action("Open dropdown")
+    def open_popover(self):
+        if self._is_open():
+            return  # already open
+
+        if self._top is None or not tk.Toplevel.winfo_exists(self._top):
+            self._build_popover()
+
+        # Position
+        bx = self.button.winfo_rootx()
+        by = self.button.winfo_rooty() + self.button.winfo_height()
+        self._top.geometry(f"+{bx}+{by}")
+
+        # Edit a copy of the selection - Cancel keeps the old one
+        self._pending = set(self._selection)
+        self._popover_open = True
+
+        # Start with an empty search showing all items
+        self._search_var.set("")
+        self._cancel_search()
+        self._filtered_items = self._items
+        self._offset = 0
+        self._render()
+
         # Grab + click-outside
         try:
             self._top.grab_set()
@@ -196,9 +299,57 @@ class PopoverMultiSelect(ttk.Frame):
         # Set focus to search entry for immediate typing
         self._search_entry.focus_set()
 
+    # ----------------- Virtual list -----------------
+
+    def _render(self):
+        """Push the visible slice of _filtered_items into the Listbox."""
+        total = len(self._filtered_items)
+        self._offset = max(0, min(self._offset, total - self._height))
+        visible = self._filtered_items[self._offset:self._offset + self._height]
+
+        self._listbox.delete(0, "end")
+        if visible:
+            self._listbox.insert("end", *visible)
+        for idx, item in enumerate(visible):
+            if item in self._pending:
+                self._listbox.selection_set(idx)
+
+        if total > self._height:
+            self._scroll.set(self._offset / total, (self._offset + len(visible)) / total)
+        else:
+            self._scroll.set(0.0, 1.0)
+
+    def _scroll_by(self, rows):
+        self._offset += rows
+        self._render()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Scrollbar command ("moveto" fraction / "scroll" n units|pages)."""
+        if action == "moveto":
+            self._offset = int(round(float(amount) * len(self._filtered_items)))
+        elif action == "scroll":
+            step = self._height if unit == "pages" else 1
+            self._offset += int(amount) * step
+        self._render()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            return self._scroll_by(-3)
+        return self._scroll_by(3)
+
+    def _on_key_scroll(self, rows):
+        """Arrow keys: move the window when the cursor is at the first/last visible row."""
+        active = self._listbox.index("active")
+        if (rows < 0 and active == 0) or (rows > 0 and active >= self._height - 1):
+            self._scroll_by(rows)
+            self._listbox.activate(active)
+            return "break"
+        return None
+
     def _on_focus_out(self, event):
         """Handle FocusOut event - only close if focus truly left the popover window"""
-        if not (self._top and tk.Toplevel.winfo_exists(self._top)):
+        if not self._is_open():
             return
         
         # Get the widget that now has focus
@@ -217,7 +368,14 @@ class PopoverMultiSelect(ttk.Frame):
         self._apply_and_close()
 
     def _on_listbox_select(self, _evt=None):
-        return
+        """Copy the selection state of the visible rows into _pending."""
+        selected = set(self._listbox.curselection())
+        visible = self._filtered_items[self._offset:self._offset + self._height]
+        for idx, item in enumerate(visible):
+            if idx in selected:
+                self._pending.add(item)
+            else:
+                self._pending.discard(item)
 
     def _on_search_entry_click(self, event):
         """Handle click events for search Entry to ensure it remains responsive"""
@@ -279,56 +437,44 @@ class PopoverMultiSelect(ttk.Frame):
             pass
 
     def _on_search_changed(self, *args):
-        """Filter listbox items based on search input (case-insensitive and space-insensitive)"""
-        if not (self._listbox and tk.Listbox.winfo_exists(self._listbox)):
+        """Keystroke in the search field: search once typing pauses (debounced)"""
+        self._cancel_search()
+        if self._is_open():
+            self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._apply_search)
+
+    def _cancel_search(self):
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+
+    @user_action("Dropdown search")
+    def _apply_search(self):
+        """Filter items based on search input (case-insensitive and space-insensitive)"""
+        self._search_after_id = None
+        if not self._is_open():
             return
         
-        search_text = self._search_var.get()
-        
-        # Normalize search text: remove spaces and convert to lowercase
-        normalized_search = search_text.replace(" ", "").lower()
-        
-        # Get currently selected items from the listbox before clearing
-        current_selection = set()
-        sel_idx = self._listbox.curselection()
-        if sel_idx:
-            current_selection = {self._listbox.get(i) for i in sel_idx}
-        
-        # Clear listbox
-        self._listbox.delete(0, "end")
-        
-        # Filter items: normalize each item and check if search text is contained
-        self._filtered_items = []
-        for item in self._items:
-            normalized_item = item.replace(" ", "").lower()
-            if normalized_search in normalized_item:
-                self._filtered_items.append(item)
-        
-        # Repopulate listbox with filtered items
-        for item in self._filtered_items:
-            self._listbox.insert("end", item)
-        
-        # Restore selection for items that are still visible
-        for idx, item in enumerate(self._filtered_items):
-            if item in current_selection:
-                self._listbox.selection_set(idx)
+        # Selection lives in _pending, filtering only changes what is shown
+        self._filtered_items = self._search_index.search(self._search_var.get())
+        self._offset = 0
+        self._render()
 
+    @user_action("Apply dropdown selection")
     def _apply_and_close(self):
-        if not (self._top and tk.Toplevel.winfo_exists(self._top)):
+        if not self._is_open():
             return
 
-        sel_idx = self._listbox.curselection()
-        if not sel_idx:
-            self._selection.clear()
-        else:
-            self._selection = {self._listbox.get(i) for i in sel_idx}
-
+        changed = self._pending != self._selection
+        self._selection = set(self._pending)
         self._update_button_text()
         self._close()
+        if changed:
+            self.event_generate(SELECTION_CHANGED_EVENT)
 
     def _close(self):
         # unbind click-outside handler first
         self._unbind_click_outside()
+        self._cancel_search()
 
         # release grab
         try:
@@ -337,11 +483,14 @@ class PopoverMultiSelect(ttk.Frame):
         except Exception:
             pass
 
+        # Hide only - the widgets are reused by the next open_popover()
         if self._top and tk.Toplevel.winfo_exists(self._top):
-            self._top.destroy()
+            self._top.withdraw()
 
-        self._top = None
-        self._listbox = None
+        was_open = self._popover_open
+        self._popover_open = False
+        if was_open:
+            self.event_generate(POPOVER_CLOSED_EVENT)
 
 
 class MultiSelectPlus(PopoverMultiSelect):
@@ -350,6 +499,8 @@ class MultiSelectPlus(PopoverMultiSelect):
 
     Fixes in this version:
     - Same click-outside robustness as PopoverMultiSelect
+    - Popover and group widgets are built once (rebuilt only by set_items), so each
+      group keeps its virtual list and search index
     """
     def __init__(self, master, items, header="Select…", all_label="All",
                  no_label="No selection", width=28, height=8, **kwargs):
@@ -396,6 +547,7 @@ class MultiSelectPlus(PopoverMultiSelect):
                 "items": elems,
                 "selection": set()
             })
+        self._discard_popover()
         self._update_button_text()
 
     def get_selected(self):
@@ -437,6 +589,7 @@ class MultiSelectPlus(PopoverMultiSelect):
             self._var.set(f"{total_selected} selected")
 
     def _clear_all_and_close(self):
+        changed = any(spec["selection"] for spec in self._child_specs)
         for spec in self._child_specs:
             spec["selection"].clear()
 
@@ -446,20 +599,16 @@ class MultiSelectPlus(PopoverMultiSelect):
 
         self._update_button_text()
         self._close()
+        if changed:
+            self.event_generate(SELECTION_CHANGED_EVENT)
 
-    def open_popover(self):
-        if self._top and tk.Toplevel.winfo_exists(self._top):
-            return
-
+    def _build_popover(self):
+        """Create the composite popover and one child widget per group (reused until set_items)."""
         self._top = tk.Toplevel(self)
         self._top.withdraw()
         self._top.overrideredirect(True)
         self._top.transient(self.winfo_toplevel())
 
-        bx = self.button.winfo_rootx()
-        by = self.button.winfo_rooty() + self.button.winfo_height()
-        self._top.geometry(f"+{bx}+{by}")
-
         frame = ttk.Frame(self._top, padding=6, borderwidth=1, relief="solid")
         frame.grid(row=0, column=0, sticky="nsew")
         self._top.grid_columnconfigure(0, weight=1)
@@ -470,6 +619,7 @@ class MultiSelectPlus(PopoverMultiSelect):
         frame.grid_rowconfigure(0, weight=1)
         frame.grid_columnconfigure(0, weight=1)
 
+        # Children keep their popover and search index between opens
         self._child_widgets = []
         for spec in self._child_specs:
             child = PopoverMultiSelect(
@@ -482,7 +632,6 @@ class MultiSelectPlus(PopoverMultiSelect):
                 height=self._height
             )
             child.pack(fill="x", pady=2)
-            child.set_selected(sorted(spec["selection"]))
             self._child_widgets.append(child)
 
         btns = ttk.Frame(frame)
@@ -496,6 +645,32 @@ class MultiSelectPlus(PopoverMultiSelect):
         self._top.bind("<Escape>", lambda e: self._close())
         self._top.bind("<FocusOut>", lambda e: self._apply_and_close())
 
+    def _discard_popover(self):
+        """Destroy the built popover (the groups changed), the next open rebuilds it."""
+        if self._is_open():
+            self._close()
+        if self._top and tk.Toplevel.winfo_exists(self._top):
+            self._top.destroy()
+        self._top = None
+        self._child_widgets = None
+
+    @user_action("Open dropdown")
+    def open_popover(self):
+        if self._is_open():
+            return
+
+        if self._top is None or not tk.Toplevel.winfo_exists(self._top):
+            self._build_popover()
+
+        bx = self.button.winfo_rootx()
+        by = self.button.winfo_rooty() + self.button.winfo_height()
+        self._top.geometry(f"+{bx}+{by}")
+
+        # Children show the applied selection - Cancel of an earlier open is undone
+        for spec, child in zip(self._child_specs, self._child_widgets):
+            child.set_selected(sorted(spec["selection"]))
+        self._popover_open = True
+
         try:
             self._top.grab_set()
         except tk.TclError:
@@ -508,26 +683,40 @@ class MultiSelectPlus(PopoverMultiSelect):
         self._top.lift()
         self._top.update_idletasks()
 
+    @user_action("Apply dropdown selection")
     def _apply_and_close(self):
-        if not (self._top and tk.Toplevel.winfo_exists(self._top)):
+        if not self._is_open():
             return
+        changed = False
         for spec, child in zip(self._child_specs, self._child_widgets or []):
-            spec["selection"] = set(child.get_selected())
+            selection = set(child.get_selected())
+            changed = changed or selection != spec["selection"]
+            spec["selection"] = selection
         self._update_button_text()
         self._close()
+        if changed:
+            self.event_generate(SELECTION_CHANGED_EVENT)
 
     def _close(self):
         # unbind click-outside handler
         self._unbind_click_outside()
 
+        # An open group popover closes with the composite one
+        for child in self._child_widgets or []:
+            if child._is_open():
+                child._close()
+
         try:
             if self._top:
                 self._top.grab_release()
         except Exception:
             pass
 
+        # Hide only - groups and their search indexes are reused by the next open
         if self._top and tk.Toplevel.winfo_exists(self._top):
-            self._top.destroy()
+            self._top.withdraw()
 
-        self._top = None
-        self._child_widgets = None
+        was_open = self._popover_open
+        self._popover_open = False
+        if was_open:
+            self.event_generate(POPOVER_CLOSED_EVENT)
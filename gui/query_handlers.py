@@ -4,13 +4,34 @@ Handles database query execution and result processing.
 Uses centralized configuration from db.db_config for all database-related constants.
 """
 
-from db.dbHandler import build_filter, build_cost_filters, execute_query
+import os
+
+from db.dbHandler import (
+    build_filter, build_cost_filters, execute_query, build_query_filters,
+    build_detail_metric_filter, read_parquet_source, execute_multi_db_query,
+    execute_run_comparison, estimate_plan_rows, interrupt_running_queries
+)
 from db.db_config import (
-    METRIC_TO_SQL, COMPARISON_OPERATORS, METRIC_LABELS, 
+    METRIC_TO_SQL, COMPARISON_OPERATORS, METRIC_LABELS, ANALYSIS_TYPES,
     UI_ANALYSIS_MAP, ANALYSIS_TO_FILTER_KEY, CONFIG_PARAM_DISPLAY
 )
-from utils import build_config_params_label
+from config import (
+    PARALLEL_AGGREGATION_MIN_RUNS, PARALLEL_AGGREGATION_WORKERS, PREVIEW_MIN_ROWS,
+    PREVIEW_SAMPLE_PERCENT, PLOT_RENDER_MODE, PLOT_FIGSIZE, PLOT_DPI, LIVE_EXECUTE_DEBOUNCE_MS,
+    REPORT_WORKERS
+)
+from db.parallel_aggregation import aggregate_runs
+from db.result_store import ResultSet
+from gui.background import run_in_background
+from gui.watchdog import user_action
+from utils import build_config_params_label, build_params_summary
 from plotting.treeview import plot_treeview
+from plotting.plot_model import new_result_id
+from plotting.render_worker import submit_render
+
+
+# Parameter summary suffix of exploratory results
+APPROX_MEDIAN_SUMMARY = " | ≈ Approximate medians (exploratory)"
 
 
 class QueryHandlersMixin:
@@ -64,77 +85,42 @@ class QueryHandlersMixin:
         
         print("=" * 60)
     
-    def on_execute(self, query_id=2, analysis_type="Loss Factor"):
+    @user_action("Execute query")
+    def on_execute(self, query_id=2, analysis_type="Loss Factor", approx_median=None):
         """
         Execute analysis query
         
         Args:
             query_id (int): Query identifier (1=Pläne, 2=Aggregated, 3=Single Query)
             analysis_type (str): Type of analysis for status message
+            approx_median (bool): Approximate medians (None = exploratory toggle)
         """
         selected_pg = self.ms_plan_generator.get_selected()
         selected_cp = self.ms_cardinality_provider.get_selected()
         selected_bpc = self.ms_build_plan_class.get_selected()
         selected_cf = self.msplus_cost_function.get_selected()
         selected_qg = self.ms_query_selection.get_selected()
-        selected_plot_types = self.ms_plot_type.get_selected()
-        
-        # Determine X-Axis and Y-Axis based on query selection
-        if selected_qg and len(selected_qg) > 0:
-            # Query mode - use ps_qg for x-axis and metric for y-axis
-            selected_x_axis = ["Query Graph: ps_qg"]
-            # Y-axis depends on analysis type
-            if analysis_type == "Loss Factor":
-                selected_y_axis = ["lf"]
-            elif analysis_type == "Q-Error":
-                selected_y_axis = ["qerr"]
-            elif analysis_type == "P-Error":
-                selected_y_axis = ["perr"]
-            else:
-                selected_y_axis = ["lf"]  # default
-        else:
-            # Aggregated mode - use configuration parameters for x-axis
-            selected_x_axis = ["Configuration Parameters"]
-            selected_y_axis = ["Loss Factor"]
 
-        pg_filter = build_filter("pg_name", selected_pg)
-        cp_filter = build_filter("cp_name", selected_cp)
-        bpc_filter = build_filter("bpc_name", selected_bpc)
-        qg_filter = build_filter("ps_qg", selected_qg)
-        cf_filter = build_cost_filters(selected_cf)
-        
-        # Simplified filter setup - both query_id=2 and query_id=3 use the same structure
-        filters = {
-            "PG_NAME_FILTER": pg_filter,
-            "CP_NAME_FILTER": cp_filter,
-            "BPC_NAME_FILTER": bpc_filter,
-            "QUERY_NAME_FILTER": qg_filter
-        }
-        
         # Add detail metric filter if exists
         detail_filter_values = self.get_detail_filter_values()
         detail_metric_filter = self.build_detail_metric_filter(detail_filter_values)
-        filters["DETAIL_METRIC_FILTER"] = detail_metric_filter
-        
-        # Set analysis type for column selection
-        if analysis_type == "Loss Factor":
-            filters["ANALYSIS_TYPE"] = "LF"
-        elif analysis_type == "Q-Error":
-            filters["ANALYSIS_TYPE"] = "QERR"
-        elif analysis_type == "P-Error":
-            filters["ANALYSIS_TYPE"] = "PERR"
-        else:
-            filters["ANALYSIS_TYPE"] = "LF"  # default
         
-        # Add cost function filters
-        filters.update(cf_filter)
+        # Exploratory mode - only the aggregated query has median columns
+        if approx_median is None:
+            approx_median = self.exploratory_var.get()
+        approx_median = bool(approx_median) and query_id == 2
+        
+        # Simplified filter setup - both query_id=2 and query_id=3 use the same structure
+        filters = build_query_filters(
+            selected_pg, selected_cp, selected_bpc, selected_cf, selected_qg,
+            analysis_type=analysis_type,
+            detail_metric_filter=detail_metric_filter,
+            approx_median=approx_median
+        )
         
         print(f"\nDEBUG: on_execute (query_id={query_id}, analysis_type={analysis_type})")
         print(f"  detail_metric_filter: {detail_metric_filter}")
         
-        # Execute the query
-        columns, result = execute_query(query_id, filters=filters)
-        
         # Build parameter summary for display and export
         params_summary = self.build_params_summary(
             query_id=query_id,
@@ -146,14 +132,280 @@ class QueryHandlersMixin:
             detail_filter_values=detail_filter_values
         )
         
+        # Benchmark runs selected -> query all of them (ATTACH + UNION ALL)
+        selected_runs = [name for name in self.ms_runs.get_selected() if name in self.run_databases]
+        run_paths = [self.run_databases[name] for name in selected_runs]
+        if selected_runs:
+            params_summary += f" | Runs: {', '.join(selected_runs)}"
+        compare = bool(run_paths) and self.compare_runs_var.get() and len(run_paths) > 1
+        
+        self.execute_filters(query_id, analysis_type, filters, params_summary, run_paths, compare)
+    
+    def execute_filters(self, query_id, analysis_type, filters, params_summary, run_paths=None,
+                        compare=False, selections=None):
+        """
+        Execute a query with already built filters (from the widgets, or stored for the exact re-run).
+        
+        Args:
+            query_id (int): Query identifier (2=Aggregated, 3=Single Query)
+            analysis_type (str): Type of analysis for status message
+            filters (dict): Filter values for the SQL placeholders (APPROX_MEDIAN = exploratory)
+            params_summary (str): Parameter summary for display and export (without mode suffix)
+            run_paths (list): Benchmark run databases (None/empty = current database)
+            compare (bool): Side-by-side comparison of the runs
+            selections (dict): Widget selections for the history (None = capture the current ones)
+        """
+        approx_median = bool(filters.get("APPROX_MEDIAN"))
+        # Results of still running older queries must not replace this one - cancel them
+        self._query_generation += 1
+        generation = self._query_generation
+        interrupt_running_queries(generation)
+        
+        # Exploratory result: kept to re-run exactly this query with exact medians
+        self.last_exploratory_query = None
+        if approx_median:
+            self.last_exploratory_query = {
+                "query_id": query_id,
+                "analysis_type": analysis_type,
+                "filters": filters,
+                "params_summary": params_summary,
+                "run_paths": list(run_paths or []),
+                "compare": compare,
+                "selections": selections or self._capture_selections(),
+            }
+            params_summary += APPROX_MEDIAN_SUMMARY
+        self.exact_rerun_button.config(state="normal" if approx_median else "disabled")
+        
+        # Live mode keeps replacing one results tab, every other execution opens a new one
+        tab_key = "live" if self.live_var.get() else None
+        
+        if run_paths:
+            if compare:
+                self.show_run_comparison(query_id, analysis_type, filters, run_paths, params_summary,
+                                         approx_median=approx_median, selections=selections)
+                return
+            
+            def run_query():
+                if len(run_paths) >= PARALLEL_AGGREGATION_MIN_RUNS:
+                    # Many runs: one worker process per database, Arrow results merged here
+                    result = ResultSet(aggregate_runs(run_paths, query_id, filters, PARALLEL_AGGREGATION_WORKERS))
+                    return result.columns, result
+                return execute_multi_db_query(query_id, filters, run_paths, arrow=True,
+                                              query_generation=generation)
+            # No query spec: exports write the loaded rows
+            query_spec = None
+            history = self.new_history_entry(query_id, analysis_type, approx_median, filters,
+                                             params_summary, run_paths, selections=selections)
+        else:
+            # Kept with the results so exports can re-run the (exact) query in DuckDB
+            query_spec = {"file_nr": query_id, "filters": filters}
+            # Recorded once the result is shown (duration, row count, cached result)
+            history = self.new_history_entry(query_id, analysis_type, approx_median, filters, params_summary,
+                                             selections=selections)
+            
+            # Huge plan_summary: sampled preview first, exact result in the background
+            if estimate_plan_rows() >= PREVIEW_MIN_ROWS:
+                self.show_preview_then_exact(query_id, analysis_type, filters, params_summary,
+                                             self._config_params(), query_spec, approx_median, tab_key,
+                                             history=history)
+                return
+            
+            def run_query():
+                # Execute the query - Arrow-backed result shared by table, plots and exports
+                return execute_query(query_id, filters=filters, arrow=True, query_generation=generation)
+        
         # Build config params summary for box plot x-axis label
-        config_params = {
-            'pg': selected_pg,
-            'cp': selected_cp,
-            'bpc': selected_bpc,
-            'cf': selected_cf,
-            'qg': selected_qg
+        config_params = self._config_params()
+        
+        def show_result(query_result):
+            columns, result = query_result
+            result_id = new_result_id()
+            self.record_history(history, columns, result, result_id)
+            # Show as plot or table and report the result
+            if self.display_results(columns, result, params_summary, query_id, analysis_type, config_params,
+                                    result_id=result_id, query_spec=query_spec, tab_key=tab_key):
+                status = f"{analysis_type} query executed - {len(result)} results found"
+                if approx_median:
+                    status += " (approximate medians - 🎯 Exact Re-run for exact values)"
+                self.update_status(status)
+                self.after(100, self.restore_entry_focus)
+        
+        if tab_key == "live":
+            # Live mode: keep the Tk loop free, a newer change supersedes this query
+            self._run_latest_only(run_query, show_result, analysis_type)
+        else:
+            show_result(run_query())
+    
+    def _run_latest_only(self, run_query, show_result, analysis_type):
+        """
+        Run a query in the background and show its result only if no newer query was started.
+        
+        Args:
+            run_query (callable): Returns (columns, result)
+            show_result (callable): Displays (columns, result) in the Tk thread
+            analysis_type (str): Type of analysis for status message
+        """
+        generation = self._query_generation
+        self.update_status(f"⏳ Live: {analysis_type} query running…")
+        
+        def done(query_result):
+            if generation == self._query_generation:
+                show_result(query_result)
+        
+        def failed(ex):
+            # Interrupted by a newer query: nothing to report
+            if generation == self._query_generation:
+                self.update_status(f"⚠️ Live {analysis_type} query failed: {ex}")
+        
+        run_in_background(self, run_query, done, failed)
+    
+    def on_filter_changed(self, event=None):
+        """A filter changed (<<SelectionChanged>>, detail filter entry): re-run in live mode."""
+        # Restoring a history entry sets many filters - its result is shown from the cache
+        if not self.live_var.get() or self._is_closing or self._restoring_history:
+            return
+        # Coalesce rapid changes into one execution of the latest state
+        if self._live_after_id is not None:
+            self.cancel_scheduled(self._live_after_id)
+        self._live_after_id = self.schedule(LIVE_EXECUTE_DEBOUNCE_MS, self._run_live_execute)
+    
+    def _run_live_execute(self):
+        self._live_after_id = None
+        if self.live_var.get():
+            self.choose_correct_query()
+    
+    def _config_params(self):
+        """Selected configuration parameters (box plot x-axis label)."""
+        return {
+            'pg': self.ms_plan_generator.get_selected(),
+            'cp': self.ms_cardinality_provider.get_selected(),
+            'bpc': self.ms_build_plan_class.get_selected(),
+            'cf': self.msplus_cost_function.get_selected(),
+            'qg': self.ms_query_selection.get_selected()
         }
+    
+    def show_preview_then_exact(self, query_id, analysis_type, filters, params_summary, config_params,
+                                query_spec, approx_median=False, tab_key=None, history=None):
+        """
+        Preview mode: show the result of a PREVIEW_SAMPLE_PERCENT % sample first and replace it
+        with the exact result. Both queries run in the background (the exact one is started
+        once the preview is shown); results of a superseded execution are dropped.
+        
+        Args:
+            query_id (int): Query identifier (2=Aggregated, 3=Single Query)
+            analysis_type (str): Type of analysis for status message
+            filters (dict): Exact query filters (the sample is added here)
+            params_summary (str): Parameter summary for display and export
+            config_params (dict): Selected configuration parameters
+            query_spec (dict): Exact query for exports (exports never use the sample)
+            approx_median (bool): Exploratory mode is active (status message only)
+            tab_key: Results tab to use (None = a new tab, shared by preview and exact result)
+            history (dict): History entry, recorded with the exact result
+        """
+        generation = self._query_generation
+        if tab_key is None:
+            tab_key = ("exact", generation)
+        
+        preview_filters = dict(filters, SAMPLE_PERCENT=PREVIEW_SAMPLE_PERCENT)
+        preview_summary = params_summary + f" | ⏳ Preview ({PREVIEW_SAMPLE_PERCENT}% sample) - exact result loading…"
+        
+        def show_preview(preview):
+            # A newer query (or parquet file) is shown by now - its start interrupted ours
+            if generation != self._query_generation:
+                return
+            columns, result = preview
+            if not self.display_results(columns, result, preview_summary, query_id, analysis_type, config_params,
+                                        result_id=new_result_id(), query_spec=query_spec, tab_key=tab_key):
+                return
+            self.update_status(f"{analysis_type} preview - {len(result)} results from a {PREVIEW_SAMPLE_PERCENT}% "
+                               f"sample, exact query running…")
+            self.after(100, self.restore_entry_focus)
+            run_exact()
+        
+        def preview_failed(ex):
+            # No preview: go straight to the exact result
+            if generation == self._query_generation:
+                print(f"DEBUG: preview query failed ({ex}), running the exact query")
+                run_exact()
+        
+        def run_exact():
+            run_in_background(self, lambda: execute_query(query_id, filters=filters, arrow=True,
+                                                          query_generation=generation),
+                              show_exact, show_error)
+        
+        def show_exact(exact):
+            # A newer query (or parquet file) is shown by now
+            if generation != self._query_generation:
+                return
+            exact_columns, exact_result = exact
+            result_id = new_result_id()
+            if history is not None:
+                self.record_history(history, exact_columns, exact_result, result_id)
+            if self.display_results(exact_columns, exact_result, params_summary, query_id, analysis_type,
+                                    config_params, result_id=result_id, query_spec=query_spec,
+                                    tab_key=tab_key):
+                status = f"{analysis_type} query executed - {len(exact_result)} results found"
+                if approx_median:
+                    status += " (approximate medians - 🎯 Exact Re-run for exact values)"
+                self.update_status(status)
+        
+        def show_error(ex):
+            if generation == self._query_generation:
+                self.update_status(f"Exact {analysis_type} query failed: {ex}")
+        
+        # Sample scan and exact query both run in the background, the Tk loop stays free
+        self.update_status(f"⏳ {analysis_type} preview query running…")
+        run_in_background(self, lambda: execute_query(query_id, filters=preview_filters, arrow=True,
+                                                      query_generation=generation),
+                          show_preview, preview_failed)
+    
+    def rerun_exact(self):
+        """Re-run the last exploratory query with exact medians (same filters, not the current widgets)."""
+        query = getattr(self, "last_exploratory_query", None)
+        if query:
+            selections = dict(query["selections"], exploratory=False)
+            self.execute_filters(query["query_id"], query["analysis_type"],
+                                 dict(query["filters"], APPROX_MEDIAN=False), query["params_summary"],
+                                 query["run_paths"], query["compare"], selections=selections)
+    
+    def display_results(self, columns, result, params_summary, query_id, analysis_type, config_params,
+                        result_id=None, query_spec=None, tab_key=None):
+        """
+        Display a result set as plot (if a plot type is selected) or as table in a results tab.
+        
+        Args:
+            columns (list): Column names
+            result (list): Result rows
+            params_summary (str): Parameter summary for display and export
+            query_id (int): Query the rows come from (2=Aggregated, 3=Single Query)
+            analysis_type (str): "Loss Factor", "Q-Error" or "P-Error"
+            config_params (dict): Selected configuration parameters (box plot x-axis label)
+            result_id: Id of the result in the plot model cache
+            query_spec (dict): {'file_nr': ..., 'filters': ...} for streaming exports (optional)
+            tab_key: Results tab whose content is replaced (None = new tab)
+        
+        Returns:
+            bool: False if a required plot setting is missing (status already updated)
+        """
+        selected_plot_types = self.ms_plot_type.get_selected()
+        
+        # Determine X-Axis and Y-Axis based on query mode
+        if query_id == 3:
+            # Query mode - use ps_qg for x-axis and metric for y-axis
+            selected_x_axis = ["Query Graph: ps_qg"]
+            # Y-axis depends on analysis type
+            if analysis_type == "Loss Factor":
+                selected_y_axis = ["lf"]
+            elif analysis_type == "Q-Error":
+                selected_y_axis = ["qerr"]
+            elif analysis_type == "P-Error":
+                selected_y_axis = ["perr"]
+            else:
+                selected_y_axis = ["lf"]  # default
+        else:
+            # Aggregated mode - use configuration parameters for x-axis
+            selected_x_axis = ["Configuration Parameters"]
+            selected_y_axis = ["Loss Factor"]
         
         # Check if a plot type is selected
         if selected_plot_types and len(selected_plot_types) > 0:
@@ -178,7 +430,7 @@ class QueryHandlersMixin:
                 if not agg_metric and agg_is_enabled:
                     self.update_status("Please select an Aggregation when using the Plotting functionality")
                     self.after(100, self.restore_entry_focus)
-                    return
+                    return False
             
             # Get metric selection (Highest/Lowest)
             selected_metrics = self.ms_metric.get_selected()
@@ -196,17 +448,110 @@ class QueryHandlersMixin:
                 if not box_plot_split:
                     self.update_status("⚠️ Please select a Split Option for Box Plot")
                     self.after(100, self.restore_entry_focus)
-                    return
+                    return False
             
             # Display plot in results frame with aggregation metric and config params
-            self.display_plot_in_frame(columns, result, params_summary, plot_type, x_axis, y_axis, agg_metric, metric, plot_number, config_params, box_plot_split)
+            self.display_plot_in_frame(columns, result, params_summary, plot_type, x_axis, y_axis, agg_metric, metric, plot_number, config_params, box_plot_split, result_id=result_id, tab_key=tab_key)
         else:
             # No plot type selected, show treeview (table) in results frame
+            self.display_treeview_in_frame(columns, result, params_summary, query_spec=query_spec, tab_key=tab_key)
+        return True
+    
+    @user_action("Compare runs")
+    def show_run_comparison(self, query_id, analysis_type, filters, run_paths, params_summary,
+                            approx_median=False, selections=None):
+        """
+        Show the side-by-side comparison of the selected runs as table:
+        one row per configuration, one column per run for the compared metric.
+        
+        Args:
+            query_id (int): 2=Aggregated, 3=Single Query
+            analysis_type (str): "Loss Factor", "Q-Error" or "P-Error"
+            filters (dict): Filter values for the SQL placeholders
+            run_paths (list): Run database paths
+            params_summary (str): Parameter summary for display and export
+            approx_median (bool): Exploratory mode (recorded in the query history)
+            selections (dict): Widget selections for the history (None = current ones)
+        """
+        # Compared metric: raw metric in query mode, else the selected aggregation (default avg)
+        metric_col = ANALYSIS_TYPES[ANALYSIS_TO_FILTER_KEY.get(analysis_type, "LF")]["single_column"].strip()
+        if query_id == 3:
+            metric = metric_col
+        else:
+            selected_agg_metrics = self.ms_agg_metric.get_selected()
+            metric = selected_agg_metrics[0] if selected_agg_metrics else f"avg_{metric_col}"
+        
+        params_summary += f" | Side-by-side: {METRIC_LABELS.get(metric, metric)}"
+        history = self.new_history_entry(query_id, analysis_type, approx_median, filters, params_summary,
+                                         run_paths, mode="comparison", compare_metric=metric,
+                                         selections=selections)
+        # PIVOT over all attached runs in the background, a newer query supersedes (interrupts) it
+        generation = self._query_generation
+        self.update_status(f"⏳ Run comparison ({len(run_paths)} runs) running…")
+        
+        def show_comparison(query_result):
+            if generation != self._query_generation:
+                return
+            columns, result = query_result
+            self.record_history(history, columns, result)
             self.display_treeview_in_frame(columns, result, params_summary)
+            self.update_status(f"Run comparison ({len(run_paths)} runs) - {len(result)} configurations")
+            self.after(100, self.restore_entry_focus)
+        
+        def show_error(ex):
+            if generation == self._query_generation:
+                self.update_status(f"⚠️ Run comparison failed: {ex}")
+        
+        run_in_background(self, lambda: execute_run_comparison(query_id, filters, run_paths, metric,
+                                                               query_generation=generation),
+                          show_comparison, show_error)
+    
+    @user_action("Open Parquet")
+    def open_parquet_source(self):
+        """
+        Open an exported Parquet file as read-only data source for table and plots.
+        The database is not touched - the file is read with an in-memory DuckDB.
+        """
+        from tkinter import filedialog, messagebox
         
-        # Update status and restore focus
-        self.update_status(f"{analysis_type} query executed - {len(result)} results found")
-        self.after(100, self.restore_entry_focus)
+        filepath = filedialog.askopenfilename(
+            filetypes=[("Parquet-Datei", "*.parquet"), ("Alle Dateien", "*.*")]
+        )
+        if not filepath:
+            return
+        
+        try:
+            columns, result, metadata = read_parquet_source(filepath)
+        except Exception as e:
+            messagebox.showerror("Fehler beim Öffnen", str(e))
+            return
+        # Replaces the shown result - drop a pending exact query of a preview
+        self._query_generation += 1
+        
+        # Query mode and analysis type from the export metadata, else from the columns
+        query_id = int(metadata.get("file_nr", 3 if "ps_qg" in columns else 2))
+        analysis_key = metadata.get("analysis_type")
+        if analysis_key not in ANALYSIS_TYPES:
+            # Detect from the metric columns (lf / avg_lf, qerr / avg_qerr, ...)
+            analysis_key = "LF"
+            for key, config in ANALYSIS_TYPES.items():
+                metric_col = config["single_column"].strip()
+                if metric_col in columns or f"avg_{metric_col}" in columns:
+                    analysis_key = key
+                    break
+        analysis_type = ANALYSIS_TYPES[analysis_key]["display_name"]
+        
+        source_name = os.path.basename(filepath)
+        params_summary = f"Parquet: {source_name}"
+        if metadata.get("params_summary"):
+            params_summary += f" | {metadata['params_summary']}"
+        
+        print(f"DEBUG: open_parquet_source {filepath} ({len(result)} rows, query_id={query_id}, {analysis_type})")
+        
+        # No query spec: exports of this result write the loaded rows
+        if self.display_results(columns, result, params_summary, query_id, analysis_type, config_params={},
+                                result_id=new_result_id()):
+            self.update_status(f"Parquet file opened (read-only) - {len(result)} results from {source_name}")
     
     def build_params_summary(self, query_id, analysis_type, selected_pg, selected_cp, selected_bpc, selected_cf, detail_filter_values=None):
         """
@@ -215,88 +560,24 @@ class QueryHandlersMixin:
         Returns:
             str: Formatted parameter summary
         """
-        parts = []
-        parts.append(f"Analysis Type: {analysis_type}")
-        parts.append(f"Plan Generators: {', '.join(selected_pg) if selected_pg else 'All'}")
-        parts.append(f"Cardinality Providers: {', '.join(selected_cp) if selected_cp else 'All'}")
-        parts.append(f"Build Plan Class: {', '.join(selected_bpc) if selected_bpc else 'All'}")
-        
-        # Cost functions
-        cf_parts = []
-        for key, values in selected_cf.items():
-            if values:
-                cf_name = key.replace('_', ' ').title()
-                cf_parts.append(f"{cf_name}: {', '.join(values)}")
-        if cf_parts:
-            parts.append(f"Cost Functions: {' | '.join(cf_parts)}")
-        else:
-            parts.append("Cost Functions: All")
-        
-        return " | ".join(parts)
+        return build_params_summary(analysis_type, selected_pg, selected_cp, selected_bpc, selected_cf)
     
     def build_detail_metric_filter(self, filter_values):
         """
         Convert filter values to SQL HAVING clause condition for DuckDB.
-        Uses centralized METRIC_TO_SQL and COMPARISON_OPERATORS from db_config.
+        See db.dbHandler.build_detail_metric_filter.
         
         Args:
             filter_values (list): List of filter dictionaries from get_detail_filter_values()
-                Each dict contains:
-                - 'metric': Selected metric (e.g., 'avg_lf')
-                - 'comparison': Comparison type
-                - 'value': Numeric value
         
         Returns:
             str: SQL HAVING clause condition with multiple filters combined with AND
-                 (e.g., "AVG(ps_loss_factor) > 10.0 AND MEDIAN(ps_loss_factor) < 50.0")
         """
         print(f"\nDEBUG: build_detail_metric_filter")
         print(f"  Input - filter_values: {filter_values}")
-        
-        # Validate inputs
-        if not filter_values:
-            print(f"  -> No filters provided, returning '1=1'")
-            return "1=1"  # No filtering
-        
-        # Build SQL conditions for each filter
-        conditions = []
-        for i, filter_dict in enumerate(filter_values):
-            metric = filter_dict.get('metric')
-            comparison = filter_dict.get('comparison')
-            value = filter_dict.get('value')
-            
-            # Skip incomplete filters
-            if not metric or not comparison or value is None:
-                print(f"  Filter {i+1}: Incomplete, skipping")
-                continue
-            
-            # Get SQL expression from centralized config
-            sql_metric = METRIC_TO_SQL.get(metric, metric)
-            
-            # Handle "between" comparison separately
-            if comparison == "between":
-                if isinstance(value, tuple) and len(value) == 2:
-                    condition = f"{sql_metric} BETWEEN {value[0]} AND {value[1]}"
-                    conditions.append(condition)
-                    print(f"  Filter {i+1}: {metric} {comparison} {value[0]};{value[1]} -> {condition}")
-                else:
-                    print(f"  Filter {i+1}: Invalid 'between' value format, skipping")
-                    continue
-            else:
-                # Get operator from centralized config
-                operator = COMPARISON_OPERATORS.get(comparison, ">")
-                condition = f"{sql_metric} {operator} {value}"
-                conditions.append(condition)
-                print(f"  Filter {i+1}: {metric} {comparison} {value} -> {condition}")
-        
-        # Combine all conditions with AND
-        if conditions:
-            result = " AND ".join(conditions)
-            print(f"  -> Final SQL: {result}")
-            return result
-        else:
-            print(f"  -> No valid conditions, returning '1=1'")
-            return "1=1"
+        result = build_detail_metric_filter(filter_values)
+        print(f"  -> Final SQL: {result}")
+        return result
     
     def create_plot(self, columns, data, params_summary, plot_type, x_axis=None, y_axis=None, metric=None, plot_number=5):
         """
@@ -318,33 +599,80 @@ class QueryHandlersMixin:
         # Call the plotting function
         create_plot_window(columns, data, params_summary, plot_type, x_axis, y_axis, metric, plot_number)
 
-    def display_treeview_in_frame(self, columns, data, params_summary):
-        """Display treeview table in the results frame"""
-        import tkinter as tk
-        from tkinter import ttk
-        import pandas as pd
-        from tkinter import filedialog, messagebox
+    @user_action("Show table")
+    def display_treeview_in_frame(self, columns, data, params_summary, query_spec=None, tab_key=None):
+        """
+        Display a treeview table in a results tab.
         
+        Args:
+            tab_key: Tab whose content is replaced (None = new tab)
+        """
         print(f"DEBUG: display_treeview_in_frame called with {len(data)} rows")
         
-        # Store current results for fullscreen
-        self.current_results_data = {
+        # View description - the tab rebuilds the table from it after releasing it
+        view = {
             'type': 'treeview',
             'columns': columns,
             'data': data,
-            'params_summary': params_summary
+            'params_summary': params_summary,
+            'query_spec': query_spec
+        }
+        self.results_tabs.show(view, f"Table ({len(data):,} rows)", tab_key)
+        print("DEBUG: display_treeview_in_frame completed")
+    
+    @user_action("Show plot")
+    def display_plot_in_frame(self, columns, data, params_summary, plot_type, x_axis=None, y_axis=None, agg_metric=None, metric=None, plot_number=5, config_params=None, box_plot_split=None, result_id=None, tab_key=None):
+        """
+        Display a plot in a results tab.
+        
+        Args:
+            tab_key: Tab whose content is replaced (None = new tab)
+        """
+        print(f"DEBUG: display_plot_in_frame called - plot_type: {plot_type}, agg_metric: {agg_metric}, box_plot_split: {box_plot_split}")
+        
+        # View description - the tab rebuilds the plot from it after releasing it
+        view = {
+            'type': 'plot',
+            'result_id': result_id,
+            'columns': columns,
+            'data': data,
+            'params_summary': params_summary,
+            'plot_type': plot_type,
+            'x_axis': x_axis,
+            'y_axis': y_axis,
+            'agg_metric': agg_metric,
+            'metric': metric,
+            'plot_number': plot_number,
+            'config_params': config_params,
+            'box_plot_split': box_plot_split
         }
+        self.results_tabs.show(view, plot_type, tab_key)
+        print("DEBUG: display_plot_in_frame completed")
+    
+    @user_action("Render result tab")
+    def _render_result_view(self, container, view):
+        """
+        Build the widgets of a result view (table or plot) in a results tab.
+        Called when a result is shown and when a released tab is selected again.
         
-        # Clear the results container
-        for widget in self.results_container.winfo_children():
-            widget.destroy()
+        Args:
+            container: Tab frame
+            view (dict): View description from display_treeview_in_frame / display_plot_in_frame
+        """
+        if view['type'] == 'treeview':
+            self._build_treeview(container, view['columns'], view['data'])
+        else:
+            self._build_plot(container, view)
         
-        print("DEBUG: Results container cleared")
-        print(f"DEBUG: Container geometry: {self.results_container.winfo_width()}x{self.results_container.winfo_height()}")
-        print(f"DEBUG: Container is visible: {self.results_container.winfo_ismapped()}")
+        # Force update to ensure widgets are rendered
+        container.update_idletasks()
+        container.update()
+    
+    def _build_treeview(self, container, columns, data):
+        """Treeview with scrollbars (no toolbar/export button in embedded view)"""
+        from tkinter import ttk
         
-        # Create treeview with scrollbars (no toolbar/export button in embedded view)
-        tree_frame = ttk.Frame(self.results_container)
+        tree_frame = ttk.Frame(container)
         tree_frame.pack(fill="both", expand=True)
         
         # Scrollbars
@@ -363,8 +691,6 @@ class QueryHandlersMixin:
         hsb.pack(side="bottom", fill="x")
         tree.pack(fill="both", expand=True)
         
-        print("DEBUG: Treeview created and packed")
-        
         # Configure columns
         for col in columns:
             tree.heading(col, text=col)
@@ -375,109 +701,22 @@ class QueryHandlersMixin:
             tree.insert("", "end", values=row)
         
         print(f"DEBUG: Inserted {len(data)} rows into treeview")
-        
-        # Force update to ensure widgets are rendered
-        tree_frame.update_idletasks()
-        self.results_container.update_idletasks()
-        self.results_container.update()
-        print(f"DEBUG: Tree frame size: {tree_frame.winfo_width()}x{tree_frame.winfo_height()}")
-        print(f"DEBUG: Treeview size: {tree.winfo_width()}x{tree.winfo_height()}")
-        print("DEBUG: display_treeview_in_frame completed")
     
-    def display_plot_in_frame(self, columns, data, params_summary, plot_type, x_axis=None, y_axis=None, agg_metric=None, metric=None, plot_number=5, config_params=None, box_plot_split=None):
-        """Display plot in the results frame"""
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        from plotting.plotting import get_plot_config, create_bar_chart, create_box_plot, create_box_plot_single, create_box_plot_split, create_scatter_plot, create_line_graph
-        import pandas as pd
+    def _build_plot(self, container, view):
+        """Scrollable plot area showing the (cached) plot model of a view"""
+        from plotting.plot_model import get_plot_model, make_plot_options
         import tkinter as tk
         from tkinter import ttk
         
-        print(f"DEBUG: display_plot_in_frame called - plot_type: {plot_type}, agg_metric: {agg_metric}, box_plot_split: {box_plot_split}")
-        
-        # Store current results for fullscreen
-        self.current_results_data = {
-            'type': 'plot',
-            'columns': columns,
-            'data': data,
-            'params_summary': params_summary,
-            'plot_type': plot_type,
-            'x_axis': x_axis,
-            'y_axis': y_axis,
-            'agg_metric': agg_metric,
-            'metric': metric,
-            'plot_number': plot_number,
-            'config_params': config_params,
-            'box_plot_split': box_plot_split
-        }
-        
-        # Clear the results container
-        for widget in self.results_container.winfo_children():
-            widget.destroy()
-        
-        print("DEBUG: Results container cleared for plot")
-        
-        # Create DataFrame
-        df = pd.DataFrame(data, columns=columns)
-        
-        # Get color palette
-        from plotting.style_plot import get_color_palette
-        colors = get_color_palette()
-        
-        # Create figure with smaller size for embedding
-        fig, ax = plt.subplots(figsize=(8, 5))
-        
-        print(f"DEBUG: Creating {plot_type}")
-        
-        # Check if we have a valid aggregation metric selected
-        if agg_metric and agg_metric in df.columns:
-            column = agg_metric
-            
-            # Get readable label from centralized METRIC_LABELS config
-            y_label = METRIC_LABELS.get(agg_metric, agg_metric)
-            
-            # Handle Box Plot differently - use ALL data, not sorted/filtered
-            if plot_type == "Box Plot":
-                # Build x-axis label from explicitly selected config parameters
-                x_axis_label = build_config_params_label(config_params)
-                title = f"Box Plot: {y_label}"
-                
-                # Check if split configuration is provided
-                if box_plot_split and box_plot_split in df.columns:
-                    # Use split box plot function with max_boxes limit
-                    create_box_plot_split(ax, df, column, box_plot_split, title, y_label, colors, max_boxes=plot_number)
-                else:
-                    # Use all values for single box plot (no sorting/filtering)
-                    create_box_plot_single(ax, df, column, title, y_label, x_axis_label, colors)
-            else:
-                # Other plot types - use sorted/filtered data
-                # Determine sort order based on metric selection
-                sort_ascending = (metric == "Lowest")
-                
-                # Get top N values
-                df_sorted = df.nlargest(plot_number, column) if not sort_ascending else df.nsmallest(plot_number, column)
-                
-                # Determine title based on metric selection
-                metric_text = metric if metric else "Highest"
-                title = f"{metric_text} {plot_number} {y_label}"
-                
-                # Create the appropriate plot type
-                if plot_type == "Bar Chart":
-                    create_bar_chart(ax, df_sorted, x_axis, column, title, y_label, colors)
-                elif plot_type == "Scatter Plot":
-                    create_scatter_plot(ax, df_sorted, x_axis, column, title, y_label, colors)
-                elif plot_type == "Graph":
-                    create_line_graph(ax, df_sorted, x_axis, column, title, y_label, colors)
-        else:
-            # No aggregation metric selected or not found in data - show placeholder
-            message = f"Please select an Aggregation metric" if not agg_metric else f"Metric '{agg_metric}' not found in data"
-            ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=12, transform=ax.transAxes)
-            ax.set_title(f"{plot_type} - No Metric Selected")
+        # Build (or reuse) the plot model - the fullscreen view and rebuilt tabs share it via result_id
+        options = make_plot_options(view['plot_type'], view['x_axis'], view['agg_metric'], view['metric'],
+                                    view['plot_number'], view['config_params'], view['box_plot_split'])
+        model = get_plot_model(view['result_id'], view['columns'], view['data'], options)
         
-        print("DEBUG: Plot created, embedding in tkinter")
+        print(f"DEBUG: Creating {view['plot_type']}")
         
         # Create a frame with scrollbars for the plot
-        plot_frame = ttk.Frame(self.results_container)
+        plot_frame = ttk.Frame(container)
         plot_frame.pack(fill="both", expand=True)
         
         # Create scrollbars
@@ -494,11 +733,44 @@ class QueryHandlersMixin:
         h_scrollbar.pack(side="bottom", fill="x")
         scroll_canvas.pack(side="left", fill="both", expand=True)
         
+        if PLOT_RENDER_MODE == "image":
+            # Rasterized in the render process, the Tk thread only shows the image
+            self._show_plot_image(plot_frame, scroll_canvas, model)
+        else:
+            self._embed_interactive_plot(plot_frame, scroll_canvas, model)
+    
+    def _embed_interactive_plot(self, plot_frame, scroll_canvas, model, toolbar=False):
+        """
+        Draw a plot model on a matplotlib Tk canvas inside the scrollable plot area.
+        
+        Args:
+            plot_frame: Frame holding scrollbars and scroll_canvas
+            scroll_canvas (tk.Canvas): Scrollable canvas the plot widget is placed on
+            model (dict): Plot model
+            toolbar (bool): Add the matplotlib navigation toolbar (zoom/pan) in pan mode
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from plotting.plot_renderer import render_plot_model
+        from plotting.style_plot import get_color_palette
+        
+        # Create figure with smaller size for embedding
+        fig, ax = plt.subplots(figsize=PLOT_FIGSIZE)
+        render_plot_model(ax, model, get_color_palette())
+        
+        print("DEBUG: Plot created, embedding in tkinter")
+        
         # Embed the matplotlib plot in the scrollable canvas
         canvas = FigureCanvasTkAgg(fig, master=scroll_canvas)
         canvas.draw()
         plot_widget = canvas.get_tk_widget()
         
+        if toolbar:
+            nav_toolbar = NavigationToolbar2Tk(canvas, plot_frame, pack_toolbar=False)
+            nav_toolbar.update()
+            nav_toolbar.pack(side="top", fill="x", before=scroll_canvas)
+            nav_toolbar.pan()
+        
         # Add the plot widget to the scrollable canvas
         scroll_canvas.create_window((0, 0), window=plot_widget, anchor="nw")
         
@@ -507,43 +779,104 @@ class QueryHandlersMixin:
         scroll_canvas.config(scrollregion=scroll_canvas.bbox("all"))
         
         print("DEBUG: Plot with scrollbars embedded")
-        
-        # Force update to ensure widgets are rendered
-        plot_frame.update_idletasks()
-        self.results_container.update_idletasks()
-        self.results_container.update()
-        
         plt.close(fig)  # Close the figure to free memory
-        print("DEBUG: display_plot_in_frame completed")
     
-    def _export_to_excel(self, columns, data, params_summary):
-        """Export treeview data to Excel"""
-        import pandas as pd
-        from tkinter import filedialog, messagebox
+    def _show_plot_image(self, plot_frame, scroll_canvas, model):
+        """
+        Render a plot model in the render process and show it as PhotoImage.
+        A click on the image swaps in the interactive canvas (zoom/pan).
         
-        try:
-            df = pd.DataFrame(data, columns=columns)
-            
-            filepath = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel-Datei", "*.xlsx"), ("Alle Dateien", "*.*")]
-            )
-            if not filepath:
+        Args:
+            plot_frame: Frame holding scrollbars and scroll_canvas
+            scroll_canvas (tk.Canvas): Scrollable canvas the image is drawn on
+            model (dict): Plot model (sent to the worker process)
+        """
+        import tkinter as tk
+        from tkinter import ttk
+        
+        placeholder = ttk.Label(scroll_canvas, text="⏳ Rendering plot…")
+        scroll_canvas.create_window((10, 10), window=placeholder, anchor="nw")
+        future = submit_render(model, PLOT_FIGSIZE, PLOT_DPI)
+        
+        def show_image(png):
+            # Results replaced while the plot was rendering
+            if not scroll_canvas.winfo_exists():
                 return
+            scroll_canvas.delete("all")
+            placeholder.destroy()
             
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                if params_summary:
-                    params_rows = [
-                        ['Query Parameters:', params_summary],
-                        ['', '']
-                    ]
-                    params_df = pd.DataFrame(params_rows)
-                    params_df.to_excel(writer, sheet_name='Data', index=False, header=False)
-                    df.to_excel(writer, sheet_name='Data', index=False, startrow=len(params_rows))
-                else:
-                    df.to_excel(writer, sheet_name='Data', index=False)
+            image = tk.PhotoImage(data=png)
+            scroll_canvas.image = image  # Keep a reference, Tk does not
+            item = scroll_canvas.create_image(0, 0, image=image, anchor="nw")
+            scroll_canvas.config(scrollregion=scroll_canvas.bbox("all"), cursor="hand2")
             
-            messagebox.showinfo("Export erfolgreich", f"Datei gespeichert:\n{filepath}")
-        except Exception as e:
-            messagebox.showerror("Export fehlgeschlagen", f"Fehler beim Exportieren:\n{str(e)}")
-
+            def make_interactive(event=None):
+                # Zoom/pan starts: replace the image by a matplotlib canvas
+                scroll_canvas.delete("all")
+                scroll_canvas.image = None
+                scroll_canvas.config(cursor="")
+                self._embed_interactive_plot(plot_frame, scroll_canvas, model, toolbar=True)
+                return "break"
+            
+            scroll_canvas.tag_bind(item, "<ButtonPress-1>", make_interactive)
+            print("DEBUG: Plot image shown (click for zoom/pan)")
+        
+        def show_error(ex):
+            # Render process failed: draw on the Tk thread instead
+            print(f"DEBUG: Plot rendering in worker failed ({ex}), drawing interactively")
+            if scroll_canvas.winfo_exists():
+                scroll_canvas.delete("all")
+                placeholder.destroy()
+                self._embed_interactive_plot(plot_frame, scroll_canvas, model)
+        
+        run_in_background(self, future.result, show_image, show_error)
+    
+    @user_action("PDF report")
+    def export_pdf_report(self):
+        """
+        Write the box plot matrix (analysis type x aggregation metric x split column)
+        of the current filters as multi-page PDF in a background export job.
+        The job thread runs the queries, the pages are rendered in REPORT_WORKERS processes.
+        """
+        from concurrent.futures import CancelledError
+        from tkinter import filedialog
+        from gui.jobs import start_export_job
+        from plotting.pdf_report import generate_pdf_report
+        
+        filepath = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".pdf",
+            filetypes=[("PDF File", "*.pdf"), ("All Files", "*.*")]
+        )
+        if not filepath:
+            return  # User cancelled
+        
+        # Selected analysis types (default: all), current configuration and detail filters
+        analysis_types = [UI_ANALYSIS_MAP[label] for label in self.ms_analysis_parameter.get_selected()
+                          if label in UI_ANALYSIS_MAP] or None
+        selections = {
+            "selected_pg": self.ms_plan_generator.get_selected(),
+            "selected_cp": self.ms_cardinality_provider.get_selected(),
+            "selected_bpc": self.ms_build_plan_class.get_selected(),
+            "selected_cf": self.msplus_cost_function.get_selected(),
+            "analysis_types": analysis_types,
+            "detail_filter_values": self.get_detail_filter_values(),
+        }
+        
+        def work(job):
+            def on_page(number, total):
+                job.detail = f"Page {number}/{total}"
+                if job.cancelled:
+                    raise CancelledError()
+            
+            job.detail = "Querying"
+            generate_pdf_report(filepath, workers=REPORT_WORKERS, on_page=on_page, **selections)
+        
+        start_export_job("PDF report", filepath, work)
+        self.update_status("PDF report started - see Export Jobs")
+    
+    def _export_to_excel(self, columns, data, params_summary, query_spec=None):
+        """Export treeview data to Excel as background job (streaming, progress in the jobs panel)"""
+        from plotting.treeview import export_to_excel
+        
+        export_to_excel(self, columns, data, params_summary, query_spec)
@@ -1,53 +1,101 @@
 """
 GUI Responsiveness Module
 Handles Entry widget focus management and responsiveness issues
+
+Event-driven: Entry widgets get the ENTRY_BIND_TAG bind tag once (register_entry),
+the handlers of that tag are bound once per application. Nothing polls - closing
+a popover (<<PopoverClosed>>) restores the Entry state when it can have changed.
 """
 
 import tkinter as tk
 
 
+# Bind tag shared by all registered Entry widgets
+ENTRY_BIND_TAG = "ResponsiveEntry"
+
+# Virtual event generated by PopoverMultiSelect/MultiSelectPlus when a popover closes
+POPOVER_CLOSED_EVENT = "<<PopoverClosed>>"
+
+
 class ResponsivenessMixin:
     """Mixin class providing Entry widget responsiveness management"""
-    
+
     def setup_focus_management(self):
         """Set up focus management to prevent Entry widgets from becoming unresponsive"""
-        # Bind a global handler to restore Entry focus when clicking on the main window
-        self.bind_all("<Button-1>", self.on_global_click)
-        
-        # Schedule periodic focus restoration and track the after_id
-        after_id = self.after(1000, self.periodic_focus_check)
-        if hasattr(self, '_after_ids'):
-            self._after_ids.append(after_id)
-    
-    def on_global_click(self, event):
-        """Handle global clicks to maintain Entry widget responsiveness"""
-        # Don't interfere with normal widget operations
-        return None
-    
-    def periodic_focus_check(self):
-        """Periodically ensure Entry widgets remain responsive"""
-        # Stop if window is closing
-        if hasattr(self, '_is_closing') and self._is_closing:
+        # Class bindings replace earlier ones - calling this again adds nothing
+        self.bind_class(ENTRY_BIND_TAG, "<Button-1>", self.on_entry_click)
+        self.bind_class(ENTRY_BIND_TAG, "<FocusIn>", self.on_entry_focus)
+        self.bind_class(ENTRY_BIND_TAG, "<KeyPress>", self.ensure_entry_focus)
+        self.bind_class(ENTRY_BIND_TAG, "<Destroy>", self._on_entry_destroyed)
+
+        # Popovers release their grab on close - restore the entries once afterwards
+        self.bind(POPOVER_CLOSED_EVENT, self.on_popover_closed)
+
+    def register_entry(self, entry):
+        """
+        Make an Entry widget use the responsive handlers (idempotent).
+
+        Args:
+            entry: ttk.Entry or tk.Entry
+        """
+        if not hasattr(self, '_focus_entries'):
+            self._focus_entries = {}
+        self._focus_entries[str(entry)] = entry
+
+        tags = entry.bindtags()
+        if ENTRY_BIND_TAG not in tags:
+            # After the widget's own tag, before the Entry class bindings (like instance bindings)
+            entry.bindtags((tags[0], ENTRY_BIND_TAG) + tags[1:])
+
+    def _on_entry_destroyed(self, event):
+        """Forget destroyed entries, so the tracked set stays bounded"""
+        getattr(self, '_focus_entries', {}).pop(str(event.widget), None)
+
+    def _registered_entries(self):
+        """Registered Entry widgets that still exist"""
+        entries = []
+        for entry in list(getattr(self, '_focus_entries', {}).values()):
+            try:
+                if entry.winfo_exists():
+                    entries.append(entry)
+            except tk.TclError:
+                pass
+        return entries
+
+    def schedule(self, delay_ms, func):
+        """
+        after() whose id is tracked until the callback runs (cancelled by on_closing).
+
+        Args:
+            delay_ms (int): Delay in milliseconds
+            func (callable): Callback without arguments
+
+        Returns:
+            str: after id
+        """
+        def run():
+            self._after_ids.discard(after_id)
+            if not self._is_closing:
+                func()
+
+        after_id = self.after(delay_ms, run)
+        self._after_ids.add(after_id)
+        return after_id
+
+    def cancel_scheduled(self, after_id):
+        """Cancel a callback from schedule() that has not run yet."""
+        if after_id in self._after_ids:
+            self._after_ids.discard(after_id)
+            self.after_cancel(after_id)
+
+    def on_popover_closed(self, event=None):
+        """Restore Entry widgets after any popover closed (replaces periodic checks)"""
+        if self._is_closing:
             return
-        
-        try:
-            # Check if Entry widgets exist and are responsive
-            if hasattr(self, 'eingabe_detail_entry') and self.eingabe_detail_entry.winfo_exists():
-                # Ensure the Entry widget can still receive events
-                self.eingabe_detail_entry.config(state='normal')
-                
-            if hasattr(self, 'eingabe_detail_2') and self.eingabe_detail_2.winfo_exists():
-                self.eingabe_detail_2.config(state='normal')
-                
-        except tk.TclError:
-            # Widget might have been destroyed
-            pass
-        
-        # Schedule next check and track the after_id
-        after_id = self.after(1000, self.periodic_focus_check)
-        if hasattr(self, '_after_ids'):
-            self._after_ids.append(after_id)
-    
+        self.restore_entry_responsiveness()
+        if hasattr(self, 'ms_filter_detail') and event is not None and event.widget is self.ms_filter_detail:
+            self.update_detail_entries_visibility()
+
     def on_entry_focus(self, event):
         """Handle focus events for Entry widgets to ensure they remain responsive"""
         try:
@@ -56,13 +104,13 @@ class ResponsivenessMixin:
                 self.grab_release()
             except tk.TclError:
                 pass
-                
+
             event.widget.focus_force()
             event.widget.config(state='normal')
         except (tk.TclError, AttributeError):
             pass
         return "break"
-    
+
     def on_entry_click(self, event):
         """Handle click events for Entry widgets to ensure they remain responsive"""
         try:
@@ -71,24 +119,24 @@ class ResponsivenessMixin:
                 self.grab_release()
             except tk.TclError:
                 pass
-            
+
             # Set focus and cursor
             event.widget.focus_force()
             event.widget.icursor(tk.INSERT)
-            
+
             # Ensure the widget is in normal state
             event.widget.config(state='normal')
-            
+
         except (tk.TclError, AttributeError):
             pass
         return "break"
-    
+
     def ensure_entry_focus(self, event):
         """Ensure Entry widget maintains focus during key events"""
         if event.widget and hasattr(event.widget, 'focus_set'):
             event.widget.focus_set()
         return None  # Allow normal key processing to continue
-    
+
     def update_detail_entries_visibility(self):
         """Update visibility of second entry based on filter selection"""
         selected_filter = self.ms_filter_detail.get_selected()
@@ -98,117 +146,49 @@ class ResponsivenessMixin:
         else:
             if self.eingabe_detail_2.winfo_ismapped():
                 self.eingabe_detail_2.pack_forget()
-                
+
     def on_filter_detail_change(self):
         """Handle changes in the filter detail selection"""
         # Store the original Entry focus state
         self.store_entry_state()
-        
+
         # Release any existing grabs before opening popover
         try:
             self.grab_release()
         except tk.TclError:
             pass
-            
-        # First call the original open_popover method
+
+        # Restoration and visibility update follow from <<PopoverClosed>>
         self.ms_filter_detail.open_popover()
-        
-        # Schedule multiple restoration attempts
-        self.after(200, self.update_detail_entries_visibility)
-        self.after(300, self.restore_entry_responsiveness)
-        self.after(500, self.force_entry_responsiveness)  # Additional safety net
-    
+
     def store_entry_state(self):
-        """Store the current state of Entry widgets before popover operations"""
-        try:
-            self._entry_states = {}
-            if hasattr(self, 'eingabe_detail_entry') and self.eingabe_detail_entry.winfo_exists():
-                self._entry_states['entry1'] = {
-                    'value': self.eingabe_detail.get(),
-                    'cursor_pos': self.eingabe_detail_entry.index(tk.INSERT) if hasattr(self.eingabe_detail_entry, 'index') else 0
-                }
-            if hasattr(self, 'eingabe_detail_2') and self.eingabe_detail_2.winfo_exists():
-                self._entry_states['entry2'] = {
-                    'value': self.eingabe_detail_2.get(),
-                    'cursor_pos': self.eingabe_detail_2.index(tk.INSERT) if hasattr(self.eingabe_detail_2, 'index') else 0
-                }
-        except (tk.TclError, AttributeError):
-            self._entry_states = {}
-    
+        """Store the cursor positions of the Entry widgets before popover operations"""
+        self._entry_states = {}
+        for entry in self._registered_entries():
+            try:
+                self._entry_states[str(entry)] = entry.index(tk.INSERT)
+            except tk.TclError:
+                pass
+
     def restore_entry_responsiveness(self):
         """Restore Entry widget responsiveness after popover operations"""
+        # Force release any remaining grabs
         try:
-            # Force release any remaining grabs
+            self.grab_release()
+        except tk.TclError:
+            pass
+
+        # Bindings live on the bind tag and cannot get lost - only the state is restored
+        entry_states = getattr(self, '_entry_states', {})
+        for entry in self._registered_entries():
             try:
-                self.grab_release()
+                entry.config(state='normal')
+                if str(entry) in entry_states:
+                    entry.icursor(entry_states[str(entry)])
             except tk.TclError:
                 pass
-                
-            # Restore Entry widget states and bindings
-            if hasattr(self, 'eingabe_detail_entry') and self.eingabe_detail_entry.winfo_exists():
-                # Ensure the widget is properly configured
-                self.eingabe_detail_entry.config(state='normal')
-                
-                # Rebind all necessary events
-                self.eingabe_detail_entry.bind("<Button-1>", self.on_entry_click)
-                self.eingabe_detail_entry.bind("<FocusIn>", self.on_entry_focus)
-                self.eingabe_detail_entry.bind("<KeyPress>", lambda e: self.ensure_entry_focus(e))
-                
-                # Restore cursor position if available
-                if hasattr(self, '_entry_states') and 'entry1' in self._entry_states:
-                    try:
-                        self.eingabe_detail_entry.icursor(self._entry_states['entry1']['cursor_pos'])
-                    except (tk.TclError, KeyError):
-                        pass
-                
-                # Force widget update
-                self.eingabe_detail_entry.update_idletasks()
-                
-            if hasattr(self, 'eingabe_detail_2') and self.eingabe_detail_2.winfo_exists():
-                self.eingabe_detail_2.config(state='normal')
-                
-                # Rebind all necessary events
-                self.eingabe_detail_2.bind("<Button-1>", self.on_entry_click)
-                self.eingabe_detail_2.bind("<FocusIn>", self.on_entry_focus)
-                self.eingabe_detail_2.bind("<KeyPress>", lambda e: self.ensure_entry_focus(e))
-                
-                # Restore cursor position if available
-                if hasattr(self, '_entry_states') and 'entry2' in self._entry_states:
-                    try:
-                        self.eingabe_detail_2.icursor(self._entry_states['entry2']['cursor_pos'])
-                    except (tk.TclError, KeyError):
-                        pass
-                        
-                self.eingabe_detail_2.update_idletasks()
-            
-            # Clear stored state
-            if hasattr(self, '_entry_states'):
-                delattr(self, '_entry_states')
-                
-        except (tk.TclError, AttributeError):
-            pass
-    
-    def _setup_popover_callbacks(self):
-        """Setup callbacks to restore Entry responsiveness when popover closes"""
-        # Store original close methods
-        original_close = self.ms_filter_detail._close
-        original_apply_and_close = self.ms_filter_detail._apply_and_close
-        
-        def enhanced_close():
-            original_close()
-            # Schedule Entry restoration after popover closes
-            self.after(50, self.restore_entry_responsiveness)
-        
-        def enhanced_apply_and_close():
-            original_apply_and_close()
-            # Schedule Entry restoration and visibility update
-            self.after(50, self.restore_entry_responsiveness)
-            self.after(100, self.update_detail_entries_visibility)
-        
-        # Replace the methods
-        self.ms_filter_detail._close = enhanced_close
-        self.ms_filter_detail._apply_and_close = enhanced_apply_and_close
-    
+        self._entry_states = {}
+
     def force_entry_responsiveness(self):
         """Manually force Entry widgets to become responsive again"""
         try:
@@ -217,7 +197,7 @@ class ResponsivenessMixin:
                 self.grab_release()
             except tk.TclError:
                 pass
-            
+
             # Check for any existing toplevels with grabs and release them
             for child in self.winfo_children():
                 if isinstance(child, tk.Toplevel):
@@ -225,44 +205,28 @@ class ResponsivenessMixin:
                         child.grab_release()
                     except tk.TclError:
                         pass
-            
-            # Force Entry widgets to be responsive
-            if hasattr(self, 'eingabe_detail_entry') and self.eingabe_detail_entry.winfo_exists():
-                self.eingabe_detail_entry.config(state='normal')
-                self.eingabe_detail_entry.focus_force()
-                # Rebind events
-                self.eingabe_detail_entry.bind("<Button-1>", self.on_entry_click)
-                self.eingabe_detail_entry.bind("<FocusIn>", self.on_entry_focus)
-                self.eingabe_detail_entry.bind("<KeyPress>", lambda e: self.ensure_entry_focus(e))
-                
-            if hasattr(self, 'eingabe_detail_2') and self.eingabe_detail_2.winfo_exists():
-                self.eingabe_detail_2.config(state='normal')
-                # Rebind events
-                self.eingabe_detail_2.bind("<Button-1>", self.on_entry_click)
-                self.eingabe_detail_2.bind("<FocusIn>", self.on_entry_focus)
-                self.eingabe_detail_2.bind("<KeyPress>", lambda e: self.ensure_entry_focus(e))
-            
+
+            # Force Entry widgets to be responsive (and re-attach a lost bind tag)
+            for entry in self._registered_entries():
+                entry.config(state='normal')
+                self.register_entry(entry)
+
             print("Entry responsiveness restored!")
-            
+
         except Exception as e:
             print(f"Error restoring Entry responsiveness: {e}")
-    
+
     def restore_entry_focus(self):
         """Restore focus capabilities to Entry widgets after other operations"""
         try:
             # Ensure Entry widgets are properly enabled and can receive focus
-            if hasattr(self, 'eingabe_detail_entry') and self.eingabe_detail_entry.winfo_exists():
-                self.eingabe_detail_entry.config(state='normal')
-                # Force focus update
-                self.eingabe_detail_entry.update_idletasks()
-                
-            if hasattr(self, 'eingabe_detail_2') and self.eingabe_detail_2.winfo_exists():
-                self.eingabe_detail_2.config(state='normal')
-                self.eingabe_detail_2.update_idletasks()
-                
+            for entry in self._registered_entries():
+                entry.config(state='normal')
+
             # Update entries visibility based on current selection
-            self.update_detail_entries_visibility()
-            
+            if hasattr(self, 'ms_filter_detail'):
+                self.update_detail_entries_visibility()
+
         except tk.TclError:
             # Handle case where widgets have been destroyed
             pass
@@ -0,0 +1,254 @@
+"""
+GUI Results Tabs Module
+Tabbed results area: every result opens in its own notebook tab and keeps its data.
+
+A tab holds a view description (the arguments display_treeview_in_frame /
+display_plot_in_frame got) and the result it shows. Memory is bounded by
+RESULTS_MEMORY_BUDGET_MB, counting the tab results, the rendered views, the cached
+plot models and the results of the history cache (a result shared by a tab and
+the history counts once). When they exceed it, inactive tabs first drop their
+rendered widgets (Treeview items, plot images/canvases), least recently used first,
+and are rebuilt from the cached result when selected again. Then history results
+are evicted, and only if that is not enough, least recently used inactive tabs
+are closed.
+Cached plot models of a result are dropped with the last rendered view using it
+(closed, released or replaced tab).
+"""
+
+from collections import OrderedDict
+from tkinter import ttk
+
+from config import RESULTS_MEMORY_BUDGET_MB, RESULTS_MAX_TABS, PLOT_FIGSIZE, PLOT_DPI
+from plotting.plot_model import clear_plot_model_cache, plot_model_cache_nbytes
+
+
+MB = 1024 * 1024
+
+# Rough memory costs of results and rendered views, used for the budget (bytes)
+LIST_CELL_BYTES = 60        # Python object per value of a row-list result
+TREEVIEW_CELL_BYTES = 150   # Tcl string per Treeview cell
+PLOT_VIEW_BYTES = int(PLOT_FIGSIZE[0] * PLOT_FIGSIZE[1] * PLOT_DPI ** 2 * 4 * 2)  # image/canvas + figure
+
+
+def estimate_result_bytes(columns, data):
+    """Memory held by a result (Arrow buffers of a ResultSet, estimate for row lists)."""
+    if hasattr(data, "nbytes"):
+        return data.nbytes
+    return len(data) * len(columns) * LIST_CELL_BYTES
+
+
+def estimate_view_bytes(view):
+    """Memory held by the rendered widgets of a view."""
+    if view["type"] == "treeview":
+        return len(view["data"]) * len(view["columns"]) * TREEVIEW_CELL_BYTES
+    return PLOT_VIEW_BYTES
+
+
+class ResultTabs:
+    """Notebook of result tabs with an LRU memory budget."""
+
+    def __init__(self, container, render_view, empty_widget=None, result_cache=None, on_cache_evicted=None):
+        """
+        Args:
+            container: Frame the notebook is packed into
+            render_view (callable): render_view(frame, view) builds a view's widgets in frame
+            empty_widget: Placeholder shown until the first result (destroyed then)
+            result_cache: History ResultCache of (columns, result, result_id), counted in the budget
+            on_cache_evicted (callable): Called after the budget evicted history results
+        """
+        self.container = container
+        self.render_view = render_view
+        self.empty_widget = empty_widget
+        self.result_cache = result_cache
+        self.on_cache_evicted = on_cache_evicted
+        self.notebook = None
+
+        # Tab frame path -> tab dict, least recently used first
+        self._tabs = OrderedDict()
+        # tab_key -> tab frame path (tabs whose content is replaced, e.g. preview -> exact)
+        self._keys = {}
+        self._counter = 0
+
+    # ----------------- Public API -----------------
+
+    def show(self, view, label, tab_key=None):
+        """
+        Show a view in the tab of tab_key (replacing its content) or in a new tab.
+
+        Args:
+            view (dict): View description ('type': 'treeview' or 'plot', 'columns', 'data', ...)
+            label (str): Tab title
+            tab_key: Key of a tab to reuse (None = always a new tab)
+        """
+        self._ensure_notebook()
+        tab = self._tabs.get(self._keys.get(tab_key)) if tab_key is not None else None
+        if tab is None:
+            tab = self._add_tab(tab_key)
+
+        old_view = tab["view"]
+        tab["view"] = view
+        if old_view is not None:
+            self._drop_plot_models(old_view)
+        tab["rendered"] = False
+        self.notebook.tab(tab["frame"], text=f"#{tab['number']} {label}")
+
+        # Selecting renders via <<NotebookTabChanged>>; an already active tab is rendered here
+        self.notebook.select(tab["frame"])
+        if not tab["rendered"]:
+            self._render(tab)
+        self._touch(tab)
+        self._enforce_budget()
+
+    def active_view(self):
+        """View of the selected tab (None without results)."""
+        tab = self._active_tab()
+        return tab["view"] if tab else None
+
+    def close_tab(self, tab=None):
+        """Close a tab (default: the selected one) and release its result."""
+        tab = tab or self._active_tab()
+        if tab is None:
+            return
+        path = str(tab["frame"])
+        self._tabs.pop(path, None)
+        if tab["key"] is not None and self._keys.get(tab["key"]) == path:
+            del self._keys[tab["key"]]
+        self.notebook.forget(tab["frame"])
+        tab["frame"].destroy()
+        if tab["view"] is not None:
+            self._drop_plot_models(tab["view"])
+
+    def memory_usage(self):
+        """
+        Estimated result memory of the tabs, the history cache and the plot models.
+
+        Returns:
+            tuple: (result bytes - shared results counted once, rendered view bytes, plot model bytes)
+        """
+        results = {}
+        view_bytes = 0
+        for tab in self._tabs.values():
+            view = tab["view"]
+            results[id(view["data"])] = estimate_result_bytes(view["columns"], view["data"])
+            view_bytes += tab["view_bytes"]
+        if self.result_cache is not None:
+            for columns, data, _ in self.result_cache.values():
+                results[id(data)] = estimate_result_bytes(columns, data)
+        return sum(results.values()), view_bytes, plot_model_cache_nbytes()
+
+    # ----------------- Intern -----------------
+
+    def _ensure_notebook(self):
+        if self.notebook is not None:
+            return
+        if self.empty_widget is not None:
+            self.empty_widget.destroy()
+            self.empty_widget = None
+        self.notebook = ttk.Notebook(self.container)
+        self.notebook.pack(fill="both", expand=True)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        # Middle click closes a tab
+        self.notebook.bind("<Button-2>", self._on_middle_click)
+
+    def _add_tab(self, tab_key):
+        self._counter += 1
+        frame = ttk.Frame(self.notebook)
+        tab = {"frame": frame, "key": tab_key, "number": self._counter,
+               "view": None, "rendered": False, "view_bytes": 0}
+        self._tabs[str(frame)] = tab
+        if tab_key is not None:
+            self._keys[tab_key] = str(frame)
+        self.notebook.add(frame, text=f"#{self._counter}")
+        return tab
+
+    def _active_tab(self):
+        if self.notebook is None or not self.notebook.tabs():
+            return None
+        return self._tabs.get(self.notebook.select())
+
+    def _touch(self, tab):
+        self._tabs.move_to_end(str(tab["frame"]))
+
+    def _clear(self, tab):
+        for widget in tab["frame"].winfo_children():
+            widget.destroy()
+
+    def _render(self, tab):
+        self._clear(tab)
+        self.render_view(tab["frame"], tab["view"])
+        tab["rendered"] = True
+        tab["view_bytes"] = estimate_view_bytes(tab["view"])
+
+    def _release(self, tab):
+        """Drop the rendered widgets of an inactive tab (rebuilt when it is selected)."""
+        self._clear(tab)
+        tab["rendered"] = False
+        tab["view_bytes"] = 0
+        self._drop_plot_models(tab["view"])
+        ttk.Label(tab["frame"], text="Released to stay within the memory budget - rebuilding…",
+                  font=("Arial", 10, "italic"), foreground="#7f8c8d").pack(expand=True)
+        print(f"DEBUG: results tab #{tab['number']} released (memory budget)")
+
+    def _drop_plot_models(self, view):
+        """Drop the cached plot models of a view's result unless a rendered tab still shows it."""
+        result_id = view.get("result_id")
+        if result_id is None:
+            return
+        for tab in self._tabs.values():
+            if tab["rendered"] and tab["view"] is not view and tab["view"].get("result_id") == result_id:
+                return
+        clear_plot_model_cache(result_id)
+
+    def _on_tab_changed(self, event=None):
+        tab = self._active_tab()
+        if tab is None or tab["view"] is None:
+            return
+        self._touch(tab)
+        if not tab["rendered"]:
+            self._render(tab)
+            self._enforce_budget()
+
+    def _on_middle_click(self, event):
+        try:
+            index = self.notebook.index(f"@{event.x},{event.y}")
+        except Exception:
+            return
+        self.close_tab(self._tabs.get(self.notebook.tabs()[index]))
+
+    def _enforce_budget(self):
+        """
+        Release rendered views, evict history results, then close tabs
+        (LRU, never the active one) until within budget.
+        """
+        active = self._active_tab()
+        budget = RESULTS_MEMORY_BUDGET_MB * MB
+
+        # Tab limit: close the least recently used
+        for tab in list(self._tabs.values()):
+            if len(self._tabs) <= RESULTS_MAX_TABS:
+                break
+            if tab is not active:
+                self.close_tab(tab)
+
+        for tab in list(self._tabs.values()):
+            if sum(self.memory_usage()) <= budget:
+                return
+            if tab is not active and tab["rendered"]:
+                self._release(tab)
+
+        evicted = False
+        while sum(self.memory_usage()) > budget and self.result_cache is not None:
+            if not self.result_cache.pop_oldest():
+                break
+            evicted = True
+        if evicted:
+            print("DEBUG: history results evicted (memory budget)")
+            if self.on_cache_evicted is not None:
+                self.on_cache_evicted()
+
+        for tab in list(self._tabs.values()):
+            if sum(self.memory_usage()) <= budget:
+                return
+            if tab is not active:
+                print(f"DEBUG: results tab #{tab['number']} closed (memory budget)")
+                self.close_tab(tab)
@@ -0,0 +1,137 @@
+"""
+GUI Watchdog Module
+Detects stalls of the Tk main thread and logs what it was doing.
+
+A heartbeat after() callback records when the event loop last ran. A monitor
+thread checks the heartbeat; if the loop has not run for longer than the
+threshold, it writes the main thread's Python stack and the active user
+action(s) (see user_action) to the stall log. When the loop runs again, the
+total stall duration is logged.
+"""
+
+import functools
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from config import STALL_THRESHOLD_MS, STALL_HEARTBEAT_MS, STALL_LOG_PATH
+
+
+# Active user actions of the main thread (innermost last), read by the monitor thread
+_active_actions = []
+
+
+def user_action(name):
+    """
+    Decorator: name a method as user action, reported if it stalls the main thread.
+
+    Args:
+        name (str): Action name in the stall log (e.g. "Execute query")
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _active_actions.append(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _active_actions.pop()
+        return wrapper
+    return decorate
+
+
+class StallWatchdog:
+    """Heartbeat + monitor thread measuring the Tk event-loop latency."""
+
+    def __init__(self, root, threshold_ms=STALL_THRESHOLD_MS, heartbeat_ms=STALL_HEARTBEAT_MS,
+                 log_path=STALL_LOG_PATH):
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.log_path = log_path
+
+        # Longest heartbeat delay seen (seconds) and number of logged stalls
+        self.max_latency = 0.0
+        self.stall_count = 0
+
+        self._main_thread_id = None
+        self._last_beat = None
+        self._stall_start = None
+        self._after_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ----------------- Public API -----------------
+
+    def start(self):
+        """Start heartbeat and monitor thread (call from the Tk main thread)."""
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._after_id = self.root.after(self.heartbeat_ms, self._beat)
+        self._thread = threading.Thread(target=self._monitor, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop heartbeat and monitor thread."""
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    # ----------------- Main thread -----------------
+
+    def _beat(self):
+        now = time.monotonic()
+        latency = now - self._last_beat - self.heartbeat_ms / 1000
+        self.max_latency = max(self.max_latency, latency)
+
+        # Stall reported by the monitor thread is over
+        stall_start = self._stall_start
+        if stall_start is not None:
+            self._stall_start = None
+            self._write(f"Stall ended after {(now - stall_start) * 1000:.0f} ms\n")
+
+        self._last_beat = now
+        if not self._stop.is_set():
+            self._after_id = self.root.after(self.heartbeat_ms, self._beat)
+
+    # ----------------- Monitor thread -----------------
+
+    def _monitor(self):
+        check_interval = max(self.threshold / 4, 0.01)
+        while not self._stop.wait(check_interval):
+            last_beat = self._last_beat
+            blocked = time.monotonic() - last_beat - self.heartbeat_ms / 1000
+            if blocked > self.threshold and self._stall_start is None:
+                self._stall_start = last_beat + self.heartbeat_ms / 1000
+                self.stall_count += 1
+                self._report(blocked)
+
+    def _report(self, blocked):
+        """Log the main thread's stack and the active user actions."""
+        actions = list(_active_actions)
+        frame = sys._current_frames().get(self._main_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "  (main thread stack unavailable)\n"
+        action_text = " > ".join(actions) if actions else "(no user action)"
+
+        print(f"DEBUG: UI stall > {blocked * 1000:.0f} ms during {action_text} - see {self.log_path}")
+        self._write(
+            f"\n{'=' * 80}\n"
+            f"{datetime.now().isoformat(timespec='milliseconds')} "
+            f"Main thread blocked for {blocked * 1000:.0f} ms (threshold {self.threshold * 1000:.0f} ms)\n"
+            f"Action: {action_text}\n"
+            f"Main thread stack (most recent call last):\n{stack}"
+        )
+
+    def _write(self, text):
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as log:
+                log.write(text)
+        except OSError as ex:
+            print(f"Stall log not writable: {ex}")
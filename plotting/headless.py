@@ -0,0 +1,107 @@
+# headless.py
+"""
+Headless Rendering Module
+Renders plot models to image files without a Tk window (Agg backend).
+Uses a plain matplotlib Figure, so it is safe to call from worker processes.
+"""
+import io
+from pathlib import Path
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from plotting.style_plot import get_color_palette
+from plotting.plot_renderer import render_plot_model
+
+
+# Output formats supported by the Agg canvas
+SUPPORTED_FORMATS = ("png", "pdf", "svg")
+
+
+def init_headless_worker():
+    """
+    Process pool initializer: force the Agg backend before anything imports pyplot.
+    (apply_plot_style imports pyplot lazily.)
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def make_figure(figsize=(11, 7), dpi=100):
+    """
+    Create a figure with a single axes on an Agg canvas.
+
+    Returns:
+        tuple: (figure, axes)
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    return fig, ax
+
+
+def render_model_to_files(model, output_base, formats=("png",), figsize=(11, 7), dpi=150):
+    """
+    Render a plot model and save it in all requested formats.
+
+    Args:
+        model (dict): Plot model from plotting.plot_model
+        output_base: Output path without extension (e.g. "out/avg_lf_bar")
+        formats: Iterable of file formats ("png", "pdf", "svg")
+        figsize (tuple): Figure size in inches
+        dpi (int): Resolution for raster formats
+
+    Returns:
+        list: Paths of the written files (as strings)
+    """
+    fig, ax = make_figure(figsize)
+    render_plot_model(ax, model, get_color_palette())
+
+    output_base = Path(output_base)
+    output_base.parent.mkdir(parents=True, exist_ok=True)
+
+    written = []
+    for fmt in formats:
+        path = output_base.with_name(f"{output_base.name}.{fmt}")
+        fig.savefig(path, format=fmt, bbox_inches='tight', dpi=dpi)
+        written.append(str(path))
+    return written
+
+
+def render_model_to_png(model, figsize=(8, 5), dpi=100):
+    """
+    Render a plot model to PNG bytes (for a Tk PhotoImage or a worker process).
+
+    Args:
+        model (dict): Plot model from plotting.plot_model
+        figsize (tuple): Figure size in inches
+        dpi (int): Resolution
+
+    Returns:
+        bytes: PNG image
+    """
+    fig, ax = make_figure(figsize, dpi)
+    render_plot_model(ax, model, get_color_palette())
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi)
+    return buffer.getvalue()
+
+
+def render_model_to_file(model, filepath, file_format="png", figsize=(11, 7), dpi=300):
+    """
+    Render a plot model into one file (export of a plot window, runs in the render process).
+
+    Args:
+        model (dict): Plot model from plotting.plot_model
+        filepath: Target path (any extension)
+        file_format (str): "png", "pdf" or "svg"
+        figsize (tuple): Figure size in inches
+        dpi (int): Resolution for raster formats
+
+    Returns:
+        str: Path of the written file
+    """
+    fig, ax = make_figure(figsize)
+    render_plot_model(ax, model, get_color_palette())
+    fig.savefig(filepath, format=file_format, bbox_inches='tight', dpi=dpi)
+    return str(filepath)
@@ -0,0 +1,246 @@
+# pdf_report.py
+"""
+PDF Report Module
+Renders a whole matrix of box plots (analysis type x aggregation metric x split column)
+in parallel worker processes and assembles them into one multi-page PDF.
+
+Workers rasterize their page on an Agg canvas and send back the RGBA pixels,
+the main process only places the images into the PDF (matplotlib PdfPages).
+Rasterized pages render in parallel but are fixed at PAGE_DPI (150 dpi: text and
+lines get blurry when zoomed, files are larger). With vector=True the pages are
+drawn directly into the PDF in the calling process instead - sharp at any zoom,
+smaller for box plots, but not parallel.
+
+Page models are built uncached (build_plot_model): a report's ~84 one-off models
+would otherwise push the GUI's plot models out of the shared model cache.
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+
+from db.dbHandler import execute_query, build_query_filters, build_detail_metric_filter
+from db.db_config import UI_ANALYSIS_MAP, AGGREGATION_METRICS
+from db.result_store import result_dataframe
+from plotting.plot_model import CONFIG_LABEL_COLUMNS, make_plot_options, build_plot_model
+from plotting.headless import init_headless_worker, make_figure
+from plotting.plot_renderer import render_plot_model
+from plotting.style_plot import get_color_palette
+
+
+# Default page size (inches) and raster resolution of the report pages
+PAGE_SIZE = (11, 7)
+PAGE_DPI = 150
+
+
+# ======================== PAGE MATRIX ========================
+
+def build_report_pages(selected_pg=None, selected_cp=None, selected_bpc=None, selected_cf=None,
+                       analysis_types=None, split_columns=None, detail_filter_values=None,
+                       max_boxes=None):
+    """
+    Run one aggregated query per analysis type and build the plot model of every page.
+
+    Args:
+        selected_pg, selected_cp, selected_bpc (list): Configuration filters (empty = all)
+        selected_cf (dict): Cost function filters
+        analysis_types (list): Analysis types ("Loss Factor", ...), default: all
+        split_columns (list): Box plot split columns, default: all configuration parameters
+        detail_filter_values (list): Detail metric filters (see build_detail_metric_filter)
+        max_boxes (int): Maximum number of boxes per page (None = all)
+
+    Returns:
+        list: Pages as dicts with 'title' and 'model'
+    """
+    if analysis_types is None:
+        analysis_types = list(UI_ANALYSIS_MAP.values())
+    if split_columns is None:
+        split_columns = CONFIG_LABEL_COLUMNS
+
+    detail_metric_filter = build_detail_metric_filter(detail_filter_values)
+    config_params = {'pg': selected_pg, 'cp': selected_cp, 'bpc': selected_bpc, 'cf': selected_cf, 'qg': []}
+    # Analysis type -> UI label used as key in AGGREGATION_METRICS
+    ui_labels = {analysis: label for label, analysis in UI_ANALYSIS_MAP.items()}
+
+    pages = []
+    for analysis_type in analysis_types:
+        filters = build_query_filters(
+            selected_pg, selected_cp, selected_bpc, selected_cf, [],
+            analysis_type=analysis_type,
+            detail_metric_filter=detail_metric_filter
+        )
+        columns, data = execute_query(2, filters=filters)
+        # One DataFrame per query, shared by all pages of this analysis type
+        df = result_dataframe(columns, data)
+
+        for agg_metric in AGGREGATION_METRICS[ui_labels[analysis_type]]:
+            for split_col in split_columns:
+                options = make_plot_options(
+                    "Box Plot",
+                    x_axis="Configuration Parameters",
+                    agg_metric=agg_metric,
+                    plot_number=max_boxes,
+                    config_params=config_params,
+                    box_plot_split=split_col
+                )
+                pages.append({
+                    "title": f"{analysis_type} / {agg_metric} / {split_col}",
+                    "model": build_plot_model(df, options),
+                })
+    return pages
+
+
+# ======================== RENDERING ========================
+
+def render_page(job):
+    """
+    Worker entry point: rasterize one plot model.
+
+    Args:
+        job (tuple): (model, figsize, dpi)
+
+    Returns:
+        tuple: (RGBA pixel array, render time in seconds)
+    """
+    model, figsize, dpi = job
+    start = time.perf_counter()
+    fig, ax = make_figure(figsize, dpi=dpi)
+    render_plot_model(ax, model, get_color_palette())
+    fig.canvas.draw()
+    pixels = np.asarray(fig.canvas.buffer_rgba()).copy()
+    return pixels, time.perf_counter() - start
+
+
+def _add_page(pdf, pixels, dpi):
+    """Place a rasterized page into the PDF at its native resolution."""
+    height, width = pixels.shape[:2]
+    page = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    page.figimage(pixels, xo=0, yo=0, origin='upper')
+    pdf.savefig(page, dpi=dpi)
+
+
+def write_vector_pdf(pages, output_path, figsize=PAGE_SIZE, title="Ingredients Visualizer Report",
+                     on_page=None):
+    """
+    Draw all pages as vector graphics into one PDF (in this process, page by page).
+
+    Args:
+        pages (list): Pages from build_report_pages()
+        output_path: Path of the PDF file
+        figsize (tuple): Page size in inches
+        title (str): PDF title metadata
+        on_page (callable): on_page(number, total) after each page (may raise to abort)
+
+    Returns:
+        list: Per-page timing dicts (see assemble_pdf; 'render' includes writing the page)
+    """
+    timings = []
+    with PdfPages(output_path, metadata={"Title": title}) as pdf:
+        for number, page in enumerate(pages, start=1):
+            start = time.perf_counter()
+            fig, ax = make_figure(figsize)
+            render_plot_model(ax, page["model"], get_color_palette())
+            pdf.savefig(fig)
+            render_time = time.perf_counter() - start
+            timings.append({
+                "page": number,
+                "title": page["title"],
+                "render": render_time,
+                "assemble": 0.0,
+                "total": render_time,
+            })
+            if on_page is not None:
+                on_page(number, len(pages))
+    return timings
+
+
+def assemble_pdf(pages, output_path, workers=1, figsize=PAGE_SIZE, dpi=PAGE_DPI, title="Ingredients Visualizer Report",
+                 on_page=None):
+    """
+    Render all pages (in parallel if workers > 1) and write them into one PDF in page order.
+    Pages are rasterized at dpi, see write_vector_pdf() for vector pages.
+
+    Args:
+        pages (list): Pages from build_report_pages()
+        output_path: Path of the PDF file
+        workers (int): Number of render processes
+        figsize (tuple): Page size in inches
+        dpi (int): Raster resolution
+        on_page (callable): on_page(number, total) after each page (may raise to abort,
+                            pages not yet started are cancelled then)
+
+    Returns:
+        list: Per-page timing dicts with 'page', 'title', 'render', 'assemble', 'total' (seconds)
+    """
+    jobs = [(page["model"], figsize, dpi) for page in pages]
+    timings = []
+
+    pool = None
+    if workers > 1 and len(jobs) > 1:
+        # "spawn" keeps workers independent of the parent's DuckDB connection and Tk state
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_headless_worker)
+        results = pool.map(render_page, jobs)
+    else:
+        # Figure + Agg canvas work in-process without switching the pyplot backend
+        results = map(render_page, jobs)
+
+    try:
+        with PdfPages(output_path, metadata={"Title": title}) as pdf:
+            for number, (page, (pixels, render_time)) in enumerate(zip(pages, results), start=1):
+                start = time.perf_counter()
+                _add_page(pdf, pixels, dpi)
+                assemble_time = time.perf_counter() - start
+                timings.append({
+                    "page": number,
+                    "title": page["title"],
+                    "render": render_time,
+                    "assemble": assemble_time,
+                    "total": render_time + assemble_time,
+                })
+                if on_page is not None:
+                    on_page(number, len(pages))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return timings
+
+
+def format_timings(timings):
+    """
+    Format per-page timings as a text table.
+
+    Returns:
+        str: One line per page plus a total line
+    """
+    lines = [f"{'Page':>4}  {'Render':>8}  {'Assemble':>8}  {'Total':>8}  Title"]
+    for t in timings:
+        lines.append(f"{t['page']:>4}  {t['render']:>7.2f}s  {t['assemble']:>7.2f}s  {t['total']:>7.2f}s  {t['title']}")
+    total = sum(t['total'] for t in timings)
+    lines.append(f"{len(timings)} pages, {total:.2f}s page time")
+    return "\n".join(lines)
+
+
+def generate_pdf_report(output_path, workers=1, figsize=PAGE_SIZE, dpi=PAGE_DPI, vector=False,
+                        on_page=None, **selections):
+    """
+    Build the page matrix and write the multi-page PDF.
+
+    Args:
+        output_path: Path of the PDF file
+        workers (int): Number of render processes (rasterized pages only)
+        vector (bool): Vector pages drawn in this process instead of rasterized pages at dpi
+        on_page (callable): on_page(number, total) after each page (may raise to abort)
+        **selections: Keyword arguments for build_report_pages()
+
+    Returns:
+        list: Per-page timings (see assemble_pdf)
+    """
+    pages = build_report_pages(**selections)
+    if vector:
+        return write_vector_pdf(pages, output_path, figsize=figsize, on_page=on_page)
+    return assemble_pdf(pages, output_path, workers=workers, figsize=figsize, dpi=dpi, on_page=on_page)
@@ -0,0 +1,770 @@
+# plot_model.py
+"""
+Plot Model Module
+Turns a query result plus plot options into a compact plot description
+(arrays, labels, scale decision, statistics) without touching matplotlib.
+
+The renderer in plotting.plot_renderer draws these models. Keeping the data
+preparation separate means it can be cached per result and run headless.
+Models are memoized by (result id, plot options).
+"""
+import itertools
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    DENSITY_SCATTER_THRESHOLD, DENSITY_SCATTER_BINS, SCATTER_MAX_TICK_LABELS,
+    LINE_MAX_POINTS, LINE_MAX_VALUE_LABELS
+)
+from db.db_config import METRIC_LABELS
+from db.result_store import result_dataframe
+from utils import build_config_params_label
+
+
+# ======================== CONSTANTS ========================
+
+# Configuration parameter columns shown in multi-line x-axis labels
+CONFIG_LABEL_COLUMNS = ['pg_name', 'cp_name', 'bpc_name', 'bpi_cf_join_bundle',
+                        'bpi_cf_mat', 'bpi_cf_concat', 'wp_cf_host_id']
+
+# Short names used inside the multi-line x-axis labels
+CONFIG_LABEL_DISPLAY = {
+    'source_db': 'Run',
+    'ps_qg': 'Query',
+    'pg_name': 'PG',
+    'cp_name': 'CP',
+    'bpc_name': 'BP',
+    'bpi_cf_join_bundle': 'Join Bundle',
+    'bpi_cf_mat': 'Mat',
+    'bpi_cf_concat': 'Concat',
+    'wp_cf_host_id': 'Host ID',
+}
+
+# X-axis selections that use configuration parameter labels
+CONFIG_X_AXES = ("Configuration Parameters", "Query Graph: ps_qg")
+
+# Split columns where missing values get their own "None" box
+INCLUDE_NONE_SPLIT_COLUMNS = ['bpi_cf_mat', 'bpi_cf_concat', 'bpi_cf_join_bundle']
+
+SUPPORTED_PLOT_TYPES = ["Bar Chart", "Box Plot", "Scatter Plot", "Graph"]
+
+# Plot types that plot all rows for plot_number 0 (reduced in the model, see build_plot_model)
+ALL_POINTS_PLOT_TYPES = ["Scatter Plot", "Graph"]
+
+# Number of plot models kept in memory
+MODEL_CACHE_SIZE = 32
+
+
+# ======================== HELPER FUNCTIONS ========================
+
+def should_use_log_scale(y_col):
+    """
+    Determine if logarithmic scale should be used based on the metric column.
+    Q-Error and P-Error metrics can have extremely large values (e.g., 1e+38)
+    which require logarithmic scaling for proper visualization.
+
+    Args:
+        y_col (str): The column name for the y-axis metric
+
+    Returns:
+        bool: True if log scale should be used, False otherwise
+    """
+    if y_col is None:
+        return False
+    y_col_lower = y_col.lower()
+    return 'qerr' in y_col_lower or 'perr' in y_col_lower
+
+
+def format_value_label(value, use_log_scale=False):
+    """
+    Format a value for display on a plot.
+    Uses scientific notation for very large numbers.
+
+    Args:
+        value: The numeric value to format
+        use_log_scale (bool): Whether log scale is being used
+
+    Returns:
+        str: Formatted string representation of the value
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "N/A"
+
+    abs_value = abs(value)
+
+    # Use scientific notation for very large or very small numbers
+    if abs_value >= 1e6 or (abs_value > 0 and abs_value < 0.01):
+        return f'{value:.2e}'
+    else:
+        return f'{value:.2f}'
+
+
+def build_config_labels(df, include_query=False, na_label="None"):
+    """
+    Build one multi-line configuration label per row of the DataFrame.
+    Vectorized over columns instead of iterating rows.
+
+    Args:
+        df: DataFrame with configuration parameter columns
+        include_query (bool): Put the query graph (ps_qg) on the first line
+        na_label (str): Text for missing values (NaN, None and pd.NA of Arrow columns alike)
+
+    Returns:
+        list: One label string per row
+    """
+    # Multi-database results: the run comes first
+    config_cols = ['source_db'] + (['ps_qg'] if include_query else []) + CONFIG_LABEL_COLUMNS
+
+    label = None
+    for col in config_cols:
+        if col not in df.columns:
+            continue
+        values = df[col].astype(object)
+        values = values.where(values.notna(), na_label)
+        part = f"{CONFIG_LABEL_DISPLAY[col]}: " + values.map(str)
+        label = part if label is None else label + "\n" + part
+
+    if label is None:
+        return [""] * len(df)
+    return label.tolist()
+
+
+def _to_float_array(series):
+    """Convert a metric column to a float array (None becomes NaN)."""
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def _has_positive(values):
+    """True if any finite value is > 0 (log scale is only applied then)."""
+    with np.errstate(invalid='ignore'):
+        return bool(np.any(values > 0))
+
+
+def _x_axis_spec(df, x_col, fallback_label):
+    """
+    Resolve x positions and the axis label for scatter models
+    (configuration axes use the row position, their tick labels are built separately).
+
+    Returns:
+        tuple: (x_values, x_axis_label)
+    """
+    if x_col in CONFIG_X_AXES:
+        return np.arange(len(df)), "Configuration Parameters"
+    if x_col and x_col in df.columns:
+        return df[x_col].to_numpy(), x_col
+    return np.arange(len(df)), fallback_label
+
+
+# ======================== MODEL BUILDERS ========================
+
+def build_message_model(title, message):
+    """Model for a plot that only shows a centered message."""
+    return {
+        "kind": "message",
+        "title": title,
+        "message": message,
+    }
+
+
+def build_bar_model(df, x_col, y_col, title, y_label):
+    """
+    Build the model for a bar chart.
+
+    Args:
+        df: DataFrame with data (already sorted/limited)
+        x_col: Column name for x-axis (or "Configuration Parameters" for special handling)
+        y_col: Column name for y-axis values
+        title: Chart title
+        y_label: Y-axis label
+
+    Returns:
+        dict: Bar chart model
+    """
+    if x_col in CONFIG_X_AXES:
+        x_labels = build_config_labels(df, include_query=(x_col == "Query Graph: ps_qg"))
+        x_axis_label = "Configuration Parameters"
+    elif x_col and x_col in df.columns:
+        x_labels = df[x_col].astype(str).tolist()
+        x_axis_label = x_col
+    else:
+        x_labels = [f"#{i+1}" for i in range(len(df))]
+        x_axis_label = "Rank"
+
+    y_values = _to_float_array(df[y_col])
+    use_log = should_use_log_scale(y_col)
+
+    return {
+        "kind": "bar",
+        "title": title,
+        "x_label": x_axis_label,
+        "y_label": y_label,
+        "x_positions": np.arange(len(df)),
+        "x_labels": x_labels,
+        "config_labels": x_col in CONFIG_X_AXES,
+        "y_values": y_values,
+        "value_labels": [format_value_label(v, use_log) for v in y_values],
+        "use_log": use_log and _has_positive(y_values),
+    }
+
+
+def build_box_model(df, x_col, y_col, title, y_label):
+    """
+    Build the model for the legacy multi-box plot (one box per row or per x_col group).
+
+    Returns:
+        dict: Box plot model
+    """
+    if x_col in CONFIG_X_AXES:
+        labels = build_config_labels(df, include_query=(x_col == "Query Graph: ps_qg"))
+        groups = [np.array([v]) for v in _to_float_array(df[y_col])]
+        x_axis_label = "Configuration Parameters"
+        small_ticks = True
+    elif x_col and x_col in df.columns:
+        grouped = df.groupby(x_col)[y_col]
+        labels = [str(k) for k in grouped.groups.keys()]
+        groups = [_to_float_array(g) for _, g in grouped]
+        x_axis_label = x_col
+        small_ticks = False
+    else:
+        labels = ['All Data']
+        groups = [_to_float_array(df[y_col])]
+        x_axis_label = ""
+        small_ticks = False
+
+    all_values = _to_float_array(df[y_col])
+    use_log = should_use_log_scale(y_col)
+
+    return {
+        "kind": "box",
+        "title": title,
+        "x_label": x_axis_label,
+        "y_label": y_label,
+        "labels": labels,
+        "groups": groups,
+        "small_ticks": small_ticks,
+        "use_log": use_log and _has_positive(all_values),
+    }
+
+
+def build_box_single_model(df, y_col, title, y_label, x_label):
+    """
+    Build the model for a single box plot using ALL values from the metric column.
+
+    Args:
+        df: DataFrame with ALL data (not filtered)
+        y_col: Column name for the metric values (e.g., 'avg_lf', 'lf')
+        title: Chart title
+        y_label: Y-axis label (e.g., "Average Loss Factor")
+        x_label: X-axis tick label (configuration parameters string)
+
+    Returns:
+        dict: Single box plot model (message model if there is no data)
+    """
+    values = _to_float_array(df[y_col])
+    values = values[~np.isnan(values)]
+
+    if len(values) == 0:
+        return build_message_model(title, "No data available")
+
+    use_log = should_use_log_scale(y_col)
+
+    # Calculate statistics
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    mean = values.mean()
+    iqr = q3 - q1
+
+    stats_text = (f"n={len(values)}\n"
+                  f"Median={format_value_label(median, use_log)}\n"
+                  f"Mean={format_value_label(mean, use_log)}\n"
+                  f"Q1={format_value_label(q1, use_log)}\n"
+                  f"Q3={format_value_label(q3, use_log)}\n"
+                  f"IQR={format_value_label(iqr, use_log)}")
+
+    return {
+        "kind": "box_single",
+        "title": title,
+        "x_label": "Configuration",
+        "y_label": y_label,
+        "tick_label": x_label,
+        "values": values,
+        "stats": {"n": len(values), "median": median, "mean": mean, "q1": q1, "q3": q3, "iqr": iqr},
+        "stats_text": stats_text,
+        "use_log": use_log and _has_positive(values),
+    }
+
+
+def build_box_split_model(df, y_col, split_col, title, y_label, max_boxes=None):
+    """
+    Build the model for a box plot split by a categorical column.
+    Each unique value in split_col creates a separate box.
+
+    Args:
+        df: DataFrame with ALL data
+        y_col: Column name for the metric values (e.g., 'avg_lf', 'lf')
+        split_col: Column name to split/group by (e.g., 'pg_name', 'cp_name')
+        title: Chart title
+        y_label: Y-axis label (e.g., "Average Loss Factor")
+        max_boxes: Maximum number of boxes to display (None = show all)
+
+    Returns:
+        dict: Split box plot model (message model if there is no data)
+    """
+    # Mat, Concat, Join Bundle keep missing values as their own "None" group
+    include_none = split_col in INCLUDE_NONE_SPLIT_COLUMNS
+    codes, uniques = pd.factorize(df[split_col], use_na_sentinel=not include_none)
+
+    if len(uniques) == 0:
+        return build_message_model(title, f"No data available for splitting by '{split_col}'")
+
+    # Group order: sorted by string value, None at the end
+    group_order = sorted(range(len(uniques)),
+                         key=lambda i: (pd.isna(uniques[i]), str(uniques[i])))
+
+    # One stable sort of the row codes gives every group's rows in original order
+    row_order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[row_order], np.arange(len(uniques) + 1))
+
+    y_values = _to_float_array(df[y_col])
+    labels_all = build_config_labels(df)
+
+    data_groups = []
+    labels = []
+    split_values = []
+    for code in group_order:
+        rows = row_order[bounds[code]:bounds[code + 1]]
+        group_data = y_values[rows]
+        group_data = group_data[~np.isnan(group_data)]
+        if len(group_data) == 0:
+            continue  # Only include groups with data
+
+        value = uniques[code]
+        data_groups.append(group_data)
+        split_values.append("None" if pd.isna(value) else str(value))
+        # Config values are the same for the group, use its first row
+        labels.append(labels_all[rows[0]])
+
+    if not data_groups:
+        return build_message_model(title, "No data available")
+
+    # Apply max_boxes limit if specified
+    if max_boxes is not None and max_boxes > 0 and len(data_groups) > max_boxes:
+        data_groups = data_groups[:max_boxes]
+        labels = labels[:max_boxes]
+        split_values = split_values[:max_boxes]
+
+    use_log = should_use_log_scale(y_col)
+
+    stats_lines = []
+    for split_val, data in zip(split_values, data_groups):
+        stats_lines.append(f"{split_val}: n={len(data)}, "
+                           f"Med={format_value_label(np.median(data), use_log)}, "
+                           f"Mean={format_value_label(data.mean(), use_log)}")
+
+    return {
+        "kind": "box_split",
+        "title": title,
+        "x_label": "Configuration Parameters",
+        "y_label": y_label,
+        "labels": labels,
+        "groups": data_groups,
+        "split_values": split_values,
+        # Only show stats box if not too many groups
+        "stats_text": '\n'.join(stats_lines) if len(stats_lines) <= 6 else None,
+        "use_log": use_log and _has_positive(y_values),
+    }
+
+
+def build_scatter_model(df, x_col, y_col, title, y_label):
+    """
+    Build the model for a scatter plot.
+    Above DENSITY_SCATTER_THRESHOLD points a density scatter model is built instead.
+    Configuration tick labels are built for at most SCATTER_MAX_TICK_LABELS points
+    (minimum, maximum and evenly spaced ones), so rendering cost stays bounded.
+
+    Returns:
+        dict: Scatter plot model
+    """
+    x_values, x_axis_label = _x_axis_spec(df, x_col, "Index")
+    y_values = _to_float_array(df[y_col])
+    use_log = should_use_log_scale(y_col)
+
+    if len(y_values) > DENSITY_SCATTER_THRESHOLD:
+        return build_density_scatter_model(x_values, y_values, title, x_axis_label, y_label, use_log)
+
+    x_labels = tick_positions = None
+    if x_col in CONFIG_X_AXES:
+        label_idx = pick_label_indices(np.arange(len(y_values)), y_values, SCATTER_MAX_TICK_LABELS)
+        x_labels = build_config_labels(df.iloc[label_idx], include_query=(x_col == "Query Graph: ps_qg"))
+        tick_positions = x_values[label_idx]
+
+    return {
+        "kind": "scatter",
+        "title": title,
+        "x_label": x_axis_label,
+        "y_label": y_label,
+        "x_values": x_values,
+        "x_labels": x_labels,
+        "tick_positions": tick_positions,
+        "y_values": y_values,
+        "use_log": use_log and _has_positive(y_values),
+    }
+
+
+def build_density_scatter_model(x_values, y_values, title, x_label, y_label, use_log, bins=None):
+    """
+    Build a density scatter model: points are binned into a 2D histogram that is
+    drawn as one image instead of one marker per point.
+    Q-Error/P-Error values are binned in log10 space; non-positive values are
+    dropped there, just like on a logarithmic axis.
+
+    Args:
+        x_values: X positions (non-numeric values are replaced by their rank)
+        y_values: Metric values as float array
+        title: Chart title
+        x_label: X-axis label
+        y_label: Y-axis label
+        use_log (bool): Bin y in log10 space
+        bins: (x bins, y bins), defaults to DENSITY_SCATTER_BINS
+
+    Returns:
+        dict: Density scatter model (message model if no point is left)
+    """
+    x = np.asarray(x_values)
+    if not np.issubdtype(x.dtype, np.number):
+        x = np.arange(len(y_values))
+    x = x.astype(float)
+    y = np.asarray(y_values, dtype=float)
+
+    keep = np.isfinite(x) & np.isfinite(y)
+    if use_log:
+        keep &= y > 0
+    n_dropped = int(len(y) - np.count_nonzero(keep))
+    x, y = x[keep], y[keep]
+    if use_log:
+        y = np.log10(y)
+
+    if len(y) == 0:
+        return build_message_model(title, "No plottable values (log scale needs values > 0)")
+
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins or DENSITY_SCATTER_BINS)
+
+    stats_text = f"n={len(y)}"
+    if n_dropped:
+        stats_text += f"\nnot shown={n_dropped}"
+
+    return {
+        "kind": "density_scatter",
+        "title": title,
+        "x_label": x_label,
+        "y_label": y_label,
+        # Image rows are y bins, columns are x bins
+        "counts": counts.T.astype(np.float32),
+        "extent": (x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+        "log_y": use_log,
+        "stats_text": stats_text,
+    }
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previously kept point and the next bucket's mean.
+
+    Args:
+        x: Numeric x values (sorted by plotting order)
+        y: Numeric y values
+        n_out (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket boundaries for the n - 2 inner points
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def downsample_line_indices(x, y, max_points, use_log=False):
+    """
+    Pick the indices of a line graph that are drawn.
+    Uses LTTB (in log10 space for log-scaled metrics) and always keeps the
+    exact minimum and maximum.
+
+    Returns:
+        np.ndarray: Sorted indices into x/y
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    y_shape = np.nan_to_num(y, nan=0.0)
+    if use_log:
+        positive = y_shape[y_shape > 0]
+        floor = positive.min() if len(positive) else 1.0
+        y_shape = np.log10(np.clip(y_shape, floor, None))
+
+    keep = lttb_indices(x, y_shape, max_points)
+    if np.any(~np.isnan(y)):
+        keep = np.union1d(keep, [np.nanargmin(y), np.nanargmax(y)])
+    return keep
+
+
+def pick_label_indices(keep, y, max_labels):
+    """
+    Choose a bounded subset of the drawn points that get value labels:
+    the minimum, the maximum and evenly spaced points in between.
+
+    Returns:
+        np.ndarray: Sorted indices into y (a subset of keep)
+    """
+    if len(keep) <= max_labels:
+        return keep
+    spaced = keep[np.linspace(0, len(keep) - 1, max(max_labels - 2, 2)).astype(int)]
+    extrema = [np.nanargmin(y), np.nanargmax(y)] if np.any(~np.isnan(y)) else []
+    return np.union1d(spaced, extrema).astype(int)
+
+
+def build_line_model(df, x_col, y_col, title, y_label):
+    """
+    Build the model for a line graph.
+    More than LINE_MAX_POINTS points are downsampled (LTTB, extrema kept) and at most
+    LINE_MAX_VALUE_LABELS points get value labels, so rendering cost stays bounded.
+
+    Returns:
+        dict: Line graph model
+    """
+    config_x = x_col in CONFIG_X_AXES
+    if config_x:
+        x_all = np.arange(len(df))
+        x_axis_label = "Configuration Parameters"
+    elif x_col and x_col in df.columns:
+        x_all = df[x_col].to_numpy()
+        x_axis_label = x_col
+    else:
+        x_all = np.arange(len(df))
+        x_axis_label = "Rank"
+
+    y_all = _to_float_array(df[y_col])
+    use_log = should_use_log_scale(y_col)
+
+    # LTTB needs numeric x - non-numeric x columns are downsampled by position
+    x_numeric = x_all if np.issubdtype(np.asarray(x_all).dtype, np.number) else np.arange(len(df))
+    keep = downsample_line_indices(x_numeric, y_all, LINE_MAX_POINTS, use_log)
+    label_idx = pick_label_indices(keep, y_all, LINE_MAX_VALUE_LABELS)
+
+    x_labels = None
+    if config_x:
+        x_labels = build_config_labels(df.iloc[label_idx], include_query=(x_col == "Query Graph: ps_qg"))
+
+    stats_text = None
+    if len(keep) < len(y_all):
+        stats_text = f"n={len(y_all)}, shown={len(keep)} (downsampled)"
+
+    return {
+        "kind": "line",
+        "title": title,
+        "x_label": x_axis_label,
+        "y_label": y_label,
+        "x_values": x_all[keep],
+        "y_values": y_all[keep],
+        "tick_positions": x_all[label_idx],
+        "x_labels": x_labels,
+        "label_x": x_all[label_idx],
+        "label_y": y_all[label_idx],
+        "value_labels": [format_value_label(v, use_log) for v in y_all[label_idx]],
+        "downsampled": len(keep) < len(y_all),
+        "stats_text": stats_text,
+        "use_log": use_log and _has_positive(y_all),
+    }
+
+
+# ======================== TOP-LEVEL MODEL ========================
+
+def make_plot_options(plot_type, x_axis=None, agg_metric=None, metric=None, plot_number=5,
+                      config_params=None, box_plot_split=None):
+    """
+    Collect the plot options that determine a plot model.
+
+    Returns:
+        dict: Plot options (also used as the cache key together with the result id)
+    """
+    return {
+        "plot_type": plot_type,
+        "x_axis": x_axis,
+        "agg_metric": agg_metric,
+        "metric": metric,
+        "plot_number": plot_number,
+        "config_params": config_params,
+        "box_plot_split": box_plot_split,
+    }
+
+
+def build_plot_model(df, options):
+    """
+    Build the plot model for a query result DataFrame.
+    Box plots use ALL rows, the other plot types use the top N rows.
+    plot_number 0 plots all rows for the plot types in ALL_POINTS_PLOT_TYPES
+    (sorted like the top N), so large results reach their reduced representation.
+
+    Args:
+        df: DataFrame with the query result
+        options (dict): Plot options from make_plot_options()
+
+    Returns:
+        dict: Plot model for plotting.plot_renderer.render_plot_model()
+    """
+    plot_type = options.get("plot_type")
+    agg_metric = options.get("agg_metric")
+    metric = options.get("metric")
+    plot_number = options.get("plot_number", 5)
+
+    # No aggregation metric selected or not found in data
+    if not agg_metric or agg_metric not in df.columns:
+        if not agg_metric:
+            message = "Please select an Aggregation metric"
+        else:
+            message = f"Metric '{agg_metric}' not found in data\n\n"
+            message += f"Available data columns: {', '.join(list(df.columns)[:10])}...\n"
+            message += f"Data shape: {df.shape}"
+        return build_message_model(f"{plot_type} - No Metric Selected", message)
+
+    # Get readable label from centralized METRIC_LABELS config
+    y_label = METRIC_LABELS.get(agg_metric, agg_metric)
+
+    if plot_type == "Box Plot":
+        title = f"Box Plot: {y_label}"
+        box_plot_split = options.get("box_plot_split")
+        if box_plot_split and box_plot_split in df.columns:
+            return build_box_split_model(df, agg_metric, box_plot_split, title, y_label,
+                                         max_boxes=plot_number)
+        x_axis_label = build_config_params_label(options.get("config_params"))
+        return build_box_single_model(df, agg_metric, title, y_label, x_axis_label)
+
+    if plot_type not in SUPPORTED_PLOT_TYPES:
+        return build_message_model(
+            f"Unsupported Plot Type: {plot_type}",
+            f"Plot type '{plot_type}' is not supported.\n\nAvailable types:\n"
+            "- Bar Chart\n- Box Plot\n- Scatter Plot\n- Graph"
+        )
+
+    # Other plot types - use sorted/filtered data
+    metric_text = metric if metric else "Highest"
+    if not plot_number and plot_type in ALL_POINTS_PLOT_TYPES:
+        # All points - the model reduces them (density scatter, LTTB line)
+        df_sorted = df.dropna(subset=[agg_metric]).sort_values(agg_metric, ascending=(metric == "Lowest"))
+        title = f"All {len(df_sorted):,} {y_label}"
+    else:
+        plot_number = plot_number or 5
+        if metric == "Lowest":
+            df_sorted = df.nsmallest(plot_number, agg_metric)
+        else:
+            df_sorted = df.nlargest(plot_number, agg_metric)
+        # Determine title based on metric selection
+        title = f"{metric_text} {plot_number} {y_label}"
+
+    x_axis = options.get("x_axis")
+    if plot_type == "Bar Chart":
+        return build_bar_model(df_sorted, x_axis, agg_metric, title, y_label)
+    if plot_type == "Scatter Plot":
+        return build_scatter_model(df_sorted, x_axis, agg_metric, title, y_label)
+    return build_line_model(df_sorted, x_axis, agg_metric, title, y_label)
+
+
+# ======================== MODEL CACHE ========================
+
+_result_ids = itertools.count(1)
+_model_cache = OrderedDict()
+
+
+def new_result_id():
+    """Return a fresh id identifying one query result in the model cache."""
+    return next(_result_ids)
+
+
+def _freeze(value):
+    """Turn nested lists/dicts into hashable tuples for cache keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def get_plot_model(result_id, columns, data, options):
+    """
+    Return the plot model for a query result, building it only on a cache miss.
+
+    Args:
+        result_id: Id from new_result_id() (None disables caching)
+        columns (list): Column names from query results
+        data: Query result (ResultSet or list of tuples/lists)
+        options (dict): Plot options from make_plot_options()
+
+    Returns:
+        dict: Plot model
+    """
+    key = None
+    if result_id is not None:
+        key = (result_id, _freeze(options))
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_cache.move_to_end(key)
+            return model
+
+    # ResultSet: shared zero-copy DataFrame view, row list: new DataFrame
+    model = build_plot_model(result_dataframe(columns, data), options)
+
+    if key is not None:
+        _model_cache[key] = model
+        while len(_model_cache) > MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return model
+
+
+def _nbytes(value):
+    """Memory of the arrays in a plot model value (nested lists/dicts, other values ignored)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def plot_model_cache_nbytes():
+    """Memory of the arrays held by the cached plot models (bytes)."""
+    return sum(_nbytes(model) for model in _model_cache.values())
+
+
+def clear_plot_model_cache(result_id=None):
+    """Drop cached models for one result id, or all models if result_id is None."""
+    if result_id is None:
+        _model_cache.clear()
+        return
+    for key in [k for k in _model_cache if k[0] == result_id]:
+        del _model_cache[key]
@@ -0,0 +1,274 @@
+# plot_renderer.py
+"""
+Plot Renderer Module
+Draws plot models from plotting.plot_model onto matplotlib axes.
+Only creates artists - all sorting, grouping, labels and statistics
+are already contained in the model.
+"""
+import numpy as np
+from matplotlib.colors import ListedColormap, LinearSegmentedColormap, LogNorm
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from plotting.style_plot import apply_plot_style
+
+
+# ======================== RENDERERS ========================
+
+def _finish(ax, model):
+    """Apply title, axis labels and the common plot style."""
+    ax.set_xlabel(model.get("x_label", ""), fontsize=12, fontweight='bold')
+    ax.set_ylabel(model.get("y_label", ""), fontsize=12, fontweight='bold')
+    ax.set_title(model["title"], fontsize=14, fontweight='bold', pad=20)
+    apply_plot_style(ax)
+    ax.figure.tight_layout()
+
+
+def render_message(ax, model, colors):
+    """Render a centered message instead of a plot."""
+    ax.text(0.5, 0.5, model["message"], ha='center', va='center', fontsize=12, transform=ax.transAxes)
+    ax.set_title(model["title"], fontsize=14, fontweight='bold', pad=20)
+
+
+def render_bar(ax, model, colors):
+    """Render a bar chart model with custom colors."""
+    x_positions = model["x_positions"]
+    bars = ax.bar(x_positions, model["y_values"], color=colors[:len(x_positions)], width=0.6)
+
+    # Apply logarithmic scale if needed (for Q-Error, P-Error)
+    if model["use_log"]:
+        ax.set_yscale('log')
+
+    ax.set_xticks(x_positions)
+    if model["config_labels"]:
+        # For config params, use smaller font and vertical alignment
+        ax.set_xticklabels(model["x_labels"], rotation=0, ha='center', fontsize=7, multialignment='left')
+    else:
+        ax.set_xticklabels(model["x_labels"], rotation=45, ha='right')
+
+    # Add value labels on top of bars
+    for bar, label in zip(bars, model["value_labels"]):
+        ax.text(bar.get_x() + bar.get_width()/2., bar.get_height(),
+                label,
+                ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+    _finish(ax, model)
+
+
+def render_box(ax, model, colors):
+    """Render the legacy multi-box plot model."""
+    bp = ax.boxplot(model["groups"], patch_artist=True)
+    ax.set_xticklabels(model["labels"])
+
+    # Color each box
+    for patch, color in zip(bp['boxes'], colors[:len(model["groups"])]):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+
+    if model["small_ticks"]:
+        ax.tick_params(axis='x', labelsize=7)
+
+    if model["use_log"]:
+        ax.set_yscale('log')
+
+    _finish(ax, model)
+
+
+def render_box_single(ax, model, colors):
+    """Render a single box plot model with quartiles, median, mean, whiskers and outliers."""
+    bp = ax.boxplot([model["values"]], patch_artist=True, showmeans=True, meanline=True)
+    ax.set_xticklabels([model["tick_label"]])
+
+    # Style the box using color palette
+    bp['boxes'][0].set_facecolor(colors[0])
+    bp['boxes'][0].set_alpha(0.7)
+    bp['boxes'][0].set_edgecolor(colors[1] if len(colors) > 1 else colors[0])
+    bp['boxes'][0].set_linewidth(1.5)
+
+    # Style whiskers and caps using color palette
+    whisker_color = colors[2] if len(colors) > 2 else colors[0]
+    for line in bp['whiskers'] + bp['caps']:
+        line.set_color(whisker_color)
+        line.set_linewidth(1.5)
+
+    # Style median line using color palette
+    median_color = colors[3] if len(colors) > 3 else colors[0]
+    for median in bp['medians']:
+        median.set_color(median_color)
+        median.set_linewidth(2)
+
+    # Style mean line using color palette
+    mean_color = colors[4] if len(colors) > 4 else colors[1] if len(colors) > 1 else colors[0]
+    for mean in bp['means']:
+        mean.set_color(mean_color)
+        mean.set_linewidth(2)
+        mean.set_linestyle('--')
+
+    # Style fliers (outliers) using color palette
+    outlier_color = colors[5] if len(colors) > 5 else colors[1] if len(colors) > 1 else colors[0]
+    for flier in bp['fliers']:
+        flier.set_marker('o')
+        flier.set_markerfacecolor(outlier_color)
+        flier.set_markeredgecolor(colors[1] if len(colors) > 1 else colors[0])
+        flier.set_markersize(6)
+        flier.set_alpha(0.7)
+
+    if model["use_log"]:
+        ax.set_yscale('log')
+
+    # Statistics text box
+    stats_box_color = colors[6] if len(colors) > 6 else colors[0]
+    props = dict(boxstyle='round', facecolor=stats_box_color, alpha=0.3, edgecolor=colors[1] if len(colors) > 1 else colors[0])
+    ax.text(0.98, 0.98, model["stats_text"], transform=ax.transAxes, fontsize=9,
+            verticalalignment='top', horizontalalignment='right', bbox=props)
+
+    # Adjust x-axis label if it's multi-line
+    if '\n' in model["tick_label"]:
+        ax.tick_params(axis='x', labelsize=8)
+
+    _finish(ax, model)
+
+
+def render_box_split(ax, model, colors):
+    """Render a box plot model with one box per split value."""
+    bp = ax.boxplot(model["groups"], patch_artist=True, showmeans=True, meanline=True)
+    ax.set_xticklabels(model["labels"])
+
+    # Style each box with a different color from the palette
+    for i, patch in enumerate(bp['boxes']):
+        patch.set_facecolor(colors[i % len(colors)])
+        patch.set_alpha(0.7)
+        patch.set_edgecolor('black')
+        patch.set_linewidth(1.5)
+
+    # Style whiskers and caps
+    for line in bp['whiskers'] + bp['caps']:
+        line.set_color('black')
+        line.set_linewidth(1.5)
+
+    # Style median lines
+    for median in bp['medians']:
+        median.set_color('red')
+        median.set_linewidth(2)
+
+    # Style mean lines
+    for mean in bp['means']:
+        mean.set_color('green')
+        mean.set_linewidth(2)
+        mean.set_linestyle('--')
+
+    # Style fliers (outliers)
+    for i, flier in enumerate(bp['fliers']):
+        flier.set_marker('o')
+        flier.set_markerfacecolor(colors[i % len(colors)])
+        flier.set_markeredgecolor('black')
+        flier.set_markersize(4)
+        flier.set_alpha(0.6)
+
+    if model["use_log"]:
+        ax.set_yscale('log')
+
+    if model["stats_text"]:
+        stats_box_color = colors[0] if colors else 'white'
+        props = dict(boxstyle='round', facecolor=stats_box_color, alpha=0.3, edgecolor='black')
+        ax.text(0.98, 0.98, model["stats_text"], transform=ax.transAxes, fontsize=8,
+                verticalalignment='top', horizontalalignment='right', bbox=props)
+
+    # Use smaller font for multi-line x-axis labels
+    ax.tick_params(axis='x', labelsize=7)
+
+    _finish(ax, model)
+
+
+def render_scatter(ax, model, colors):
+    """Render a scatter plot model with gradient colors."""
+    x_values = model["x_values"]
+    n = len(x_values)
+
+    if model["x_labels"] is not None:
+        ax.set_xticks(model["tick_positions"])
+        ax.set_xticklabels(model["x_labels"], rotation=0, ha='center', fontsize=7)
+
+    ax.scatter(x_values, model["y_values"], c=range(n),
+               cmap=ListedColormap(colors[:n]),
+               s=100, alpha=0.7, edgecolors='black', linewidth=1.5)
+
+    if model["use_log"]:
+        ax.set_yscale('log')
+
+    _finish(ax, model)
+
+
+def render_density_scatter(ax, model, colors):
+    """Render a density scatter model as a single image with a count colorbar."""
+    counts = np.ma.masked_equal(model["counts"], 0)
+    cmap = LinearSegmentedColormap.from_list("density", colors)
+    cmap.set_bad(alpha=0)
+
+    image = ax.imshow(counts, origin='lower', aspect='auto', extent=model["extent"],
+                      cmap=cmap, norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)),
+                      interpolation='nearest')
+    ax.figure.colorbar(image, ax=ax, label="Points per bin")
+
+    # Y was binned in log10 space - label ticks as powers of ten
+    if model["log_y"]:
+        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda v, _: f"$10^{{{v:g}}}$"))
+
+    props = dict(boxstyle='round', facecolor='white', alpha=0.7, edgecolor='black')
+    ax.text(0.98, 0.98, model["stats_text"], transform=ax.transAxes, fontsize=9,
+            verticalalignment='top', horizontalalignment='right', bbox=props)
+
+    _finish(ax, model)
+
+
+def render_line(ax, model, colors):
+    """Render a line graph model with value labels on its labeled points."""
+    if model["x_labels"] is not None:
+        ax.set_xticks(model["tick_positions"])
+        ax.set_xticklabels(model["x_labels"], rotation=0, ha='center', fontsize=7, multialignment='left')
+
+    # Downsampled lines have many points - draw smaller markers
+    marker_size = 3 if model["downsampled"] else 8
+    ax.plot(model["x_values"], model["y_values"], color=colors[0], linewidth=2.5, marker='o',
+            markersize=marker_size, markerfacecolor=colors[1], markeredgecolor='black',
+            markeredgewidth=1.5 if marker_size > 3 else 0.5)
+
+    if model["use_log"]:
+        ax.set_yscale('log')
+
+    for x, y, label in zip(model["label_x"], model["label_y"], model["value_labels"]):
+        ax.text(x, y, label, ha='center', va='bottom',
+                fontsize=9, fontweight='bold')
+
+    if model["stats_text"]:
+        props = dict(boxstyle='round', facecolor='white', alpha=0.7, edgecolor='black')
+        ax.text(0.98, 0.98, model["stats_text"], transform=ax.transAxes, fontsize=9,
+                verticalalignment='top', horizontalalignment='right', bbox=props)
+
+    ax.grid(True, alpha=0.3)
+    _finish(ax, model)
+
+
+# Plot model kind -> render function
+RENDERERS = {
+    "message": render_message,
+    "bar": render_bar,
+    "box": render_box,
+    "box_single": render_box_single,
+    "box_split": render_box_split,
+    "scatter": render_scatter,
+    "density_scatter": render_density_scatter,
+    "line": render_line,
+}
+
+
+def render_plot_model(ax, model, colors):
+    """
+    Draw a plot model onto the given axes.
+
+    Args:
+        ax: Matplotlib axes object
+        model (dict): Plot model from plotting.plot_model
+        colors: List of colors to use
+    """
+    RENDERERS[model["kind"]](ax, model, colors)
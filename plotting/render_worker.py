@@ -0,0 +1,76 @@
+# render_worker.py
+"""
+Render Worker Module
+Rasterizes plot models in a background process (Agg backend), so building and
+drawing a large figure does not block the Tk main thread. The GUI shows the
+returned PNG as PhotoImage and only creates an interactive matplotlib canvas
+when the user wants to zoom or pan. Plot exports (PDF/PNG at export resolution)
+are rendered in a separate export process, so a slow 300-dpi export never delays
+the embedded previews (and previews never delay an export).
+
+One preview and one export worker process are kept for the whole session
+(each spawned on first use).
+"""
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from plotting.headless import init_headless_worker, render_model_to_png, render_model_to_file
+
+
+# Pool name ("preview", "export") -> process pool
+_pools = {}
+
+
+def _get_pool(name="preview"):
+    """The render process pool of name, created on first use."""
+    if name not in _pools:
+        if not _pools:
+            atexit.register(shutdown)
+        # "spawn" keeps the worker independent of the parent's DuckDB connection and Tk state
+        _pools[name] = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=init_headless_worker)
+    return _pools[name]
+
+
+def _warm_up():
+    """Import the plotting stack in the worker (first render is then fast)."""
+    import plotting.plot_renderer  # noqa: F401
+    return True
+
+
+def warm_up():
+    """Start the worker process in the background."""
+    return _get_pool().submit(_warm_up)
+
+
+def submit_render(model, figsize=(8, 5), dpi=100):
+    """
+    Render a plot model to PNG in the worker process.
+
+    Args:
+        model (dict): Plot model (picklable, matplotlib-free)
+        figsize (tuple): Figure size in inches
+        dpi (int): Resolution
+
+    Returns:
+        concurrent.futures.Future: Resolves to PNG bytes
+    """
+    return _get_pool().submit(render_model_to_png, model, figsize, dpi)
+
+
+def submit_export(model, filepath, file_format, figsize=(11, 7), dpi=300):
+    """
+    Write a plot model to a file (PDF/PNG export) in the export process.
+
+    Returns:
+        concurrent.futures.Future: Resolves to the written path
+    """
+    return _get_pool("export").submit(render_model_to_file, model, str(filepath), file_format, figsize, dpi)
+
+
+def shutdown():
+    """Stop the worker processes."""
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.shutdown(wait=False, cancel_futures=True)
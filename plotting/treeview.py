@@ -1,13 +1,108 @@
 # treeview.py
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
-from tkinter import filedialog, messagebox
-from db.dbHandler import build_filter, execute_query
+from tkinter import filedialog
+from db.dbHandler import (
+    build_filter, execute_query, export_query, export_rows,
+    iter_query_batches, iter_row_batches, iter_excel_export
+)
+from gui.jobs import start_export_job
+
+# ----------------------------- EXPORTS (BACKGROUND JOBS) -----------------------------------------------
+
+def export_to_excel(parent, columns, data, params_summary="", query_spec=None):
+    """
+    Export results to Excel as background job (progress in the jobs panel).
+    Rows are streamed batch by batch (DuckDB fetchmany if a query spec is given) into a
+    write-only workbook in a worker thread; cancelling between batches writes no file.
+
+    Args:
+        parent: Window the save dialog belongs to
+        columns (list): Column names
+        data (list): Result rows (source and row count without query spec)
+        params_summary (str): Parameter summary written above the data
+        query_spec (dict): {'file_nr': ..., 'filters': ...} to re-run the query (optional)
+    """
+    filepath = filedialog.asksaveasfilename(
+        parent=parent,
+        defaultextension=".xlsx",
+        filetypes=[("Excel-Datei", "*.xlsx"), ("Alle Dateien", "*.*")]
+    )
+    if not filepath:
+        return  # Abbrechen
+
+    def work(job):
+        if query_spec:
+            batches = iter_query_batches(query_spec["file_nr"], query_spec["filters"])
+        else:
+            batches = iter_row_batches(data)
+        steps = iter_excel_export(columns, batches, filepath, params_summary)
+        for written in steps:
+            if job.cancelled:
+                steps.close()  # no file is written
+                return
+            if written is None:
+                # Last step: the workbook is zipped and written (not cancellable)
+                job.detail = "saving workbook"
+            else:
+                job.progress = written
+                if total is None:
+                    job.detail = f"{written:,} rows written"
+
+    # The re-run query can return more rows than shown (e.g. a sampled preview):
+    # its row count is unknown up front, the progress is indeterminate then
+    total = None if query_spec else max(len(data), 1)
+    start_export_job("Excel export", filepath, work, total=total)
+
+
+def export_to_file(parent, columns, data, file_format, params_summary="", query_spec=None):
+    """
+    Export results to CSV/Parquet as background job (DuckDB COPY, cancellable).
+
+    Args:
+        parent: Window the save dialog belongs to
+        columns (list): Column names
+        data: Result rows (ResultSet or list), written if no query spec is given
+        file_format (str): "csv" or "parquet"
+        params_summary (str): CSV comment header / Parquet metadata
+        query_spec (dict): {'file_nr': ..., 'filters': ...} to re-run the query (optional)
+    """
+    labels = {"csv": "CSV-Datei", "parquet": "Parquet-Datei"}
+    # Dialog für Speicherort
+    filepath = filedialog.asksaveasfilename(
+        parent=parent,
+        defaultextension=f".{file_format}",
+        filetypes=[(labels[file_format], f"*.{file_format}"), ("Alle Dateien", "*.*")]
+    )
+    if not filepath:
+        return  # Abbrechen
+
+    def work(job):
+        if query_spec:
+            # DuckDB schreibt direkt in die Datei (streaming, konstanter Speicher)
+            export_query(query_spec["file_nr"], query_spec["filters"], filepath, file_format,
+                         params_summary, on_connection=job.attach_connection)
+        else:
+            # Loaded rows (ResultSet is scanned in place) with the same parameter header
+            export_rows(columns, data, filepath, file_format, params_summary,
+                        on_connection=job.attach_connection)
+
+    start_export_job(f"{file_format.upper()} export", filepath, work)
+
 
 # ----------------------------- PLOTTING TREEVIEW & DETAIL-TREEVIEW -------------------------------------
 
-def plot_treeview(columns, data, params_summary=""):
+def plot_treeview(columns, data, params_summary="", query_spec=None):
+    """
+    Show query results in a Treeview window with CSV, Parquet and Excel export.
+
+    Args:
+        columns (list): Column names
+        data: Result rows (ResultSet or list)
+        params_summary (str): Parameter summary shown above the table and written into exports
+        query_spec (dict): {'file_nr': ..., 'filters': ...} of the query that produced the rows.
+                           If given, exports re-run the query through DuckDB COPY (streaming).
+    """
     plot_window = tk.Toplevel()
     plot_window.title("Plot Window")
     plot_window.geometry("800x600")
@@ -15,36 +110,24 @@ def plot_treeview(columns, data, params_summary=""):
     toolbar = ttk.Frame(plot_window)
     toolbar.pack(side="top", fill="x")
 
-    def export_to_csv():
-        try:
-            df = pd.DataFrame(data, columns=columns)
-
-            # Dialog für Speicherort
-            filepath = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV-Datei", "*.csv"), ("Alle Dateien", "*.*")]
-            )
-            if not filepath:
-                return  # Abbrechen
-
-            # Export to CSV
-            if params_summary:
-                # Add parameter info as comment lines at the top
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(f"# Query Parameters: {params_summary}\n")
-                    f.write("#\n")
-                    # Write the DataFrame
-                    df.to_csv(f, index=False)
-            else:
-                # No parameters, just write data
-                df.to_csv(filepath, index=False, encoding='utf-8')
-            
-            messagebox.showinfo("Export erfolgreich", f"Datei gespeichert:\n{filepath}")
-        except Exception as e:
-            messagebox.showerror("Fehler beim Export", str(e))
-
-    btn_export = ttk.Button(toolbar, text="Export as CSV", command=export_to_csv)
-    btn_export.pack(pady=8)
+    # Exports run as background jobs (jobs panel), the window stays usable
+    btn_export = ttk.Button(
+        toolbar, text="Export as CSV",
+        command=lambda: export_to_file(plot_window, columns, data, "csv", params_summary, query_spec)
+    )
+    btn_export.pack(side="left", padx=5, pady=8)
+
+    btn_export_parquet = ttk.Button(
+        toolbar, text="Export as Parquet",
+        command=lambda: export_to_file(plot_window, columns, data, "parquet", params_summary, query_spec)
+    )
+    btn_export_parquet.pack(side="left", padx=5, pady=8)
+
+    btn_export_excel = ttk.Button(
+        toolbar, text="Export as Excel",
+        command=lambda: export_to_excel(plot_window, columns, data, params_summary, query_spec)
+    )
+    btn_export_excel.pack(side="left", padx=5, pady=8)
 
     # Display parameter summary if provided
     if params_summary:
@@ -113,7 +196,7 @@ def plot_treeview(columns, data, params_summary=""):
         columns2, result2 = execute_query(1, filters=filters)
         
         # Pass the same params_summary to the detail view
-        plot_treeview(columns2, result2, params_summary)
+        plot_treeview(columns2, result2, params_summary, query_spec={"file_nr": 1, "filters": filters})
 
 
     tree.bind("<Double-1>", open_detail_view)
@@ -0,0 +1,295 @@
+# report.py
+
+
+# ------------------------ HEADLESS REPORT GENERATOR --------------------------------------
+# -----------------------------------------------------------------------------------------
+"""
+Batch report generator without GUI.
+
+Reads a JSON or YAML spec with filter sets and plot specs, runs every filter set
+through execute_query() and writes one image file per plot and format.
+Queries and plot models are built in this process, rendering (Agg) is spread
+across a process pool.
+
+Usage:
+    python report.py spec.yaml --out reports/ --format png pdf --workers 4
+    python report.py spec.json --db /path/to/pgb_job_1.db
+
+Spec format (YAML shown, JSON works the same way):
+
+    defaults:
+      formats: [png]
+      plot_number: 10
+    reports:
+      - name: lf_overview
+        analysis: Loss Factor              # Loss Factor | Q-Error | P-Error
+        filters:
+          pg: [DPccp]
+          cp: []
+          bpc: []
+          cf: {bpi_cf_mat: [0, 1]}
+          queries: []                      # non-empty -> single query mode
+        detail_filters:
+          - {metric: avg_lf, comparison: greater than, value: 1.0}
+        plots:
+          - {type: Bar Chart, agg_metric: avg_lf, metric: Highest}
+          - {type: Box Plot, agg_metric: avg_lf, split: pg_name}
+    matrix:                                # optional: multi-page PDF reports
+      - name: box_matrix                   # -> <out>/box_matrix.pdf
+        analysis_types: [Loss Factor, Q-Error]   # default: all
+        splits: [pg_name, cp_name]         # default: all configuration parameters
+        filters: {pg: [DPccp]}
+        vector: false                      # true: vector pages, rendered without the pool
+"""
+
+import argparse
+import json
+import multiprocessing
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from db.dbHandler import execute_query, build_query_filters, build_detail_metric_filter, set_db_path
+from plotting.plot_model import make_plot_options, get_plot_model, new_result_id
+from plotting.headless import SUPPORTED_FORMATS, init_headless_worker, render_model_to_files
+from plotting.pdf_report import generate_pdf_report, format_timings
+from utils import build_params_summary
+
+
+# Single query mode: metric column per analysis type
+SINGLE_QUERY_METRICS = {
+    "Loss Factor": "lf",
+    "Q-Error": "qerr",
+    "P-Error": "perr",
+}
+
+
+# =============================================================================
+# SPEC LOADING
+# =============================================================================
+
+def load_spec(path):
+    """
+    Load a report spec from a JSON or YAML file.
+    A plain list is treated as the list of reports.
+
+    Returns:
+        dict: Spec with 'defaults' and 'reports' keys
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("PyYAML is required for YAML specs (pip install pyyaml) - or use JSON")
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+
+    if isinstance(spec, list):
+        spec = {"reports": spec}
+    spec.setdefault("defaults", {})
+    spec.setdefault("reports", [])
+    return spec
+
+
+def _as_str_list(values):
+    """Normalize a spec value (None, scalar or list) to a list of strings."""
+    if values is None:
+        return []
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    return [str(v) for v in values]
+
+
+def _slug(text):
+    """Make a string safe for use in a file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(text)).strip("_") or "plot"
+
+
+def _selections(filter_spec):
+    """
+    Read the filter selections of a spec entry.
+
+    Returns:
+        tuple: (selected_pg, selected_cp, selected_bpc, selected_cf, selected_qg)
+    """
+    filter_spec = filter_spec or {}
+    return (
+        _as_str_list(filter_spec.get("pg")),
+        _as_str_list(filter_spec.get("cp")),
+        _as_str_list(filter_spec.get("bpc")),
+        {key: _as_str_list(values) for key, values in (filter_spec.get("cf") or {}).items()},
+        _as_str_list(filter_spec.get("queries")),
+    )
+
+
+# =============================================================================
+# JOB PREPARATION (QUERIES + PLOT MODELS)
+# =============================================================================
+
+def prepare_jobs(spec, out_dir, formats, dpi):
+    """
+    Run the queries of all reports and build one render job per plot.
+
+    Returns:
+        list: Render jobs as (model, output_base, formats, dpi) tuples
+    """
+    defaults = spec["defaults"]
+    jobs = []
+
+    for index, report in enumerate(spec["reports"], start=1):
+        name = _slug(report.get("name", f"report_{index}"))
+        analysis_type = report.get("analysis", defaults.get("analysis", "Loss Factor"))
+        selected_pg, selected_cp, selected_bpc, selected_cf, selected_qg = _selections(report.get("filters"))
+
+        # Same mode selection as the GUI: specific queries -> single query, else aggregated
+        if selected_qg:
+            query_id = 3
+            x_axis = "Query Graph: ps_qg"
+            default_metric = SINGLE_QUERY_METRICS.get(analysis_type, "lf")
+        else:
+            query_id = 2
+            x_axis = "Configuration Parameters"
+            default_metric = None
+
+        filters = build_query_filters(
+            selected_pg, selected_cp, selected_bpc, selected_cf, selected_qg,
+            analysis_type=analysis_type,
+            detail_metric_filter=build_detail_metric_filter(report.get("detail_filters"))
+        )
+
+        start = time.perf_counter()
+        columns, data = execute_query(query_id, filters=filters)
+        print(f"[{name}] {len(data)} rows in {time.perf_counter() - start:.2f}s")
+        print(f"  {build_params_summary(analysis_type, selected_pg, selected_cp, selected_bpc, selected_cf)}")
+
+        result_id = new_result_id()
+        config_params = {
+            'pg': selected_pg,
+            'cp': selected_cp,
+            'bpc': selected_bpc,
+            'cf': selected_cf,
+            'qg': selected_qg
+        }
+
+        for plot_index, plot in enumerate(report.get("plots", []), start=1):
+            plot_type = plot.get("type", "Bar Chart")
+            agg_metric = plot.get("agg_metric", default_metric)
+            options = make_plot_options(
+                plot_type,
+                x_axis=x_axis,
+                agg_metric=agg_metric,
+                metric=plot.get("metric", "Highest"),
+                plot_number=int(plot.get("plot_number", defaults.get("plot_number", 5))),
+                config_params=config_params,
+                box_plot_split=plot.get("split")
+            )
+            model = get_plot_model(result_id, columns, data, options)
+
+            file_name = plot.get("name") or f"{plot_index:02d}_{plot_type}_{agg_metric}"
+            output_base = Path(out_dir) / name / _slug(file_name)
+            jobs.append((model, str(output_base), tuple(plot.get("formats", formats)), dpi))
+
+    return jobs
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+def _render_job(job):
+    """Worker entry point: render one plot model to its files."""
+    model, output_base, formats, dpi = job
+    return render_model_to_files(model, output_base, formats, dpi=dpi)
+
+
+def render_jobs(jobs, workers):
+    """
+    Render all jobs, in a process pool if workers > 1.
+
+    Returns:
+        list: Paths of all written files
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        init_headless_worker()
+        return [path for job in jobs for path in _render_job(job)]
+
+    # "spawn" keeps workers independent of the parent's DuckDB connection and Tk state
+    context = multiprocessing.get_context("spawn")
+    written = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_headless_worker) as pool:
+        for paths in pool.map(_render_job, jobs):
+            written.extend(paths)
+    return written
+
+
+def render_matrix_reports(spec, out_dir, workers, dpi):
+    """
+    Write one multi-page PDF per entry of the spec's 'matrix' section.
+
+    Returns:
+        list: Paths of the written PDF files
+    """
+    written = []
+    for index, entry in enumerate(spec.get("matrix") or [], start=1):
+        selected_pg, selected_cp, selected_bpc, selected_cf, _ = _selections(entry.get("filters"))
+        output_path = Path(out_dir) / f"{_slug(entry.get('name', f'matrix_{index}'))}.pdf"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        timings = generate_pdf_report(
+            output_path, workers=workers, dpi=dpi, vector=bool(entry.get("vector")),
+            selected_pg=selected_pg, selected_cp=selected_cp, selected_bpc=selected_bpc, selected_cf=selected_cf,
+            analysis_types=entry.get("analysis_types"),
+            split_columns=entry.get("splits"),
+            detail_filter_values=entry.get("detail_filters"),
+            max_boxes=entry.get("max_boxes")
+        )
+        print(f"\n[{output_path.name}]")
+        print(format_timings(timings))
+        written.append(str(output_path))
+    return written
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Ingredients Visualizer plots without GUI.")
+    parser.add_argument("spec", help="JSON or YAML report spec")
+    parser.add_argument("--out", default="reports", help="Output directory (default: reports)")
+    parser.add_argument("--db", help="DuckDB database file (default: DB_PATH from config.py)")
+    parser.add_argument("--format", nargs="+", choices=SUPPORTED_FORMATS,
+                        help="Output formats (default: from spec or png)")
+    parser.add_argument("--workers", type=int, default=max(1, (multiprocessing.cpu_count() or 2) - 1),
+                        help="Number of render processes")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution for PNG output")
+    args = parser.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    if args.db:
+        set_db_path(args.db)
+
+    formats = args.format or spec["defaults"].get("formats", ["png"])
+
+    start = time.perf_counter()
+    jobs = prepare_jobs(spec, args.out, formats, args.dpi)
+    query_time = time.perf_counter() - start
+
+    written = render_jobs(jobs, args.workers)
+    written += render_matrix_reports(spec, args.out, args.workers, args.dpi)
+    total_time = time.perf_counter() - start
+
+    print(f"\n{len(jobs)} plots, {len(written)} files written to {args.out}")
+    print(f"Queries + models: {query_time:.2f}s, total: {total_time:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
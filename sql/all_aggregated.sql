@@ -3,7 +3,9 @@
 -- Parameters:
 --   {ANALYSIS_TYPE} - 'LF', 'QERR', or 'PERR' to control which columns are displayed
 --   {DETAIL_METRIC_FILTER} - HAVING clause conditions (can filter on ANY metric)
+--   {MEDIAN}(x) - MEDIAN(x), approximated in exploratory mode (user filters keep MEDIAN)
 --   {BPC_NAME_FILTER}, {CF_*_FILTER}, {PG_NAME_FILTER}, {CP_NAME_FILTER} - Standard filters
+--   {PS_BASE_TABLE} - Base view (default v_ps_base, <alias>.v_ps_base for attached run databases)
 
 WITH all_metrics AS (
   SELECT 
@@ -17,25 +19,25 @@ WITH all_metrics AS (
     
     -- Loss Factor metrics
     ROUND(AVG(ps_loss_factor), 2) AS avg_lf,
-    ROUND(MEDIAN(ps_loss_factor), 2) AS median_lf,
+    ROUND({MEDIAN}(ps_loss_factor), 2) AS median_lf,
     ROUND(MAX(ps_loss_factor), 2) AS max_lf,
     ROUND(MIN(ps_loss_factor), 2) AS min_lf,
 
     -- Q-Error metrics
     ROUND(AVG(ps_qerr_cost_pg), 2) AS avg_qerr,  
-    ROUND(MEDIAN(ps_qerr_cost_pg), 2) AS median_qerr,
+    ROUND({MEDIAN}(ps_qerr_cost_pg), 2) AS median_qerr,
     ROUND(MAX(ps_qerr_cost_pg), 2) AS max_qerr,
     ROUND(MIN(ps_qerr_cost_pg), 2) AS min_qerr,
 
     -- P-Error metrics
     ROUND(AVG(ps_p_error), 2) AS avg_perr,
-    ROUND(MEDIAN(ps_p_error), 2) AS median_perr,
+    ROUND({MEDIAN}(ps_p_error), 2) AS median_perr,
     ROUND(MAX(ps_p_error), 2) AS max_perr,
     ROUND(MIN(ps_p_error), 2) AS min_perr,
 
     COUNT(*) AS cnt
 
-  FROM v_ps_base 
+  FROM {PS_BASE_TABLE} 
 
   WHERE 1=1
     {BPC_NAME_FILTER}
@@ -5,6 +5,7 @@
 --   {ANALYSIS_TYPE} - 'LF', 'QERR', or 'PERR' to control which columns are displayed
 --   {DETAIL_METRIC_FILTER} - WHERE clause conditions (can filter on ANY metric)
 --   {BPC_NAME_FILTER}, {CF_*_FILTER}, {PG_NAME_FILTER}, {CP_NAME_FILTER}, {QUERY_NAME_FILTER} - Standard filters
+--   {PS_BASE_TABLE} - Base view (default v_ps_base, <alias>.v_ps_base for attached run databases)
 
 WITH all_metrics AS (
   SELECT 
@@ -28,7 +29,7 @@ WITH all_metrics AS (
 
     COUNT(*) AS cnt
 
-  FROM v_ps_base 
+  FROM {PS_BASE_TABLE} 
 
   WHERE 1=1
     {BPC_NAME_FILTER}
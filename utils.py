@@ -58,3 +58,38 @@ def build_config_params_label(config_params):
         return '\n'.join(label_parts)
     else:
         return "All Configurations"
+
+
+def build_params_summary(analysis_type, selected_pg, selected_cp, selected_bpc, selected_cf):
+    """
+    Build a summary string of all query parameters for display and export.
+    Used by the GUI and the headless report generator.
+    
+    Args:
+        analysis_type (str): "Loss Factor", "Q-Error" or "P-Error"
+        selected_pg (list): Selected plan generators
+        selected_cp (list): Selected cardinality providers
+        selected_bpc (list): Selected build plan classes
+        selected_cf (dict): Selected cost function values per cost function column
+    
+    Returns:
+        str: Formatted parameter summary
+    """
+    parts = []
+    parts.append(f"Analysis Type: {analysis_type}")
+    parts.append(f"Plan Generators: {', '.join(selected_pg) if selected_pg else 'All'}")
+    parts.append(f"Cardinality Providers: {', '.join(selected_cp) if selected_cp else 'All'}")
+    parts.append(f"Build Plan Class: {', '.join(selected_bpc) if selected_bpc else 'All'}")
+    
+    # Cost functions
+    cf_parts = []
+    for key, values in (selected_cf or {}).items():
+        if values:
+            cf_name = key.replace('_', ' ').title()
+            cf_parts.append(f"{cf_name}: {', '.join(values)}")
+    if cf_parts:
+        parts.append(f"Cost Functions: {' | '.join(cf_parts)}")
+    else:
+        parts.append("Cost Functions: All")
+    
+    return " | ".join(parts)